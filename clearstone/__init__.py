@@ -2,6 +2,9 @@
 Clearstone SDK - Checkpoint-based debugging for multi-agent AI systems.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 from clearstone import policies
 from clearstone.core.actions import (
     ALERT,
@@ -17,13 +20,35 @@ from clearstone.core.context import PolicyContext, context_scope, create_context
 from clearstone.core.policy import Policy, PolicyEngine
 from clearstone.utils.audit import AuditTrail
 from clearstone.utils.composition import compose_and, compose_or
-from clearstone.utils.debugging import PolicyDebugger
-from clearstone.utils.intervention import InterventionClient
 from clearstone.utils.metrics import PolicyMetrics
-from clearstone.utils.validator import PolicyValidationError, PolicyValidator
+
+if TYPE_CHECKING:
+    from clearstone.utils.debugging import PolicyDebugger
+    from clearstone.utils.intervention import InterventionClient
+    from clearstone.utils.validator import PolicyValidationError, PolicyValidator
 
 __version__ = "0.1.0"
 
+# Attributes imported on first access (PEP 562), so `import clearstone` does not
+# pay for tooling that most callers never touch. `policies` stays eager: importing
+# it registers the built-in policy library that PolicyEngine() discovers.
+_LAZY = {
+    "PolicyDebugger": "clearstone.utils.debugging",
+    "InterventionClient": "clearstone.utils.intervention",
+    "PolicyValidator": "clearstone.utils.validator",
+    "PolicyValidationError": "clearstone.utils.validator",
+}
+
+
+def __getattr__(name):
+    """Lazily imports the attributes listed in `_LAZY`."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "ActionType",
     "Decision",
@@ -1,8 +1,11 @@
 # clearstone/core/actions.py
 
+import itertools
+import os
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, List
 
 
@@ -20,11 +23,14 @@ class ActionType(Enum):
     SKIP = "skip"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Decision:
     """
     Represents a policy decision, including the action and any associated state
-    (e.g., a reason for blocking, metadata). Frozen for immutability.
+    (e.g., a reason for blocking, metadata). Frozen for immutability and slotted
+    so `decision.action` is a slot read rather than an instance-dict lookup.
+
+    ActionType members are singletons, so compare actions with `is`.
     """
 
     action: ActionType
@@ -33,11 +39,11 @@ class Decision:
 
     def is_block(self) -> bool:
         """Helper method to check if this is a blocking decision."""
-        return self.action == ActionType.BLOCK
+        return self.action is ActionType.BLOCK
 
     def is_pause(self) -> bool:
         """Helper method to check if this is a pause decision."""
-        return self.action == ActionType.PAUSE
+        return self.action is ActionType.PAUSE
 
 
 ALLOW = Decision(ActionType.ALLOW)
@@ -48,12 +54,23 @@ SKIP = Decision(ActionType.SKIP)
 def BLOCK(reason: str, **metadata) -> Decision:
     """
     Factory function to create a BLOCK decision. A reason is mandatory.
+
+    BLOCK decisions without metadata are interned by reason, so repeated
+    blocks with the same reason share one Decision instance.
     """
     if not reason or not isinstance(reason, str):
         raise ValueError("BLOCK decision requires a non-empty string reason.")
+    if not metadata:
+        return _interned_block(reason)
     return Decision(action=ActionType.BLOCK, reason=reason, metadata=metadata)
 
 
+@lru_cache(maxsize=256)
+def _interned_block(reason: str) -> Decision:
+    """Returns the shared metadata-free BLOCK decision for a reason."""
+    return Decision(action=ActionType.BLOCK, reason=reason)
+
+
 def REDACT(reason: str, fields: List[str], **metadata) -> Decision:
     """
     Factory function to create a REDACT decision. A list of fields is mandatory.
@@ -64,6 +81,24 @@ def REDACT(reason: str, fields: List[str], **metadata) -> Decision:
     return Decision(action=ActionType.REDACT, reason=reason, metadata=metadata)
 
 
+# Intervention IDs are a random per-process prefix (the 128 bits of a uuid4)
+# plus a counter, so they stay globally unique without a urandom read per
+# PAUSE. A forked child gets its own prefix.
+_PAUSE_PREFIX = uuid.uuid4().hex
+_pause_counter = itertools.count()
+
+
+def _reseed_pause_ids() -> None:
+    """Draws a new intervention ID prefix (run in forked children)."""
+    global _PAUSE_PREFIX, _pause_counter
+    _PAUSE_PREFIX = uuid.uuid4().hex
+    _pause_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_pause_ids)
+
+
 def PAUSE(reason: str, intervention_id: str = None, **metadata) -> Decision:
     """
     Creates a PAUSE decision, signaling a need for human intervention.
@@ -72,5 +107,7 @@ def PAUSE(reason: str, intervention_id: str = None, **metadata) -> Decision:
     if not reason or not isinstance(reason, str):
         raise ValueError("PAUSE decision requires a non-empty string reason.")
 
-    metadata["intervention_id"] = intervention_id or f"intervention_{uuid.uuid4().hex}"
+    metadata["intervention_id"] = (
+        intervention_id or f"intervention_{_PAUSE_PREFIX}{next(_pause_counter):x}"
+    )
     return Decision(action=ActionType.PAUSE, reason=reason, metadata=metadata)
@@ -1,27 +1,68 @@
 # clearstone/core/context.py
 
+import itertools
+import os
+import time
 import uuid
-from contextlib import contextmanager
-from contextvars import ContextVar
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from contextvars import ContextVar, Token
+from dataclasses import InitVar, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
 
+# Request and session IDs are correlation keys, so a random per-process prefix
+# (the 128 bits of a uuid4) plus a counter keeps them globally unique and
+# avoids a urandom read per context. A forked child gets its own prefix.
+_ID_PREFIX = uuid.uuid4().hex
+_id_counter = itertools.count()
 
-@dataclass(frozen=True)
+
+def _reseed_ids() -> None:
+    """Draws a new ID prefix and restarts the counter (run in forked children)."""
+    global _ID_PREFIX, _id_counter
+    _ID_PREFIX = uuid.uuid4().hex
+    _id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_ids)
+
+
+def _next_id() -> str:
+    """Returns a globally unique identifier."""
+    return f"{_ID_PREFIX}{next(_id_counter):x}"
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
 class PolicyContext:
     """
     Immutable execution context for a policy evaluation. It is propagated via
     contextvars, making it safe for threaded and asynchronous environments.
+    Slotted, so field reads avoid an instance-dict lookup.
+
+    The creation time is stored as integer nanoseconds since the epoch; the
+    `timestamp` datetime is only built when something actually reads it. A
+    `timestamp` can still be passed explicitly (naive datetimes are taken as
+    UTC); it is read back as the equivalent UTC datetime.
     """
 
     user_id: str
     agent_id: str
     session_id: str
-    request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    request_id: str = field(default_factory=_next_id)
 
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: InitVar[Optional[datetime]] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _timestamp_ns: int = field(default_factory=time.time_ns, repr=False, compare=False)
+
+    def __post_init__(self, timestamp: Optional[datetime]):
+        if timestamp is not None:
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            nanos = (timestamp - _EPOCH) // timedelta(microseconds=1) * 1000
+            object.__setattr__(self, "_timestamp_ns", nanos)
 
     @classmethod
     def current(cls) -> Optional["PolicyContext"]:
@@ -29,42 +70,57 @@ class PolicyContext:
         return _policy_context.get()
 
 
+def _context_timestamp(self: PolicyContext) -> datetime:
+    """The UTC creation time of this context."""
+    seconds, nanos = divmod(self._timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(
+        microsecond=nanos // 1000
+    )
+
+
+# Installed after the dataclass is built: in the class body, a property named
+# like the `timestamp` InitVar would be taken as that argument's default.
+PolicyContext.timestamp = property(_context_timestamp)
+
+
 _policy_context: ContextVar[Optional[PolicyContext]] = ContextVar(
     "policy_context", default=None
 )
 
 
-def get_current_context() -> Optional[PolicyContext]:
-    """
-    Retrieves the current policy context from the active scope.
-    Returns None if no context has been set.
-    """
-    return _policy_context.get()
+# Bound ContextVar methods, so reading the context is a single C call.
+# get_current_context() returns the PolicyContext of the active scope, or None.
+# set_current_context(ctx) sets it for the active scope; it is often safer to use
+# the `context_scope` context manager.
+get_current_context: Callable[[], Optional[PolicyContext]] = _policy_context.get
+set_current_context: Callable[[Optional[PolicyContext]], Token] = _policy_context.set
 
 
-def set_current_context(context: PolicyContext) -> None:
-    """
-    Manually sets the current policy context for the active scope.
-    It is often safer to use the `context_scope` context manager.
-    """
-    _policy_context.set(context)
-
-
-@contextmanager
-def context_scope(context: PolicyContext):
+class context_scope:
     """
     A context manager for safely setting and automatically resetting the policy context.
 
+    Implemented as a small slotted class rather than with @contextmanager, so
+    entering a scope does not allocate a generator and wrapper per `with`.
+
     Usage:
         ctx = create_context(...)
         with context_scope(ctx):
             decision = policy_engine.evaluate()
     """
-    token = _policy_context.set(context)
-    try:
-        yield context
-    finally:
-        _policy_context.reset(token)
+
+    __slots__ = ("_context", "_token")
+
+    def __init__(self, context: PolicyContext):
+        self._context = context
+        self._token = None
+
+    def __enter__(self) -> PolicyContext:
+        self._token = _policy_context.set(self._context)
+        return self._context
+
+    def __exit__(self, *exc_info) -> None:
+        _policy_context.reset(self._token)
 
 
 def create_context(
@@ -78,6 +134,6 @@ def create_context(
     return PolicyContext(
         user_id=user_id,
         agent_id=agent_id,
-        session_id=session_id or str(uuid.uuid4()),
+        session_id=session_id or _next_id(),
         metadata=metadata,
     )
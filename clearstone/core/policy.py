@@ -1,35 +1,89 @@
 # clearstone/core/policy.py
 
-import inspect
+import bisect
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Callable, List, Optional
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from clearstone.core.actions import ALLOW, BLOCK, ActionType, Decision
-from clearstone.core.context import PolicyContext, get_current_context
+from clearstone.core.context import (
+    PolicyContext,
+    _policy_context,
+    get_current_context,
+)
 from clearstone.utils.audit import AuditTrail
 from clearstone.utils.metrics import PolicyMetrics
 from clearstone.utils.telemetry import get_telemetry_manager
 
+# Kept ordered by descending priority (ties in registration order) on insert.
 _policy_registry: List["PolicyInfo"] = []
+# Immutable snapshot of the registry, rebuilt lazily after any mutation.
+_sorted_policies: Optional[Tuple["PolicyInfo", ...]] = None
 
+_BLOCK = ActionType.BLOCK
+_ALLOW = ActionType.ALLOW
+_SKIP = ActionType.SKIP
+# Engines whose policies all declare a subset of these actions get a simpler
+# generated evaluator with no final-decision bookkeeping.
+_BINARY_ACTIONS = frozenset({ActionType.ALLOW, ActionType.BLOCK})
 
-@dataclass(frozen=True)
+# Below this many policies, thread dispatch costs more than it saves.
+_PARALLEL_MIN_POLICIES = 16
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Code object flags for *args / **kwargs (mirrors inspect.CO_VARARGS/CO_VARKEYWORDS).
+_CO_VARARGS = 0x04
+_CO_VARKEYWORDS = 0x08
+
+
+@dataclass(frozen=True, slots=True)
 class PolicyInfo:
-    """Metadata about a registered policy function."""
+    """
+    Metadata about a registered policy function. Slotted, since the engine
+    reads these fields on every evaluation.
+    """
 
     name: str
     priority: int
     func: Callable
+    actions: Optional[FrozenSet[ActionType]] = None
+    reads: Optional[Tuple[str, ...]] = None
 
 
-def Policy(name: str, priority: int = 0) -> Callable:
+def Policy(
+    name: str,
+    priority: int = 0,
+    actions: Optional[Iterable[ActionType]] = None,
+    reads: Optional[Iterable[str]] = None,
+) -> Callable:
     """
     Decorator to register a function as a Clearstone policy.
 
     Args:
         name: A unique, human-readable identifier for the policy.
         priority: An integer determining execution order. Higher numbers run first.
+        actions: Optional set of the ActionTypes the policy can return. When every
+                 policy in an engine declares only ALLOW and BLOCK, the engine
+                 compiles a simpler evaluator that stops at the first non-ALLOW.
+        reads: Optional metadata keys the policy reads. The engine looks these
+               up once per evaluation and passes them to the policy as a second
+               `view` argument (a dict of key -> value, None when missing), so
+               the policy must have the signature `(context, view)`.
 
     Example:
         @Policy(name="block_admin_tools_for_guests", priority=100)
@@ -40,35 +94,91 @@ def Policy(name: str, priority: int = 0) -> Callable:
     """
     if not name or not isinstance(name, str):
         raise ValueError("Policy name must be a non-empty string.")
+    if actions is not None:
+        actions = frozenset(actions)
+        if not actions or not all(isinstance(a, ActionType) for a in actions):
+            raise ValueError("Policy actions must be a non-empty set of ActionType.")
+    if reads is not None:
+        reads = tuple(reads)
+        if not reads or not all(isinstance(k, str) for k in reads):
+            raise ValueError("Policy reads must be a non-empty list of strings.")
 
     def decorator(func: Callable) -> Callable:
-        sig = inspect.signature(func)
-        params = list(sig.parameters.keys())
-        if len(params) != 1 or params[0] != "context":
+        argcount = 1 if reads is None else 2
+        if not _has_context_signature(func, argcount):
+            import inspect
+
+            params = "context: PolicyContext"
+            if reads is not None:
+                params += ", view: Dict[str, Any]"
             raise TypeError(
                 f"Policy function '{func.__name__}' must have the signature: "
-                f"def {func.__name__}(context: PolicyContext) -> Decision. Got: {sig}"
+                f"def {func.__name__}({params}) -> Decision. "
+                f"Got: {inspect.signature(func)}"
             )
 
-        info = PolicyInfo(name=name, priority=priority, func=func)
+        info = PolicyInfo(
+            name=name, priority=priority, func=func, actions=actions, reads=reads
+        )
 
         func._policy_info = info
 
-        _policy_registry.append(info)
+        global _sorted_policies
+        bisect.insort(_policy_registry, info, key=_descending_priority)
+        _sorted_policies = None
         return func
 
     return decorator
 
 
-def get_policies() -> List[PolicyInfo]:
-    """Returns all registered policies, sorted by priority (descending)."""
-    return sorted(_policy_registry, key=lambda p: p.priority, reverse=True)
+def _descending_priority(info: PolicyInfo) -> int:
+    """Sort key that orders policies by descending priority."""
+    return -info.priority
+
+
+def _has_context_signature(func: Callable, argcount: int = 1) -> bool:
+    """
+    Checks that a policy takes `argcount` positional parameters, the first
+    named `context`.
+
+    Reads the code object directly instead of building an `inspect.Signature`,
+    which keeps decorating a policy cheap at import time.
+    """
+    func = getattr(func, "__wrapped__", func)
+    code = getattr(func, "__code__", None)
+    if code is None:
+        # Not a plain function (e.g. a callable object), use the slow path.
+        import inspect
+
+        params = list(inspect.signature(func).parameters)
+        return len(params) == argcount and params[0] == "context"
+
+    return (
+        code.co_argcount == argcount
+        and code.co_kwonlyargcount == 0
+        and not code.co_flags & (_CO_VARARGS | _CO_VARKEYWORDS)
+        and code.co_varnames[0] == "context"
+    )
+
+
+def get_policies() -> Tuple[PolicyInfo, ...]:
+    """
+    Returns all registered policies, sorted by priority (descending).
+
+    The registry is kept sorted on insertion and the snapshot is cached until
+    the registry changes, so repeated engine construction never sorts.
+    """
+    global _sorted_policies
+    if _sorted_policies is None:
+        _sorted_policies = tuple(_policy_registry)
+    return _sorted_policies
 
 
 def reset_policies() -> None:
     """Clears the global policy registry. Primarily for testing."""
-    global _policy_registry
+    global _policy_registry, _sorted_policies
     _policy_registry = []
+    _sorted_policies = None
 
 
 class PolicyEngine:
@@ -76,29 +186,49 @@ class PolicyEngine:
     The central engine that evaluates registered policies against a given context.
 
     Args:
-        policies: An optional list of decorated policy functions to use.
+        policies: An optional list of decorated policy functions (or PolicyInfo
+                  entries, e.g. from `get_policies()`) to use.
                   If provided, this exact list will be used, and auto-discovery
                   of other policies will be skipped. If None (default), the engine
                   will auto-discover all imported @Policy-decorated functions.
         audit_trail: Optional AuditTrail instance. If None, creates a new one.
         metrics: Optional PolicyMetrics instance. If None, creates a new one.
+        fast_path_after: Optional number of consecutive ALLOW decisions after
+                  which a policy moves to an uninstrumented fast path. While on
+                  the fast path, its ALLOW decisions are not timed, recorded in
+                  metrics or written to the audit trail; the first non-ALLOW
+                  outcome moves it back. None (default) disables the fast path.
+        parallel: If True and the engine has at least 16 policies, policies run
+                  concurrently on a shared thread pool. The result, metrics and
+                  audit records are the same as a serial evaluation; policies
+                  past the deciding BLOCK may still run but are not recorded.
+                  Worth enabling for slow, I/O-bound policies. The fast path
+                  only applies to serial evaluation.
     """
 
     def __init__(
         self,
-        policies: Optional[List[Callable]] = None,
+        policies: Optional[List[Union[Callable, PolicyInfo]]] = None,
         audit_trail: Optional[AuditTrail] = None,
         metrics: Optional[PolicyMetrics] = None,
+        fast_path_after: Optional[int] = None,
+        parallel: bool = False,
     ):
-        self._policies: List[PolicyInfo] = []
+        if fast_path_after is not None and fast_path_after < 1:
+            raise ValueError("fast_path_after must be a positive integer or None.")
+
+        self._policies: Tuple[PolicyInfo, ...] = ()
         self.audit_trail = audit_trail or AuditTrail()
-        self.metrics = metrics or PolicyMetrics()
+        self._metrics = metrics or PolicyMetrics()
+        self._evaluator = None
 
         if policies is not None:
             # --- Explicit Configuration Path ---
             # If a list is provided, register ONLY those policies.
             # We filter out any non-callable items for safety.
-            valid_policies = [p for p in policies if callable(p)]
+            valid_policies = [
+                p for p in policies if isinstance(p, PolicyInfo) or callable(p)
+            ]
             self._register_policies(valid_policies)
         else:
             # --- Auto-Discovery Path (Backward-Compatible) ---
@@ -113,21 +243,38 @@ class PolicyEngine:
                 "functions are imported."
             )
 
+        self._read_keys: Tuple[str, ...] = tuple(
+            dict.fromkeys(k for p in self._policies for k in p.reads or ())
+        )
+        self._parallel = parallel and len(self._policies) >= _PARALLEL_MIN_POLICIES
+        self._fast_path_after = fast_path_after
+        self._fast_path_policies: Set[int] = set()
+        self._allow_streaks: List[int] = [0] * len(self._policies)
+        self._decision_update = _DECISION_UPDATE
+        if all(
+            p.actions is not None and p.actions <= _BINARY_ACTIONS
+            for p in self._policies
+        ):
+            self._decision_update = _BINARY_DECISION_UPDATE
+        self._evaluator = self._compile()
+
         # Record a telemetry event for initialization
         get_telemetry_manager().record_event(
             "component_initialized", {"name": "PolicyEngine"}
         )
 
-    def _register_policies(self, policy_funcs: List[Callable]):
+    def _register_policies(self, policy_funcs: List[Union[Callable, PolicyInfo]]):
         """
         Processes a list of decorated functions and adds them to the engine's active set,
-        sorted by priority.
+        sorted by priority. PolicyInfo entries are used as-is.
         """
         # This logic re-uses the metadata attached by the @Policy decorator.
         # It ensures that even explicitly passed policies are handled correctly.
         policy_infos = []
         for func in policy_funcs:
-            if hasattr(func, "_policy_info"):
+            if isinstance(func, PolicyInfo):
+                policy_infos.append(func)
+            elif hasattr(func, "_policy_info"):
                 policy_infos.append(func._policy_info)
             else:
                 # Handle the case where a non-decorated function is passed.
@@ -136,11 +283,171 @@ class PolicyEngine:
                 name = getattr(func, "__name__", "anonymous_policy")
                 policy_infos.append(PolicyInfo(name=name, priority=0, func=func))
 
-        self._policies = sorted(policy_infos, key=lambda p: p.priority, reverse=True)
+        self._policies = tuple(
+            sorted(policy_infos, key=attrgetter("priority"), reverse=True)
+        )
 
     def _discover_policies(self):
         """Auto-discovers all imported @Policy-decorated functions from the global registry."""
-        self._policies = sorted(get_policies(), key=lambda p: p.priority, reverse=True)
+        self._policies = get_policies()
+
+    def _compile(self) -> Callable:
+        """
+        Unrolls the active policies into a single generated function.
+
+        Each policy becomes a straight-line block of the generated source, so an
+        evaluation runs without the per-policy loop, attribute lookups and list
+        allocations of a generic dispatcher. Policy functions, names and action
+        singletons are bound as globals of the generated function.
+        """
+        namespace = {
+            "_BLOCK": _BLOCK,
+            "_ALLOW": _ALLOW,
+            "_SKIP": _SKIP,
+            "_ALLOW_DECISION": ALLOW,
+            "_perf_counter": time.perf_counter,
+            "_policy_failed": _policy_failed,
+            "_streaks": self._allow_streaks,
+            "_promote": self._promote_to_fast_path,
+            "_demote": self._demote_from_fast_path,
+        }
+        # Decisions are collected as (name, decision, latency_ms, error) records
+        # and handed to metrics and the audit trail in one batch per evaluation.
+        lines = [
+            "def _evaluate(context, record_bulk, audit_bulk):",
+            "    records = []",
+            "    append = records.append",
+            "    final_decision = _ALLOW_DECISION",
+            "    try:",
+        ]
+        # Metrics sinks can opt out of timing with `enabled = False`.
+        timed = getattr(self._metrics, "enabled", True)
+        if self._read_keys:
+            # Metadata keys declared via `reads=` are looked up once and shared.
+            entries = ", ".join(f"{k!r}: _get({k!r})" for k in self._read_keys)
+            lines += [
+                "        _get = context.metadata.get",
+                f"        view = {{{entries}}}",
+            ]
+        if timed:
+            lines.append("        last_time = _perf_counter()")
+        clock_is_stale = False
+        for i, policy_info in enumerate(self._policies):
+            namespace[f"_func{i}"] = policy_info.func
+            namespace[f"_name{i}"] = policy_info.name
+            if i in self._fast_path_policies:
+                block = self._fast_path_block(i)
+                clock_is_stale = True
+            else:
+                block = self._instrumented_block(i, timed, clock_is_stale)
+                clock_is_stale = False
+            lines += _indent(block, 4)
+        lines += [
+            "        return final_decision",
+            "    finally:",
+            "        record_bulk(records)",
+            "        audit_bulk(context, records)",
+        ]
+
+        exec(compile("\n".join(lines), "<clearstone.PolicyEngine>", "exec"), namespace)
+        return namespace["_evaluate"]
+
+    @property
+    def metrics(self) -> PolicyMetrics:
+        """The PolicyMetrics instance receiving this engine's evaluation records."""
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics: PolicyMetrics):
+        self._metrics = metrics
+        if self._evaluator is not None:
+            # Timing is baked into the generated evaluator; rebuild it in case
+            # the new sink has a different `enabled` setting.
+            self._evaluator = self._compile()
+
+    def _instrumented_block(
+        self, i: int, timed: bool, restart_clock: bool
+    ) -> List[str]:
+        """
+        Generated source for a policy that is timed, recorded and audited.
+
+        Timing uses one running clock per evaluation: each policy's latency is
+        measured from the previous reading, so only one `perf_counter()` call is
+        made per policy. The clock is restarted after untimed fast-path blocks.
+        """
+        lines = []
+        if timed:
+            if restart_clock:
+                lines.append("    last_time = _perf_counter()")
+            lines += [
+                "    try:",
+                f"        decision = _func{i}({self._call_args(i)})",
+                "        action = decision.action",
+                "        now = _perf_counter()",
+                f"        append((_name{i}, decision, (now - last_time) * 1000, None))",
+                "        last_time = now",
+            ]
+        else:
+            lines += [
+                "    try:",
+                f"        decision = _func{i}({self._call_args(i)})",
+                "        action = decision.action",
+                f"        append((_name{i}, decision, 0.0, None))",
+            ]
+        if self._fast_path_after is None:
+            lines += _indent(self._decision_update, 8)
+        else:
+            lines += [
+                "        if decision is _ALLOW_DECISION:",
+                f"            _streaks[{i}] += 1",
+                f"            if _streaks[{i}] >= {self._fast_path_after}:",
+                f"                _promote({i})",
+                "        else:",
+                f"            _streaks[{i}] = 0",
+                *_indent(self._decision_update, 12),
+            ]
+        lines += [
+            "    except Exception as e:",
+            f"        return _policy_failed(_name{i}, e, {'last_time' if timed else 'None'}, append)",
+        ]
+        return lines
+
+    def _fast_path_block(self, i: int) -> List[str]:
+        """
+        Generated source for a policy that has only returned ALLOW so far.
+
+        The call is neither timed nor recorded while it keeps returning ALLOW.
+        Any other outcome demotes the policy back to the instrumented block and
+        is recorded and audited as usual (with a latency of 0.0 ms, since the
+        call was not timed).
+        """
+        return [
+            "    try:",
+            f"        decision = _func{i}({self._call_args(i)})",
+            "        if decision is not _ALLOW_DECISION:",
+            f"            _demote({i})",
+            "            action = decision.action",
+            f"            append((_name{i}, decision, 0.0, None))",
+            *_indent(self._decision_update, 12),
+            "    except Exception as e:",
+            f"        _demote({i})",
+            f"        return _policy_failed(_name{i}, e, None, append)",
+        ]
+
+    def _call_args(self, i: int) -> str:
+        """Generated argument list for calling policy `i`."""
+        return "context" if self._policies[i].reads is None else "context, view"
+
+    def _promote_to_fast_path(self, i: int):
+        """Moves a consistently-allowing policy onto the uninstrumented fast path."""
+        self._fast_path_policies.add(i)
+        self._evaluator = self._compile()
+
+    def _demote_from_fast_path(self, i: int):
+        """Returns a fast-path policy to the instrumented path after a non-ALLOW."""
+        self._fast_path_policies.discard(i)
+        self._allow_streaks[i] = 0
+        self._evaluator = self._compile()
 
     def evaluate(self, context: Optional[PolicyContext] = None) -> Decision:
         """
@@ -158,43 +465,155 @@ class PolicyEngine:
                 "Use `with context_scope(ctx):` before calling evaluate."
             )
 
+        if self._parallel:
+            return self._evaluate_parallel(context)
+        return self._evaluator(
+            context, self._metrics.record_bulk, self.audit_trail.record_decisions
+        )
+
+    def _evaluate_parallel(self, context: PolicyContext) -> Decision:
+        """
+        Runs every policy on the shared thread pool and folds the results.
+
+        Results are folded in priority order as soon as each prefix of policies
+        has completed, so the outcome matches a serial evaluation and the first
+        BLOCK in priority order returns without waiting for lower-priority work.
+        """
+        policies = self._policies
+        executor = _get_executor()
+        view = {k: context.metadata.get(k) for k in self._read_keys}
+        futures = {
+            executor.submit(
+                _run_policy, info.func, context, None if info.reads is None else view
+            ): i
+            for i, info in enumerate(policies)
+        }
+        results = [None] * len(policies)
+        records = []
         final_decision = ALLOW
+        folded = 0
+        try:
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                while folded < len(policies) and results[folded] is not None:
+                    decision, latency_ms, error = results[folded]
+                    name = policies[folded].name
+                    folded += 1
+                    if error is None:
+                        try:
+                            action = decision.action
+                        except AttributeError as e:
+                            error = e
+                    if error is not None:
+                        failed = _failure_decision(name, error)
+                        records.append((name, failed, latency_ms, str(error)))
+                        return failed
+                    records.append((name, decision, latency_ms, None))
+                    if action is _BLOCK:
+                        return decision
+                    if (
+                        final_decision is ALLOW
+                        and action is not _ALLOW
+                        and action is not _SKIP
+                    ):
+                        final_decision = decision
+            return final_decision
+        finally:
+            for future in futures:
+                future.cancel()
+            self._metrics.record_bulk(records)
+            self.audit_trail.record_decisions(context, records)
 
-        for policy_info in self._policies:
-            start_time = time.perf_counter()
+    def get_audit_trail(self, limit: int = 100):
+        """Returns the most recent audit trail entries."""
+        return self.audit_trail.get_entries(limit=limit)
 
-            try:
-                decision = policy_info.func(context)
-                end_time = time.perf_counter()
-                latency_ms = (end_time - start_time) * 1000
 
-                self.metrics.record(policy_info.name, decision, latency_ms)
-                self.audit_trail.record_decision(policy_info.name, context, decision)
+# Generated source that folds a policy's decision into `final_decision`.
+# ALLOW is by far the most common outcome, so it is ruled out with a single
+# identity test before the BLOCK exit and the first-escalation check.
+_DECISION_UPDATE = [
+    "if action is not _ALLOW:",
+    "    if action is _BLOCK:",
+    "        return decision",
+    "    if final_decision is _ALLOW_DECISION and action is not _SKIP:",
+    "        final_decision = decision",
+]
 
-                if decision.action == ActionType.BLOCK:
-                    return decision
+# Decision update for engines whose policies only return ALLOW or BLOCK: any
+# non-ALLOW outcome ends the evaluation, so `final_decision` never changes.
+_BINARY_DECISION_UPDATE = [
+    "if action is not _ALLOW:",
+    "    return decision",
+]
 
-                if (
-                    final_decision.action == ActionType.ALLOW
-                    and decision.action not in [ActionType.ALLOW, ActionType.SKIP]
-                ):
-                    final_decision = decision
 
-            except Exception as e:
-                end_time = time.perf_counter()
-                latency_ms = (end_time - start_time) * 1000
+def _indent(lines: List[str], width: int) -> List[str]:
+    """Indents generated source lines by `width` spaces."""
+    return [" " * width + line for line in lines]
 
-                err_reason = f"Policy '{policy_info.name}' raised an exception: {e}"
-                err_decision = BLOCK(err_reason)
 
-                self.metrics.record(policy_info.name, err_decision, latency_ms)
-                self.audit_trail.record_decision(
-                    policy_info.name, context, err_decision, error=str(e)
-                )
-                return err_decision
+def _policy_failed(
+    name: str, error: Exception, start_time: Optional[float], append: Callable
+) -> Decision:
+    """
+    Records a policy that raised an exception and returns the fail-safe BLOCK.
 
-        return final_decision
+    `start_time` is None when the policy was not being timed.
+    """
+    latency_ms = 0.0
+    if start_time is not None:
+        latency_ms = (time.perf_counter() - start_time) * 1000
 
-    def get_audit_trail(self, limit: int = 100):
-        """Returns the most recent audit trail entries."""
-        return self.audit_trail.get_entries(limit=limit)
+    err_decision = _failure_decision(name, error)
+
+    append((name, err_decision, latency_ms, str(error)))
+    return err_decision
+
+
+def _failure_decision(name: str, error: Exception) -> Decision:
+    """The fail-safe BLOCK returned when a policy raises."""
+    return BLOCK(f"Policy '{name}' raised an exception: {error}")
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Returns the thread pool shared by all parallel engines, creating it once."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(thread_name_prefix="clearstone-policy")
+    return _executor
+
+
+def _policy_args(func: Callable, context: PolicyContext) -> Tuple[Any, ...]:
+    """
+    Returns the arguments to call a policy with outside of an engine:
+    `(context,)`, or `(context, view)` for a policy that declared `reads`,
+    with the view built from the context metadata like PolicyEngine does.
+    """
+    info = getattr(func, "_policy_info", None)
+    reads = None if info is None else info.reads
+    if reads is None:
+        return (context,)
+    get = context.metadata.get
+    return (context, {key: get(key) for key in reads})
+
+
+def _run_policy(func: Callable, context: PolicyContext, view: Optional[Dict[str, Any]]):
+    """
+    Pool worker: calls one policy and returns (decision, latency_ms, error).
+    `view` is passed as a second argument to policies that declared `reads`.
+
+    ContextVars do not follow work onto pool threads, so the context is set
+    for the duration of the call.
+    """
+    token = _policy_context.set(context)
+    start_time = time.perf_counter()
+    try:
+        decision = func(context) if view is None else func(context, view)
+    except Exception as e:
+        return None, (time.perf_counter() - start_time) * 1000, e
+    finally:
+        _policy_context.reset(token)
+    return decision, (time.perf_counter() - start_time) * 1000, None
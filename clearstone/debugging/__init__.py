@@ -1,4 +1,39 @@
-from .checkpoint import Checkpoint, CheckpointManager
-from .replay import ReplayEngine
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["Checkpoint", "CheckpointManager", "ReplayEngine"]
+if TYPE_CHECKING:
+    from .checkpoint import (
+        Checkpoint,
+        CheckpointHeader,
+        CheckpointManager,
+        CheckpointSchema,
+    )
+    from .replay import ReplayEngine
+
+# Attributes imported on first access (PEP 562), so importing the package does
+# not load the checkpoint format or the replay machinery (and pdb) until used.
+_LAZY = {
+    "Checkpoint": "clearstone.debugging.checkpoint",
+    "CheckpointHeader": "clearstone.debugging.checkpoint",
+    "CheckpointManager": "clearstone.debugging.checkpoint",
+    "CheckpointSchema": "clearstone.debugging.checkpoint",
+    "ReplayEngine": "clearstone.debugging.replay",
+}
+
+
+def __getattr__(name):
+    """Lazily imports the attributes listed in `_LAZY`."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "Checkpoint",
+    "CheckpointHeader",
+    "CheckpointManager",
+    "CheckpointSchema",
+    "ReplayEngine",
+]
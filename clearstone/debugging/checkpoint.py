@@ -1,24 +1,60 @@
-import base64
-import json
+import binascii
+import itertools
+import mmap
+import os
 import pickle
+import struct
 import sys
+import threading
 import time
-import uuid
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from pydantic import BaseModel, Field
 
-from clearstone.observability.models import Span, Trace
+from clearstone.observability.models import Span, Trace, new_id
+from clearstone.utils.serialization import json_dumps, json_loads
 
 
-class Checkpoint(BaseModel):
+def _new_checkpoint_id() -> str:
+    """Generates a unique checkpoint ID."""
+    return f"ckpt_{new_id()}"
+
+
+@dataclass(slots=True, kw_only=True)
+class Checkpoint:
     """
     A snapshot of an agent's state at a specific point in a trace,
     designed to be rehydrated by the ReplayEngine.
+
+    A plain dataclass: checkpoints are only built by the SDK from already typed
+    values, so construction skips validation. `CheckpointSchema` is the
+    validating equivalent, used by `CheckpointSerializer.deserialize(strict=True)`.
     """
 
-    checkpoint_id: str = Field(default_factory=lambda: f"ckpt_{uuid.uuid4().hex}")
+    checkpoint_id: str = field(default_factory=_new_checkpoint_id)
+    trace_id: str
+    span_id: str
+
+    timestamp_ns: int = field(default_factory=time.time_ns)
+
+    agent_state: Dict[str, Any]
+    agent_class_path: str
+
+    current_span: Span
+    upstream_spans: List[Span] = field(default_factory=list)
+
+    python_version: str = f"{sys.version_info.major}.{sys.version_info.minor}"
+    clearstone_version: str
+
+
+class CheckpointSchema(BaseModel):
+    """Pydantic schema of a Checkpoint, for validating checkpoints from files."""
+
+    checkpoint_id: str = Field(default_factory=_new_checkpoint_id)
     trace_id: str
     span_id: str
 
@@ -36,52 +72,329 @@ class Checkpoint(BaseModel):
     clearstone_version: str
 
 
+@dataclass(frozen=True, slots=True)
+class CheckpointHeader:
+    """
+    Everything in a checkpoint except the agent state.
+
+    Reading a header skips decompressing and unpickling the agent state, so
+    checkpoints can be listed and inspected cheaply.
+    """
+
+    checkpoint_id: str
+    trace_id: str
+    span_id: str
+    timestamp_ns: int
+    agent_class_path: str
+    python_version: str
+    clearstone_version: str
+    current_span: Span
+    upstream_spans: List[Span]
+
+
+# Checkpoints are written as a framed binary container:
+#
+#   magic (4 bytes) | format version (1 byte) | codec (1 byte) | section | ...
+#
+# where each section is a little-endian u64 length followed by its bytes. The
+# sections are, in order: metadata JSON, pickled agent state, spans JSON, then
+# one section per out-of-band pickle buffer. The pickle is stored raw, so there
+# is no base64 pass, and large buffers (e.g. numpy arrays) are written as-is
+# next to it rather than copied into the pickle stream (pickle protocol 5).
+# The codec applies to the agent-state pickle and its out-of-band buffers; the
+# JSON sections are never compressed. Files written before the framed format
+# (a single JSON document) are still readable.
+_MAGIC = b"CSCK"
+_FORMAT_VERSION = 2
+_HEADER = struct.Struct("<4sBB")
+_SECTION_LENGTH = struct.Struct("<Q")
+
+# Compression codecs by name, as stored in the frame header. blosc2 is an
+# optional dependency; its shuffle filter suits numeric (array) state.
+_CODECS = {None: 0, "zlib": 1, "blosc2": 2}
+
+
+def _import_blosc2():
+    """Imports blosc2, explaining how to install it when it is missing."""
+    try:
+        import blosc2
+    except ImportError as e:
+        raise ImportError(
+            "Checkpoint compression 'blosc2' requires the blosc2 package. "
+            "Install it with `pip install clearstone-sdk[compression]`."
+        ) from e
+    return blosc2
+
+
+def _compress(codec: int, data: Union[bytes, memoryview], typesize: int = 1):
+    """Compresses one section with the given codec id (0 leaves it as-is)."""
+    if codec == 1:
+        return zlib.compress(data, 1)
+    if codec == 2:
+        blosc2 = _import_blosc2()
+        return blosc2.compress2(
+            data,
+            codec=blosc2.Codec.LZ4,
+            clevel=3,
+            filters=[blosc2.Filter.SHUFFLE],
+            typesize=typesize,
+        )
+    return data
+
+
+def _decompress(codec: int, data: memoryview):
+    """Reverses `_compress` for one section."""
+    if codec == 1:
+        return zlib.decompress(data)
+    if codec == 2:
+        return _import_blosc2().decompress2(data)
+    return data
+
+
+def _frame_sections(
+    sections: List[Union[bytes, memoryview]], codec: int = 0
+) -> List[Union[bytes, memoryview]]:
+    """
+    Interleaves the header and length prefixes with the sections.
+
+    The returned buffers are not joined, so they can be handed to `os.writev`
+    as they are; their concatenation is the framed checkpoint.
+    """
+    framed = [_HEADER.pack(_MAGIC, _FORMAT_VERSION, codec)]
+    for section in sections:
+        framed.append(_SECTION_LENGTH.pack(len(section)))
+        framed.append(section)
+    return framed
+
+
+def _read_sections(view: memoryview) -> Tuple[int, List[memoryview]]:
+    """
+    Slices the sections out of a framed checkpoint without copying them.
+
+    Returns:
+        The codec id from the header and the list of sections.
+    """
+    _, version, codec = _HEADER.unpack_from(view)
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format version: {version}")
+
+    sections = []
+    offset = _HEADER.size
+    while offset < len(view):
+        (length,) = _SECTION_LENGTH.unpack_from(view, offset)
+        offset += _SECTION_LENGTH.size
+        sections.append(view[offset : offset + length])
+        offset += length
+    return codec, sections
+
+
+# Encoded JSON of ended spans, keyed by (trace_id, span_id, end_time_ns). A span
+# no longer changes once it has ended, and consecutive checkpoints of a trace
+# share most of their upstream spans, so each ended span is encoded only once.
+# Oldest entries are evicted first once the cache is full. The lock guards
+# every access; spans are encoded outside it.
+_span_json_cache: Dict[Tuple[str, str, int], bytes] = {}
+_span_json_cache_lock = threading.Lock()
+_SPAN_JSON_CACHE_SIZE = 4096
+
+
+def _encode_span(span: Span) -> bytes:
+    """Returns the JSON encoding of a span, reusing it for ended spans."""
+    if span.end_time_ns is None:
+        return json_dumps(span)
+    key = (span.trace_id, span.span_id, span.end_time_ns)
+    with _span_json_cache_lock:
+        encoded = _span_json_cache.get(key)
+    if encoded is not None:
+        return encoded
+    encoded = json_dumps(span)
+    with _span_json_cache_lock:
+        encoded = _span_json_cache.setdefault(key, encoded)
+        while len(_span_json_cache) > _SPAN_JSON_CACHE_SIZE:
+            del _span_json_cache[next(iter(_span_json_cache))]
+    return encoded
+
+
+def _encode_spans(current_span: Span, upstream_spans: List[Span]) -> bytes:
+    """Builds the spans section by joining the per-span encodings."""
+    return b"".join(
+        [
+            b'{"current_span":',
+            _encode_span(current_span),
+            b',"upstream_spans":[',
+            b",".join([_encode_span(s) for s in upstream_spans]),
+            b"]}",
+        ]
+    )
+
+
 class CheckpointSerializer:
     """Handles the serialization and deserialization of Checkpoint objects."""
 
     @staticmethod
-    def serialize(checkpoint: Checkpoint) -> bytes:
+    def clear_span_cache(trace_id: Optional[str] = None):
         """
-        Serializes a checkpoint using a hybrid JSON/pickle approach.
-        Metadata is JSON for readability, while the agent state is pickled for fidelity.
+        Drops cached span encodings, e.g. once a trace's last checkpoint is written.
+
+        Args:
+            trace_id: Only drop the spans of this trace. None clears everything.
         """
+        with _span_json_cache_lock:
+            if trace_id is None:
+                _span_json_cache.clear()
+                return
+            for key in [k for k in _span_json_cache if k[0] == trace_id]:
+                del _span_json_cache[key]
+
+    @staticmethod
+    def serialize(checkpoint: Checkpoint, compression: Optional[str] = None) -> bytes:
+        """
+        Serializes a checkpoint into the framed binary format.
+        Metadata and spans are JSON for readability, while the agent state is
+        pickled for fidelity and stored as raw bytes.
+
+        Args:
+            checkpoint: The checkpoint to serialize.
+            compression: Optional codec for the agent state: "zlib", or "blosc2"
+                         (LZ4 with byte shuffling, well suited to numeric arrays;
+                         requires the blosc2 package). None stores it uncompressed.
+        """
+        return b"".join(CheckpointSerializer.serialize_buffers(checkpoint, compression))
+
+    @staticmethod
+    def serialize_buffers(
+        checkpoint: Checkpoint, compression: Optional[str] = None
+    ) -> List[Union[bytes, memoryview]]:
+        """
+        Serializes a checkpoint like `serialize`, but without joining the result.
+
+        Returns:
+            The framed checkpoint as a list of byte buffers whose concatenation
+            equals `serialize(checkpoint, compression)`, suitable for `os.writev`.
+        """
+        if compression not in _CODECS:
+            raise ValueError(f"Unknown checkpoint compression: {compression!r}")
+        codec = _CODECS[compression]
+
+        metadata = {
+            "checkpoint_id": checkpoint.checkpoint_id,
+            "trace_id": checkpoint.trace_id,
+            "span_id": checkpoint.span_id,
+            "timestamp_ns": checkpoint.timestamp_ns,
+            "agent_class_path": checkpoint.agent_class_path,
+            "python_version": checkpoint.python_version,
+            "clearstone_version": checkpoint.clearstone_version,
+        }
+        buffers = []
         agent_state_pickled = pickle.dumps(
-            checkpoint.agent_state, protocol=pickle.HIGHEST_PROTOCOL
+            checkpoint.agent_state, protocol=5, buffer_callback=buffers.append
         )
 
-        payload = {
-            "metadata": {
-                "checkpoint_id": checkpoint.checkpoint_id,
-                "trace_id": checkpoint.trace_id,
-                "span_id": checkpoint.span_id,
-                "timestamp_ns": checkpoint.timestamp_ns,
-                "agent_class_path": checkpoint.agent_class_path,
-                "python_version": checkpoint.python_version,
-                "clearstone_version": checkpoint.clearstone_version,
-            },
-            "current_span": checkpoint.current_span.model_dump(mode="json"),
-            "upstream_spans": [
-                s.model_dump(mode="json") for s in checkpoint.upstream_spans
+        # Buffers keep their item size so blosc2's shuffle sees real strides.
+        return _frame_sections(
+            [
+                json_dumps(metadata),
+                _compress(codec, agent_state_pickled),
+                _encode_spans(checkpoint.current_span, checkpoint.upstream_spans),
+                *(
+                    _compress(codec, buffer.raw(), memoryview(buffer).itemsize)
+                    for buffer in buffers
+                ),
             ],
-            "agent_state_pickle_b64": base64.b64encode(agent_state_pickled).decode(
-                "utf-8"
-            ),
-        }
-        return json.dumps(payload).encode("utf-8")
+            codec,
+        )
 
     @staticmethod
-    def deserialize(data: bytes) -> Checkpoint:
-        """Deserializes bytes back into a Checkpoint object."""
-        payload = json.loads(data.decode("utf-8"))
-        metadata = payload["metadata"]
+    def deserialize(
+        data: Union[bytes, bytearray, memoryview, mmap.mmap], strict: bool = False
+    ) -> Checkpoint:
+        """
+        Deserializes bytes back into a Checkpoint object.
+
+        Out-of-band pickle buffers reference `data` in place when it is writable
+        (e.g. a bytearray or a copy-on-write mmap). Read-only input is copied per
+        buffer, so restored arrays stay writable.
+
+        Args:
+            data: The serialized checkpoint.
+            strict: Validate the result against CheckpointSchema, e.g. for
+                    checkpoints from an untrusted or older writer.
+        """
+        checkpoint = CheckpointSerializer._deserialize(memoryview(data))
+        if strict:
+            CheckpointSchema.model_validate(checkpoint, from_attributes=True)
+        return checkpoint
+
+    @staticmethod
+    def _deserialize(view: memoryview) -> Checkpoint:
+        """Deserializes a framed or legacy checkpoint without validating it."""
+        if view[: len(_MAGIC)] != _MAGIC:
+            return CheckpointSerializer._deserialize_legacy(view)
+
+        codec, sections = _read_sections(view)
+        metadata_section, agent_state_section, spans_section, *buffers = sections
+        if codec:
+            agent_state_section = _decompress(codec, agent_state_section)
+            buffers = [bytearray(_decompress(codec, buffer)) for buffer in buffers]
+        elif view.readonly:
+            buffers = [bytearray(buffer) for buffer in buffers]
+        metadata = json_loads(metadata_section)
+        spans = json_loads(spans_section)
+        agent_state = pickle.loads(agent_state_section, buffers=buffers)
+
+        return CheckpointSerializer._build_checkpoint(metadata, agent_state, spans)
 
-        agent_state_pickled = base64.b64decode(
-            payload["agent_state_pickle_b64"].encode("utf-8")
+    @staticmethod
+    def deserialize_header(
+        data: Union[bytes, bytearray, memoryview, mmap.mmap],
+    ) -> CheckpointHeader:
+        """
+        Deserializes only the metadata and spans of a checkpoint.
+
+        The agent-state section is never decompressed or unpickled, so this is
+        much cheaper than `deserialize` for large agents.
+        """
+        view = memoryview(data)
+        if view[: len(_MAGIC)] != _MAGIC:
+            payload = json_loads(view)
+            metadata, spans = payload["metadata"], payload
+        else:
+            _, sections = _read_sections(view)
+            metadata = json_loads(sections[0])
+            spans = json_loads(sections[2])
+
+        return CheckpointHeader(
+            checkpoint_id=metadata["checkpoint_id"],
+            trace_id=metadata["trace_id"],
+            span_id=metadata["span_id"],
+            timestamp_ns=metadata["timestamp_ns"],
+            agent_class_path=metadata["agent_class_path"],
+            python_version=metadata["python_version"],
+            clearstone_version=metadata["clearstone_version"],
+            current_span=Span.model_validate(spans["current_span"]),
+            upstream_spans=[Span.model_validate(s) for s in spans["upstream_spans"]],
         )
+
+    @staticmethod
+    def _deserialize_legacy(data: memoryview) -> Checkpoint:
+        """Reads a checkpoint written as a single JSON document (format version 1)."""
+        payload = json_loads(data)
+
+        # a2b_base64 decodes the ASCII str directly, without an encoded copy.
+        agent_state_pickled = binascii.a2b_base64(payload["agent_state_pickle_b64"])
         agent_state = pickle.loads(agent_state_pickled)
 
-        current_span = Span.model_validate(payload["current_span"])
-        upstream_spans = [Span.model_validate(s) for s in payload["upstream_spans"]]
+        return CheckpointSerializer._build_checkpoint(
+            payload["metadata"], agent_state, payload
+        )
+
+    @staticmethod
+    def _build_checkpoint(
+        metadata: Dict[str, Any], agent_state: Dict[str, Any], spans: Dict[str, Any]
+    ) -> Checkpoint:
+        """Assembles a Checkpoint from its decoded metadata, state and spans."""
+        current_span = Span.model_validate(spans["current_span"])
+        upstream_spans = [Span.model_validate(s) for s in spans["upstream_spans"]]
 
         return Checkpoint(
             checkpoint_id=metadata["checkpoint_id"],
@@ -97,30 +410,239 @@ class CheckpointSerializer:
         )
 
 
+# Batched checkpoints are appended to one log file per trace. Each record is a
+# magic, a little-endian u64 payload length and a serialized checkpoint; the
+# sidecar index maps checkpoint IDs to (payload offset, payload length).
+_LOG_RECORD_MAGIC = b"CSCL"
+_LOG_RECORD_HEADER = struct.Struct("<4sQ")
+_LOG_SUFFIX = ".ckptlog"
+_INDEX_SUFFIX = ".idx"
+
+# Checkpoints are binary; Windows would otherwise translate newlines.
+_O_BINARY = getattr(os, "O_BINARY", 0)
+# fdatasync skips flushing unchanged file metadata; macOS only has fsync.
+_datasync = getattr(os, "fdatasync", os.fsync)
+# Whether files can be opened relative to a directory descriptor (not Windows).
+_SUPPORTS_DIR_FD = hasattr(os, "O_DIRECTORY") and os.open in os.supports_dir_fd
+
+
+def _release_written_pages(fd: int):
+    """
+    Hints the OS that a just-written file will not be read back soon.
+
+    On Linux, POSIX_FADV_DONTNEED starts writeback of the file's dirty pages
+    and drops clean ones, so a burst of checkpoints does not pile up dirty
+    page cache that stalls a later sync. A no-op where fadvise is unavailable.
+    """
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _map_file(path: Path) -> mmap.mmap:
+    """
+    Maps a checkpoint file copy-on-write.
+
+    A copy-on-write mapping lets out-of-band buffers in the agent state
+    reference the mapped pages directly while staying writable. The mapping is
+    released once nothing references it any more.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Checkpoint file is empty: {path}")
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+
+def _write_all(fd: int, data: Union[bytes, memoryview]):
+    """Writes all of `data` to a file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _iov_max() -> int:
+    """Returns the most buffers a single writev call accepts, or 1024 if unknown."""
+    try:
+        value = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):
+        return 1024
+    return value if value > 0 else 1024
+
+
+_IOV_MAX = _iov_max()
+
+
+def _writev_all(fd: int, buffers: List[Union[bytes, memoryview]]):
+    """
+    Writes a list of buffers to a file descriptor in as few syscalls as possible.
+
+    Uses `os.writev`, so the buffers are not joined in user space first, and
+    retries short writes. Falls back to a single joined write where writev is
+    unavailable (Windows).
+    """
+    if not hasattr(os, "writev"):
+        _write_all(fd, b"".join(buffers))
+        return
+    pending = deque(memoryview(b) for b in buffers if len(b))
+    while pending:
+        written = os.writev(fd, list(itertools.islice(pending, _IOV_MAX)))
+        while pending and written >= len(pending[0]):
+            written -= len(pending.popleft())
+        if written:
+            pending[0] = pending[0][written:]
+
+
+# Queued log records are written out once they reach this many bytes, even
+# before the batch is synced, to bound the memory a batch holds.
+_LOG_FLUSH_BYTES = 4 * 1024 * 1024
+
+
+class _CheckpointLog:
+    """
+    An open per-trace checkpoint log and its index entries.
+
+    Appended records are queued and written with a single `os.writev` when the
+    log is synced (or the queue grows past `_LOG_FLUSH_BYTES`), so a burst of
+    small checkpoints costs one write syscall instead of one each.
+    """
+
+    __slots__ = ("fd", "index_path", "entries", "_end", "_pending", "_pending_bytes")
+
+    def __init__(self, log_path: Path):
+        self.fd = os.open(
+            log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | _O_BINARY, 0o644
+        )
+        self.index_path = log_path.with_suffix(_INDEX_SUFFIX)
+        self.entries: Dict[str, List[int]] = {}
+        if self.index_path.exists():
+            self.entries = json_loads(self.index_path.read_bytes())
+        self._end = os.fstat(self.fd).st_size
+        self._pending: List[Union[bytes, memoryview]] = []
+        self._pending_bytes = 0
+
+    def append(self, checkpoint_id: str, payload: List[Union[bytes, memoryview]]):
+        """Queues one framed record and remembers where its payload will start."""
+        length = sum(len(b) for b in payload)
+        self._pending.append(_LOG_RECORD_HEADER.pack(_LOG_RECORD_MAGIC, length))
+        # Uncompressed out-of-band buffers still point into the live agent
+        # state, so they are copied before the record is queued.
+        self._pending.extend(
+            bytes(b) if isinstance(b, memoryview) else b for b in payload
+        )
+        self.entries[checkpoint_id] = [self._end + _LOG_RECORD_HEADER.size, length]
+        self._end += _LOG_RECORD_HEADER.size + length
+        self._pending_bytes += _LOG_RECORD_HEADER.size + length
+        if self._pending_bytes >= _LOG_FLUSH_BYTES:
+            self.flush()
+
+    def flush(self):
+        """Writes all queued records to the log."""
+        if self._pending:
+            _writev_all(self.fd, self._pending)
+            self._pending = []
+            self._pending_bytes = 0
+
+    def sync(self):
+        """Makes the appended records durable and atomically rewrites the index."""
+        self.flush()
+        _datasync(self.fd)
+        _release_written_pages(self.fd)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp_path.write_bytes(json_dumps(self.entries))
+        os.replace(tmp_path, self.index_path)
+
+
 class CheckpointManager:
-    """Manages the creation, storage, and retrieval of checkpoints."""
+    """
+    Manages the creation, storage, and retrieval of checkpoints.
+
+    Args:
+        checkpoint_dir: Directory checkpoint files are written to.
+        compression: Optional codec for saved agent state ("zlib" or "blosc2").
+    """
 
-    def __init__(self, checkpoint_dir: str = ".clearstone_checkpoints"):
+    _dir_fd: Optional[int] = None
+
+    def __init__(
+        self,
+        checkpoint_dir: str = ".clearstone_checkpoints",
+        compression: Optional[str] = None,
+    ):
+        if compression not in _CODECS:
+            raise ValueError(f"Unknown checkpoint compression: {compression!r}")
         self.checkpoint_dir = Path(checkpoint_dir)
+        self.compression = compression
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        # Checkpoint files are opened relative to a cached directory descriptor,
+        # so saving one does not resolve the directory path again.
+        if _SUPPORTS_DIR_FD:
+            self._dir_fd = os.open(self.checkpoint_dir, os.O_RDONLY | os.O_DIRECTORY)
         self.sdk_version = "0.1.0"
+        self._batch: Optional[Dict[str, _CheckpointLog]] = None
+        self._flush_every: Optional[int] = None
+        self._unsynced = 0
+
+    def close(self):
+        """Releases the cached checkpoint directory descriptor."""
+        if self._dir_fd is not None:
+            os.close(self._dir_fd)
+            self._dir_fd = None
+
+    def __del__(self):
+        self.close()
+
+    def begin_batch(self, flush_every: Optional[int] = None):
+        """
+        Starts batching checkpoint writes.
 
-    def _get_upstream_spans(self, target_span: Span, trace: Trace) -> List[Span]:
-        """Helper to find all ancestors of a given span in a trace."""
-        upstream_map = {s.span_id: s for s in trace.spans}
-        ancestors = []
+        Until `commit_batch()` is called, checkpoints are appended to a single
+        `<trace_id>.ckptlog` file per trace instead of one file each, and are not
+        synced individually. Load them with `load_checkpoint(log_path, checkpoint_id)`.
+
+        Args:
+            flush_every: Optional number of checkpoints after which the batch is
+                         synced and indexed automatically, bounding how much
+                         unsynced data it holds.
+        """
+        if self._batch is not None:
+            raise RuntimeError("A checkpoint batch is already in progress.")
+        if flush_every is not None and flush_every < 1:
+            raise ValueError("flush_every must be a positive integer or None.")
+        self._batch = {}
+        self._flush_every = flush_every
+        self._unsynced = 0
+
+    def commit_batch(self):
+        """
+        Syncs every log written during the batch with a single fdatasync per log,
+        writes their `<trace_id>.idx` indexes atomically and ends the batch.
+        """
+        if self._batch is None:
+            raise RuntimeError("No checkpoint batch is in progress.")
+        try:
+            self._sync_batch()
+        finally:
+            for log in self._batch.values():
+                os.close(log.fd)
+            self._batch = None
+
+    def _get_upstream_spans(
+        self, target_span: Span, spans_by_id: Dict[str, Span]
+    ) -> List[Span]:
+        """Helper to find all ancestors of a given span, using an id -> span map."""
+        ancestors = deque()
         current_id = target_span.parent_span_id
-        while current_id and current_id in upstream_map:
-            parent_span = upstream_map[current_id]
-            ancestors.insert(0, parent_span)
+        while current_id and current_id in spans_by_id:
+            parent_span = spans_by_id[current_id]
+            ancestors.appendleft(parent_span)
             current_id = parent_span.parent_span_id
-        return ancestors
+        return list(ancestors)
 
     def create_checkpoint(self, agent: Any, trace: Trace, span_id: str) -> Checkpoint:
         """
         Creates a checkpoint for a given agent at a specific span within a trace.
         """
-        target_span = next((s for s in trace.spans if s.span_id == span_id), None)
+        spans_by_id = trace.spans_by_id()
+        target_span = spans_by_id.get(span_id)
         if not target_span:
             raise ValueError(f"Span ID '{span_id}' not found in the provided trace.")
 
@@ -138,25 +660,84 @@ class CheckpointManager:
             clearstone_version=self.sdk_version,
             agent_state=agent_state,
             current_span=target_span,
-            upstream_spans=self._get_upstream_spans(target_span, trace),
+            upstream_spans=self._get_upstream_spans(target_span, spans_by_id),
         )
 
         self._save_checkpoint(checkpoint)
         return checkpoint
 
+    def _sync_batch(self):
+        """Syncs and indexes all logs of the current batch, in file-name order."""
+        for trace_id in sorted(self._batch):
+            self._batch[trace_id].sync()
+        self._unsynced = 0
+
     def _save_checkpoint(self, checkpoint: Checkpoint):
-        """Serializes and saves a checkpoint to a file."""
+        """Serializes and saves a checkpoint to a file (or the batch log)."""
+        if self._batch is not None:
+            log = self._batch.get(checkpoint.trace_id)
+            if log is None:
+                log_path = self.checkpoint_dir / f"{checkpoint.trace_id}{_LOG_SUFFIX}"
+                log = self._batch[checkpoint.trace_id] = _CheckpointLog(log_path)
+            log.append(
+                checkpoint.checkpoint_id,
+                CheckpointSerializer.serialize_buffers(checkpoint, self.compression),
+            )
+            self._unsynced += 1
+            if self._flush_every is not None and self._unsynced >= self._flush_every:
+                self._sync_batch()
+            return
+
         filename = f"{checkpoint.trace_id}_{checkpoint.checkpoint_id}.ckpt"
-        filepath = self.checkpoint_dir / filename
+        buffers = CheckpointSerializer.serialize_buffers(checkpoint, self.compression)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY
+        if self._dir_fd is not None:
+            fd = os.open(filename, flags, 0o644, dir_fd=self._dir_fd)
+        else:
+            fd = os.open(self.checkpoint_dir / filename, flags, 0o644)
+        try:
+            _writev_all(fd, buffers)
+            _release_written_pages(fd)
+        finally:
+            os.close(fd)
 
-        serialized_data = CheckpointSerializer.serialize(checkpoint)
-        filepath.write_bytes(serialized_data)
+    def load_checkpoint(
+        self, path: str, checkpoint_id: Optional[str] = None, full: bool = True
+    ) -> Union[Checkpoint, CheckpointHeader]:
+        """
+        Loads and deserializes a checkpoint from a file.
 
-    def load_checkpoint(self, path: str) -> Checkpoint:
-        """Loads and deserializes a checkpoint from a file."""
+        Args:
+            path: A `.ckpt` checkpoint file, or a `.ckptlog` batch log.
+            checkpoint_id: Required for batch logs; the checkpoint to load from it.
+            full: If False, only a CheckpointHeader is read and the agent state
+                  is never unpickled.
+        """
         filepath = Path(path)
         if not filepath.exists():
             raise FileNotFoundError(f"Checkpoint file not found: {path}")
 
-        serialized_data = filepath.read_bytes()
-        return CheckpointSerializer.deserialize(serialized_data)
+        deserialize = (
+            CheckpointSerializer.deserialize
+            if full
+            else CheckpointSerializer.deserialize_header
+        )
+        if checkpoint_id is not None:
+            return self._load_from_log(filepath, checkpoint_id, deserialize)
+        return deserialize(_map_file(filepath))
+
+    def _load_from_log(
+        self,
+        log_path: Path,
+        checkpoint_id: str,
+        deserialize: Callable[[memoryview], Any] = CheckpointSerializer.deserialize,
+    ):
+        """Loads one committed checkpoint out of a batch log via its index."""
+        index_path = log_path.with_suffix(_INDEX_SUFFIX)
+        entries = json_loads(index_path.read_bytes()) if index_path.exists() else {}
+        if checkpoint_id not in entries:
+            raise ValueError(
+                f"Checkpoint '{checkpoint_id}' is not committed in {log_path}."
+            )
+        offset, length = entries[checkpoint_id]
+        return deserialize(memoryview(_map_file(log_path))[offset : offset + length])
@@ -1,8 +1,39 @@
-import pdb
-from typing import Any, Dict, List
+import functools
+from collections.abc import Sequence
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, List
 from unittest.mock import patch
 
-from .checkpoint import Checkpoint
+from clearstone.observability.models import Span
+from clearstone.utils.serialization import json_loads
+
+from .checkpoint import (
+    Checkpoint,
+    CheckpointHeader,
+    CheckpointSerializer,
+    _map_file,
+)
+
+# Orders spans by start time; attrgetter avoids a Python frame per comparison key.
+_SORT_KEY = attrgetter("start_time_ns")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_serializer():
+    """Returns the serializer shared by all replay engines, importing it on first use."""
+    from clearstone.serialization.hybrid import HybridSerializer
+
+    return HybridSerializer()
+
+
+def _deserialize_span_output(span: Span) -> Any:
+    """Decodes a span's recorded output, or returns an error placeholder."""
+    try:
+        return _get_serializer().deserialize(span.output_snapshot["data"])
+    except Exception:
+        # If deserialization fails, use an error placeholder
+        return RuntimeError("Failed to deserialize recorded output")
 
 
 class DeterministicExecutionContext:
@@ -52,6 +83,27 @@ class DeterministicExecutionContext:
             p.stop()
 
 
+class _RecordedResponses(Sequence):
+    """
+    The recorded outputs of a list of spans, decoded on first access.
+
+    Used as a mock's side effect, so a replay that fails early never pays to
+    deserialize outputs it does not reach.
+    """
+
+    def __init__(self, spans: List[Span], decode: Callable[[Span], Any]):
+        self._spans = spans
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(span) for span in self._spans[index]]
+        return self._decode(self._spans[index])
+
+
 class ReplayEngine:
     """
     Loads a checkpoint and rehydrates an agent to allow for interactive,
@@ -62,6 +114,49 @@ class ReplayEngine:
         self.checkpoint = checkpoint
         self.trace_store = trace_store
         self.agent = self._rehydrate_agent()
+        # Decoded span outputs by span_id, reused across debugging sessions.
+        # Kept per engine: outputs may be mutable, so engines must not share them.
+        self._decoded_outputs: Dict[str, Any] = {}
+
+    @staticmethod
+    def list_checkpoints(checkpoint_dir: str) -> List[CheckpointHeader]:
+        """
+        Lists the checkpoints saved in a directory, oldest first.
+
+        Only checkpoint headers are read, so listing never unpickles agent state.
+        Committed checkpoints in batch logs are included.
+
+        Args:
+            checkpoint_dir: The directory a CheckpointManager wrote to.
+        """
+        directory = Path(checkpoint_dir)
+        headers = [
+            CheckpointSerializer.deserialize_header(_map_file(path))
+            for path in directory.glob("*.ckpt")
+        ]
+        for index_path in directory.glob("*.idx"):
+            log_path = index_path.with_suffix(".ckptlog")
+            if not log_path.exists():
+                continue
+            view = memoryview(_map_file(log_path))
+            for offset, length in json_loads(index_path.read_bytes()).values():
+                headers.append(
+                    CheckpointSerializer.deserialize_header(
+                        view[offset : offset + length]
+                    )
+                )
+        headers.sort(key=attrgetter("timestamp_ns"))
+        return headers
+
+    def _decode_output(self, span: Span) -> Any:
+        """Deserializes a span's recorded output, at most once per span."""
+        try:
+            return self._decoded_outputs[span.span_id]
+        except KeyError:
+            output = self._decoded_outputs[span.span_id] = _deserialize_span_output(
+                span
+            )
+            return output
 
     def _rehydrate_agent(self) -> Any:
         """
@@ -125,48 +220,34 @@ class ReplayEngine:
         mock_targets = {}
         # Load ALL spans from the trace to find recorded outputs
         # This includes child spans that happen during replay
+        full_trace = None
         if self.trace_store:
             full_trace = self.trace_store.get_trace(self.checkpoint.trace_id)
-            all_spans_in_trace = full_trace.spans
         else:
             # Fallback to checkpoint spans if no trace_store provided
-            all_spans_in_trace = self.checkpoint.upstream_spans + [
-                self.checkpoint.current_span
-            ]
-
-        from clearstone.serialization.hybrid import HybridSerializer
-
-        serializer = HybridSerializer()
+            checkpoint_spans = sorted(
+                self.checkpoint.upstream_spans + [self.checkpoint.current_span],
+                key=_SORT_KEY,
+            )
 
         print("\n--- Pre-flight Mock Analysis ---")
         for span_type, target_path in mock_config.items():
-            responses = []
-            for span in sorted(all_spans_in_trace, key=lambda s: s.start_time_ns):
-                # Match spans based on name prefix or custom span_type attribute
-                # This allows flexible matching: "llm", "tool", "database", etc.
-                span_type_attr = span.attributes.get("span_type", "")
-                matches = (
-                    span.name.startswith(span_type)
-                    or span_type_attr == span_type
-                    or span.kind.value.lower() == span_type.lower()
-                )
-
-                if (
-                    matches
-                    and span.output_snapshot
-                    and span.output_snapshot.get("captured")
-                ):
-                    try:
-                        deserialized_output = serializer.deserialize(
-                            span.output_snapshot["data"]
-                        )
-                        responses.append(deserialized_output)
-                    except Exception:
-                        # If deserialization fails, append an error placeholder
-                        responses.append(
-                            RuntimeError("Failed to deserialize recorded output")
-                        )
+            # Match spans based on name prefix or custom span_type attribute
+            # This allows flexible matching: "llm", "tool", "database", etc.
+            if full_trace is not None:
+                candidates = full_trace.spans_by_type(span_type)
+            else:
+                candidates = [s for s in checkpoint_spans if s.matches_type(span_type)]
+            # Only spans with a captured output can provide mock responses.
+            # Outputs are decoded lazily, at most once per span, when a mock
+            # actually returns them.
+            matching_spans = [
+                span
+                for span in candidates
+                if span.output_snapshot and span.output_snapshot.get("captured")
+            ]
 
+            responses = _RecordedResponses(matching_spans, self._decode_output)
             mock_targets[target_path] = responses
 
             # Provide clear debugging information to the user
@@ -187,6 +268,8 @@ class ReplayEngine:
         replay_method = getattr(self.agent, function_to_replay)
 
         # Set a breakpoint right before the replay starts
+        import pdb
+
         pdb.set_trace()
 
         try:
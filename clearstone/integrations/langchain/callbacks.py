@@ -61,12 +61,12 @@ class PolicyCallbackHandler(BaseCallbackHandler):
 
     def _handle_decision(self, decision: Decision, decision_point: str):
         """Raises exceptions for terminal decisions like BLOCK and PAUSE."""
-        if decision.action == ActionType.BLOCK:
+        if decision.action is ActionType.BLOCK:
             raise PolicyViolationError(
                 f"Policy blocked execution at {decision_point}: {decision.reason}",
                 decision,
             )
-        if decision.action == ActionType.PAUSE:
+        if decision.action is ActionType.PAUSE:
             raise PolicyPauseError(
                 f"Policy paused execution at {decision_point}: {decision.reason}",
                 decision,
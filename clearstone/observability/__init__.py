@@ -18,9 +18,15 @@ from clearstone.observability.tracer import (
 
 def __getattr__(name):
     """Lazy import of provider to avoid circular dependency."""
-    if name in ("TracerProvider", "get_tracer_provider", "reset_tracer_provider"):
+    if name in (
+        "TracerProvider",
+        "get_tracer_provider",
+        "get_tracer_fast",
+        "reset_tracer_provider",
+    ):
         from clearstone.observability.provider import (  # noqa: F401
             TracerProvider,
+            get_tracer_fast,
             get_tracer_provider,
             reset_tracer_provider,
         )
@@ -43,5 +49,6 @@ __all__ = [
     "reset_tracer_registry",
     "TracerProvider",
     "get_tracer_provider",
+    "get_tracer_fast",
     "reset_tracer_provider",
 ]
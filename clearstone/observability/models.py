@@ -1,11 +1,39 @@
 # clearstone/observability/models.py
 
-import uuid
-from datetime import datetime, timezone
+import os
+import time
+import traceback
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    computed_field,
+    model_validator,
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def new_id() -> str:
+    """
+    Returns 32 random hex characters for a trace or span ID.
+
+    Reads 16 bytes from the OS directly, which costs a fraction of building
+    a `uuid.UUID` just to take its hex form.
+    """
+    return os.urandom(16).hex()
+
+
+# Orders spans by start time; attrgetter avoids a Python frame per comparison key.
+_SORT_KEY = attrgetter("start_time_ns")
 
 # --- OTel-Aligned Enumerations ---
 
@@ -31,13 +59,44 @@ class SpanStatus(str, Enum):
 # --- Core Data Models ---
 
 
+def _datetime_to_ns(value: datetime) -> int:
+    """Converts a datetime (naive values are taken as UTC) to Unix nanoseconds."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
 class SpanEvent(BaseModel):
-    """Represents a point-in-time event within a span's lifecycle."""
+    """
+    Represents a point-in-time event within a span's lifecycle.
+
+    The time is stored as Unix nanoseconds, like `Span.start_time_ns`; the
+    `timestamp` datetime is derived from it on access. Events can still be
+    created from a `timestamp` datetime or ISO-8601 string.
+    """
 
     name: str
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp_ns: int = Field(default_factory=time.time_ns)
     attributes: Dict[str, Any] = Field(default_factory=dict)
 
+    @model_validator(mode="before")
+    @classmethod
+    def _timestamp_to_ns(cls, data: Any) -> Any:
+        """Accepts a `timestamp` datetime or ISO string in place of `timestamp_ns`."""
+        if isinstance(data, dict) and "timestamp_ns" not in data:
+            timestamp = data.get("timestamp")
+            if timestamp is not None:
+                if isinstance(timestamp, str):
+                    timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+                data = {**data, "timestamp_ns": _datetime_to_ns(timestamp)}
+        return data
+
+    @computed_field
+    @property
+    def timestamp(self) -> datetime:
+        """The event time as a timezone-aware UTC datetime."""
+        return _EPOCH + timedelta(microseconds=self.timestamp_ns // 1000)
+
 
 class SpanLink(BaseModel):
     """Represents a causal link to another span, possibly in a different trace."""
@@ -55,7 +114,7 @@ class Span(BaseModel):
 
     # === Identity & Hierarchy ===
     trace_id: str
-    span_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    span_id: str = Field(default_factory=new_id)
     parent_span_id: Optional[str] = None
 
     # === Execution Context ===
@@ -98,6 +157,33 @@ class Span(BaseModel):
             return None
         return self.end_time_ns - self.start_time_ns
 
+    def record_exception(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Marks the span as failed with the given exception.
+
+        The traceback is formatted right away rather than kept, so the span
+        holds no frames (or their locals) alive and stays plain data that can
+        be copied, pickled and compared.
+        """
+        self.status = SpanStatus.ERROR
+        self.error_message = str(exc_val)
+        self.error_stacktrace = "".join(
+            traceback.format_exception(exc_type, exc_val, exc_tb)
+        )
+
+    def matches_type(self, span_type: str) -> bool:
+        """
+        Checks whether the span is of a replay span type such as "llm" or "tool".
+
+        A span matches if its name starts with the type, its `span_type`
+        attribute equals it, or its kind equals it (case-insensitively).
+        """
+        return (
+            self.name.startswith(span_type)
+            or self.attributes.get("span_type", "") == span_type
+            or self.kind.value.lower() == span_type.lower()
+        )
+
 
 class Trace(BaseModel):
     """A collection of spans for a complete agent execution."""
@@ -113,3 +199,79 @@ class Trace(BaseModel):
     start_time_ns: int
     end_time_ns: Optional[int] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
+
+    # Lookup caches, built on first use. Appending spans or assigning
+    # `spans` invalidates them. Spans are not modified in place once a trace
+    # has been queried; after replacing or editing spans in the list, assign
+    # it again (`trace.spans = trace.spans`) to rebuild the caches.
+    _cached_span_count: int = PrivateAttr(default=-1)
+    _by_id: Dict[str, Span] = PrivateAttr(default_factory=dict)
+    _by_type: Dict[str, Tuple[Span, ...]] = PrivateAttr(default_factory=dict)
+    _tool_calls: Optional[Counter] = PrivateAttr(default=None)
+    _error_spans: Optional[Tuple[Span, ...]] = PrivateAttr(default=None)
+    _span_names: Optional[Tuple[str, ...]] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name == "spans":
+            self._cached_span_count = -1
+
+    def _check_caches(self):
+        """Drops the lookup caches if spans were added since they were built."""
+        if self._cached_span_count != len(self.spans):
+            self._cached_span_count = len(self.spans)
+            self._by_id = {}
+            self._by_type = {}
+            self._tool_calls = None
+            self._error_spans = None
+            self._span_names = None
+
+    def spans_by_id(self) -> Mapping[str, Span]:
+        """Returns a read-only view of the cached map from span ID to span."""
+        self._check_caches()
+        if not self._by_id and self.spans:
+            self._by_id = {span.span_id: span for span in self.spans}
+        return MappingProxyType(self._by_id)
+
+    def spans_by_type(self, span_type: str) -> Tuple[Span, ...]:
+        """
+        Returns the spans matching a span type (see `Span.matches_type`),
+        ordered by start time. The result is cached per span type.
+        """
+        self._check_caches()
+        spans = self._by_type.get(span_type)
+        if spans is None:
+            spans = self._by_type[span_type] = tuple(
+                sorted(
+                    (span for span in self.spans if span.matches_type(span_type)),
+                    key=_SORT_KEY,
+                )
+            )
+        return spans
+
+    def tool_call_counts(self) -> Counter:
+        """Returns a copy of the cached count of spans per `tool.name` attribute."""
+        self._check_caches()
+        if self._tool_calls is None:
+            self._tool_calls = Counter(
+                span.attributes["tool.name"]
+                for span in self.spans
+                if "tool.name" in span.attributes
+            )
+        return self._tool_calls.copy()
+
+    def error_spans(self) -> Tuple[Span, ...]:
+        """Returns the cached spans with ERROR status, in trace order."""
+        self._check_caches()
+        if self._error_spans is None:
+            self._error_spans = tuple(
+                span for span in self.spans if span.status == SpanStatus.ERROR
+            )
+        return self._error_spans
+
+    def span_names(self) -> Tuple[str, ...]:
+        """Returns the cached names of the spans, in trace order."""
+        self._check_caches()
+        if self._span_names is None:
+            self._span_names = tuple(span.name for span in self.spans)
+        return self._span_names
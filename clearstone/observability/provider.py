@@ -1,8 +1,9 @@
 # clearstone/observability/provider.py
 
 import atexit
+import functools
 from threading import Lock
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 # Import the concrete implementations for instantiation
 from ..storage.sqlite import SpanBuffer, TraceStore
@@ -19,12 +20,16 @@ class TracerProvider:
     including the storage backend, buffer, and individual tracers.
     """
 
-    def __init__(self, db_path: str = "clearstone_traces.db"):
+    def __init__(
+        self,
+        db_path: str = "clearstone_traces.db",
+        pragmas: Optional[Dict[str, Any]] = None,
+    ):
         self._tracers: Dict[str, Tracer] = {}
         self._lock = Lock()
 
         # Instantiation uses the concrete classes
-        self.trace_store: BaseTraceStore = TraceStore(db_path=db_path)
+        self.trace_store: BaseTraceStore = TraceStore(db_path=db_path, pragmas=pragmas)
         self.span_buffer: BaseSpanBuffer = SpanBuffer(writer=self.trace_store)
 
         atexit.register(self.shutdown)
@@ -38,6 +43,10 @@ class TracerProvider:
         Gets or creates a Tracer instance. All tracers created by this provider
         will share the same underlying storage and buffer.
         """
+        # Lock-free read for the common case; the lock only guards creation.
+        tracer = self._tracers.get(name)
+        if tracer is not None:
+            return tracer
         with self._lock:
             if name not in self._tracers:
                 tracer = Tracer(
@@ -56,6 +65,7 @@ class TracerProvider:
         """
         print("Shutting down Clearstone TracerProvider, flushing spans...")
         self.span_buffer.shutdown()
+        self.trace_store.close()
         print("Clearstone shutdown complete.")
 
 
@@ -69,15 +79,33 @@ def get_tracer_provider(db_path: str = "clearstone_traces.db") -> TracerProvider
     This is the primary entry point for initializing the Clearstone tracing system.
     """
     global _global_provider
+    # Double-checked: once the provider exists, reading the global is atomic
+    # and needs no lock.
+    provider = _global_provider
+    if provider is not None:
+        return provider
     with _provider_lock:
         if _global_provider is None:
             _global_provider = TracerProvider(db_path=db_path)
         return _global_provider
 
 
+@functools.lru_cache(maxsize=None)
+def get_tracer_fast(name: str, version: str = "0.1.0") -> Tracer:
+    """
+    Gets a tracer from the global provider, memoized per (name, version).
+
+    Meant for instrumentation that looks up its tracer on every call: after
+    the first lookup this is a single C-level cache hit, with no provider
+    lookup or dict probe. The cache is cleared by `reset_tracer_provider()`.
+    """
+    return get_tracer_provider().get_tracer(name, version)
+
+
 def reset_tracer_provider():
     """Resets the global provider. Used for testing."""
     global _global_provider
+    get_tracer_fast.cache_clear()
     with _provider_lock:
         if _global_provider is not None:
             _global_provider.shutdown()
@@ -1,68 +1,159 @@
 # clearstone/observability/tracer.py
 
+import sys
 import threading
 import time
-import traceback
-import uuid
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import weakref
+from contextvars import ContextVar
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from .models import Span, SpanKind, SpanStatus
+from .models import Span, SpanKind, SpanStatus, new_id
 
 if TYPE_CHECKING:
     from ..storage.sqlite import SpanBuffer
 
-# Thread-local storage is used to maintain a stack of active spans for each thread.
-# This allows for automatic parent-child linking in nested spans.
-_thread_local = threading.local()
+# Bound once, so the per-span calls skip the module attribute lookups.
+_time_ns = time.time_ns
+
+# The IDs of the active spans, innermost last. A context variable keeps a
+# separate stack per thread and per asyncio task, which allows for automatic
+# parent-child linking in nested spans. The stack is an immutable tuple, so
+# entering a span never mutates a stack another context can see.
+_span_stack: ContextVar[Tuple[str, ...]] = ContextVar(
+    "clearstone_span_stack", default=()
+)
+
+# Finished SpanContextManager shells, reused by Tracer.span() so the steady
+# state allocates no context manager per span. list.append and list.pop are
+# atomic, so the free list is shared by all threads without a lock.
+_free_managers: List["SpanContextManager"] = []
+_FREE_MANAGERS_MAX = 256
+
+
+def _sole_reference_count() -> int:
+    """Returns what sys.getrefcount reports for an object only a local holds."""
+    probe = [object()]
+    item = probe.pop()
+    return sys.getrefcount(item)
+
+
+# A shell popped from the free list is reused only if nothing else still
+# refers to it, so code that kept a finished manager never sees another span
+# through it. Without sys.getrefcount (e.g. on PyPy) shells are not reused.
+_getrefcount = getattr(sys, "getrefcount", None)
+if _getrefcount is None:
+    _FREE_MANAGERS_MAX = 0
+else:
+    _SOLE_REFCOUNT = _sole_reference_count()
+
+# In integrated mode, finished spans are collected per thread and handed to
+# the shared buffer in batches of up to this many, or when the outermost span
+# opened in the thread (or the root span of a task) exits. Flushing or shutting
+# down the buffer also drains the batches of all threads.
+_SPAN_BATCH_SIZE = 64
+
+# Merges the per-thread shards of a legacy-mode tracer back into end order.
+_END_TIME_KEY = attrgetter("end_time_ns")
+
+
+class _SpanBatch:
+    """
+    The finished spans of one thread that have not been handed to the buffer
+    yet, and the number of spans currently open in that thread.
+    """
+
+    __slots__ = ("spans", "open_spans", "__weakref__")
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self.open_spans = 0
 
 
 class SpanContextManager:
-    """A context manager to handle the lifecycle of a single Span."""
+    """
+    A context manager to handle the lifecycle of a single Span.
 
-    def __init__(self, tracer: "Tracer", name: str, kind: SpanKind = SpanKind.INTERNAL):
-        self.tracer = tracer
+    The span is created when the 'with' block is entered, so its parent is the
+    span that is active at that point. Once the block exits, the manager is
+    released: its fields are cleared, entering it again raises RuntimeError,
+    and it is recycled for a later span once nothing else refers to it.
+    """
+
+    __slots__ = ("tracer", "name", "kind", "attributes", "span", "_token")
 
-        # Determine parent_id from the current thread's span stack
-        parent_id = None
-        if hasattr(_thread_local, "span_stack") and _thread_local.span_stack:
-            parent_id = _thread_local.span_stack[-1].span_id
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.reset(tracer, name, kind, attributes)
 
+    def reset(
+        self,
+        tracer: "Tracer",
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        """Re-initializes the manager in place for a new span."""
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> Span:
+        """Called when entering the 'with' block."""
+        tracer = self.tracer
+        if tracer is None or self.span is not None:
+            raise RuntimeError(
+                "A span context manager can only be entered once; "
+                "call tracer.span() again for a new span."
+            )
+        stack = _span_stack.get()
         self.span = Span(
             trace_id=tracer.trace_id,
-            parent_span_id=parent_id,
-            name=name,
-            kind=kind,
-            start_time_ns=time.time_ns(),
+            parent_span_id=stack[-1] if stack else None,
+            name=self.name,
+            kind=self.kind,
+            start_time_ns=_time_ns(),
             instrumentation_name=tracer.instrumentation_name,
             instrumentation_version=tracer.instrumentation_version,
         )
-
-    def __enter__(self) -> Span:
-        """Called when entering the 'with' block."""
-        if not hasattr(_thread_local, "span_stack"):
-            _thread_local.span_stack = []
-
-        _thread_local.span_stack.append(self.span)
+        if tracer._buffer is not None:
+            tracer._thread_batch().open_spans += 1
+        # Most spans have no initial attributes; only those that do pay for
+        # copying them (and the span's own dict is never validated).
+        if self.attributes:
+            self.span.attributes.update(self.attributes)
+        self._token = _span_stack.set(stack + (self.span.span_id,))
         return self.span
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Called when exiting the 'with' block."""
-        self.span.end_time_ns = time.time_ns()
+        self.span.end_time_ns = _time_ns()
 
         if exc_type is not None:
-            self.span.status = SpanStatus.ERROR
-            self.span.error_message = str(exc_val)
-            self.span.error_stacktrace = traceback.format_exc()
+            self.span.record_exception(exc_type, exc_val, exc_tb)
         else:
             self.span.status = SpanStatus.OK
 
         # Pop this span from the stack
-        if hasattr(_thread_local, "span_stack") and _thread_local.span_stack:
-            _thread_local.span_stack.pop()
+        _span_stack.reset(self._token)
 
         # Pass the completed span to the tracer's buffer
         self.tracer._buffer_span(self.span)
 
+        # Drop the references and hand the shell back for reuse
+        self.tracer = self.name = self.kind = None
+        self.attributes = self.span = self._token = None
+        if len(_free_managers) < _FREE_MANAGERS_MAX:
+            _free_managers.append(self)
+
         # Return False to re-raise any exceptions
         return False
 
@@ -84,15 +175,26 @@ class Tracer:
         self.name = name
         self.instrumentation_name = instrumentation_name
         self.instrumentation_version = instrumentation_version
-        self.trace_id = trace_id or uuid.uuid4().hex
+        self.trace_id = trace_id or new_id()
 
         self._buffer = buffer
+        self._local = threading.local()
         if buffer is None:
-            self._span_buffer: List[Span] = []
+            # Legacy mode: each thread appends to its own shard, registered
+            # once under the lock, so buffering a span takes no lock.
+            self._shards: Optional[List[List[Span]]] = []
             self._buffer_lock = threading.Lock()
+            self._batches = None
         else:
-            self._span_buffer = None
-            self._buffer_lock = None
+            self._shards = None
+            # Integrated mode: the per-thread batches are also registered
+            # here (weakly, so they go away with their thread), so the buffer
+            # can drain spans a thread is still holding when it is flushed.
+            self._batches: Optional["weakref.WeakSet[_SpanBatch]"] = weakref.WeakSet()
+            self._buffer_lock = threading.Lock()
+            add_flush_hook = getattr(buffer, "add_flush_hook", None)
+            if add_flush_hook is not None:
+                add_flush_hook(self._flush_batches)
 
     def span(
         self,
@@ -111,32 +213,88 @@ class Tracer:
         Returns:
             A SpanContextManager to be used in a 'with' statement.
         """
-        context_manager = SpanContextManager(self, name, kind)
-        if attributes:
-            context_manager.span.attributes.update(attributes)
-
+        try:
+            context_manager = _free_managers.pop()
+        except IndexError:
+            return SpanContextManager(self, name, kind, attributes)
+        if _getrefcount(context_manager) > _SOLE_REFCOUNT:
+            # Still held by its previous user; leave it released.
+            return SpanContextManager(self, name, kind, attributes)
+        context_manager.reset(self, name, kind, attributes)
         return context_manager
 
+    def _thread_batch(self) -> _SpanBatch:
+        """Returns the calling thread's span batch, registering it on first use."""
+        try:
+            return self._local.batch
+        except AttributeError:
+            batch = self._local.batch = _SpanBatch()
+            with self._buffer_lock:
+                self._batches.add(batch)
+            return batch
+
     def _buffer_span(self, span: Span):
         """Adds a completed span to the buffer (internal or external)."""
         if self._buffer is not None:
-            self._buffer.add_span(span)
+            batch = self._thread_batch()
+            batch.spans.append(span)
+            batch.open_spans -= 1
+            if (
+                len(batch.spans) >= _SPAN_BATCH_SIZE
+                or not batch.open_spans
+                or not _span_stack.get()
+            ):
+                # Only the owning thread appends, so swapping the list under
+                # the lock hands over exactly the spans collected so far.
+                with self._buffer_lock:
+                    spans = batch.spans
+                    batch.spans = []
+                self._buffer.add_spans(spans)
         else:
-            with self._buffer_lock:
-                self._span_buffer.append(span)
+            try:
+                shard = self._local.shard
+            except AttributeError:
+                shard = self._local.shard = []
+                with self._buffer_lock:
+                    self._shards.append(shard)
+            shard.append(span)
+
+    def _flush_batches(self):
+        """
+        Hands the spans held in every thread's batch to the buffer. Called by
+        the buffer when it is flushed or shut down, from any thread.
+        """
+        with self._buffer_lock:
+            spans = []
+            for batch in list(self._batches):
+                # Copy, then delete the copied prefix: the owning thread may
+                # append to this list concurrently without taking the lock.
+                taken = batch.spans[:]
+                del batch.spans[: len(taken)]
+                spans += taken
+        self._buffer.add_spans(spans)
 
     def get_buffered_spans(self) -> List[Span]:
-        """Returns a copy of the current in-memory span buffer (legacy mode only)."""
-        if self._span_buffer is not None:
-            with self._buffer_lock:
-                return self._span_buffer.copy()
-        return []
+        """
+        Returns a copy of the current in-memory span buffer (legacy mode only),
+        in the order the spans ended.
+        """
+        if self._shards is None:
+            return []
+        with self._buffer_lock:
+            shards = [shard.copy() for shard in self._shards]
+        if len(shards) == 1:
+            return shards[0]
+        spans = [span for shard in shards for span in shard]
+        spans.sort(key=_END_TIME_KEY)
+        return spans
 
     def clear_buffer(self):
         """Clears the in-memory buffer (legacy mode only)."""
-        if self._span_buffer is not None:
+        if self._shards is not None:
             with self._buffer_lock:
-                self._span_buffer.clear()
+                for shard in self._shards:
+                    shard.clear()
 
 
 # --- Global Tracer Registry (Legacy Mode for Testing) ---
@@ -156,6 +314,9 @@ def get_tracer(name: str) -> Tracer:
     Returns:
         A thread-safe Tracer instance with internal buffering.
     """
+    tracer = _tracer_registry.get(name)
+    if tracer is not None:
+        return tracer
     with _registry_lock:
         if name not in _tracer_registry:
             _tracer_registry[name] = Tracer(name)
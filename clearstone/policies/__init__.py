@@ -2,6 +2,8 @@
 Clearstone Policy Library - Pre-built policies for common governance scenarios.
 """
 
+from clearstone.policies._compile import compile_policies
+from clearstone.policies.batch import evaluate_batch
 from clearstone.policies.common import (
     admin_only_action_policy,
     alert_on_failed_auth_policy,
@@ -46,4 +48,6 @@ __all__ = [
     "create_cost_control_policies",
     "create_security_policies",
     "create_data_protection_policies",
+    "compile_policies",
+    "evaluate_batch",
 ]
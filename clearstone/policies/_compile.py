@@ -0,0 +1,310 @@
+# clearstone/policies/_compile.py
+
+"""
+Fuses a fixed set of policies into a single generated policy function.
+
+The built-in policies of `clearstone.policies.common` are inlined as source
+templates, so evaluating the fused policy makes no Python call per policy and
+reads shared metadata keys (`tool_name`, `user_role`) once. Any other policy is
+called as-is. Decisions are combined exactly like PolicyEngine does: policies
+run in priority order, the first BLOCK is returned immediately, and otherwise
+the first decision that is neither ALLOW nor SKIP wins.
+"""
+
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Callable, Dict, List, Tuple, Union
+
+from clearstone.core.actions import (
+    ALERT,
+    ALLOW,
+    BLOCK,
+    PAUSE,
+    REDACT,
+    ActionType,
+    Decision,
+)
+from clearstone.core.policy import PolicyInfo
+
+_COMMON_MODULE = "clearstone.policies.common"
+
+# Shared locals computed once at the top of the fused function.
+_SHARED = {
+    "tool_name": 'tool_name = get("tool_name", "")',
+    "user_role": 'user_role = get("user_role", "guest")',
+}
+
+# Inline templates for the built-in policies, keyed by function name. Each one
+# returns BLOCK decisions directly and assigns `decision` for any other
+# non-ALLOW outcome, mirroring the original function body line by line.
+_TEMPLATES: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "token_limit_policy": (
+        (),
+        """
+limit = get("token_limit")
+tokens = get("tokens_used", 0)
+if limit is not None and tokens > limit:
+    return BLOCK(f"Token limit exceeded: {tokens} > {limit}")
+""",
+    ),
+    "session_cost_limit_policy": (
+        (),
+        """
+limit = get("session_cost_limit")
+cost = get("session_cost", 0.0)
+if limit is not None and cost > limit:
+    decision = ALERT
+""",
+    ),
+    "daily_cost_limit_policy": (
+        (),
+        """
+limit = get("daily_cost_limit")
+cost = get("daily_cost", 0.0)
+if limit is not None and cost > limit:
+    return BLOCK(f"Daily cost limit exceeded: ${cost:.2f} > ${limit:.2f}")
+""",
+    ),
+    "rbac_tool_access_policy": (
+        ("tool_name", "user_role"),
+        """
+if tool_name in get("restricted_tools", _NO_CONFIG).get(user_role, ()):
+    return BLOCK(f"Role '{user_role}' cannot access tool '{tool_name}'")
+""",
+    ),
+    "admin_only_action_policy": (
+        ("tool_name", "user_role"),
+        """
+if tool_name in get("require_admin_for", ()) and user_role != "admin":
+    return BLOCK(
+        f"Admin role required for '{tool_name}'. Current role: '{user_role}'"
+    )
+""",
+    ),
+    "redact_pii_policy": (
+        ("tool_name",),
+        """
+fields = get("pii_fields", _NO_CONFIG).get(tool_name, _MISSING)
+if fields is not _MISSING:
+    decision = REDACT(reason=f"PII redaction for tool '{tool_name}'", fields=fields)
+""",
+    ),
+    "block_pii_tools_policy": (
+        ("tool_name", "user_role"),
+        """
+if tool_name in get("pii_tools", ()) and user_role not in _PII_ROLES:
+    return BLOCK(f"PII access denied for role '{user_role}'")
+""",
+    ),
+    "alert_on_privileged_access_policy": (
+        ("tool_name",),
+        """
+if tool_name in get("privileged_tools", ()):
+    decision = Decision(
+        ActionType.ALERT,
+        reason=f"Privileged access: User '{context.user_id}' accessed '{tool_name}'.",
+    )
+""",
+    ),
+    "alert_on_failed_auth_policy": (
+        (),
+        """
+if get("auth_failed"):
+    attempts = get("attempt_count", 1)
+    if attempts > 3:
+        decision = Decision(
+            ActionType.ALERT,
+            reason=f"Security: {attempts} failed auth attempts for user '{context.user_id}'.",
+        )
+""",
+    ),
+    "rate_limit_policy": (
+        (),
+        """
+limit = get("rate_limit")
+count = get("rate_count", 0)
+if limit is not None and count > limit:
+    return BLOCK(f"Rate limit exceeded: {count} > {limit}")
+""",
+    ),
+    "block_external_apis_policy": (
+        ("tool_name",),
+        """
+if tool_name in get("external_api_tools", ()) and tool_name not in get(
+    "whitelisted_apis", ()
+):
+    return BLOCK(f"External API call blocked: '{tool_name}' is not whitelisted")
+""",
+    ),
+    "require_approval_for_high_cost_policy": (
+        (),
+        """
+cost = get("operation_cost", 0.0)
+threshold = get("high_cost_threshold", 10.0)
+if cost > threshold:
+    decision = PAUSE(
+        f"High cost operation requires approval: ${cost:.2f} > ${threshold:.2f}"
+    )
+""",
+    ),
+}
+
+# The metadata key each built-in policy needs before it can return anything
+# but ALLOW. The fused function skips a policy whose key is absent, and returns
+# ALLOW at once when none of its policies' keys are present. Policies that can
+# fire on defaults alone (e.g. a negative `high_cost_threshold`) have no gate.
+_GATES: Dict[str, str] = {
+    "token_limit_policy": "token_limit",
+    "session_cost_limit_policy": "session_cost_limit",
+    "daily_cost_limit_policy": "daily_cost_limit",
+    "rbac_tool_access_policy": "restricted_tools",
+    "admin_only_action_policy": "require_admin_for",
+    "redact_pii_policy": "pii_fields",
+    "block_pii_tools_policy": "pii_tools",
+    "alert_on_privileged_access_policy": "privileged_tools",
+    "alert_on_failed_auth_policy": "auth_failed",
+    "rate_limit_policy": "rate_limit",
+    "block_external_apis_policy": "external_api_tools",
+}
+
+# Folds a called policy's decision into the result, as PolicyEngine does.
+_FOLD = """
+action = decision.action
+if action is _BLOCK:
+    return decision
+if final_decision is ALLOW and action is not _ALLOW and action is not _SKIP:
+    final_decision = decision
+"""
+
+
+def _template_for(func: Callable):
+    """Returns the inline template of a built-in policy, or None."""
+    if getattr(func, "__module__", None) != _COMMON_MODULE:
+        return None
+    return _TEMPLATES.get(getattr(func, "__name__", None))
+
+
+def _indent(source: str, spaces: int) -> List[str]:
+    """Indents the non-empty lines of a source snippet."""
+    pad = " " * spaces
+    return [pad + line for line in source.strip("\n").splitlines()]
+
+
+def compile_policies(
+    policies: List[Union[Callable, PolicyInfo]], name: str = "fused_policies"
+) -> Callable:
+    """
+    Compiles a list of policies into one policy function.
+
+    Built-in policies are inlined; other policies are called from the fused
+    function. The result can be passed to PolicyEngine like any policy. It is
+    recorded in metrics and the audit trail under `name`, with the highest
+    priority of its members. Policies are expected not to modify
+    `context.metadata`, since shared keys are read once per evaluation.
+
+    A built-in policy is skipped when the metadata key it is configured by
+    (e.g. `token_limit`) is absent. When every member is gated that way and
+    none of their keys is present, the fused function returns ALLOW after a
+    single set check.
+
+    Args:
+        policies: Policy functions (decorated or not) or PolicyInfo entries.
+        name: The policy name of the fused function.
+
+    Returns:
+        A policy function `fused(context) -> Decision`.
+    """
+    if not policies:
+        raise ValueError("compile_policies requires at least one policy.")
+
+    infos = []
+    for policy in policies:
+        if isinstance(policy, PolicyInfo):
+            infos.append(policy)
+        elif hasattr(policy, "_policy_info"):
+            infos.append(policy._policy_info)
+        else:
+            infos.append(
+                PolicyInfo(
+                    name=getattr(policy, "__name__", "anonymous_policy"),
+                    priority=0,
+                    func=policy,
+                )
+            )
+    infos.sort(key=attrgetter("priority"), reverse=True)
+
+    namespace = {
+        "ALLOW": ALLOW,
+        "ALERT": ALERT,
+        "BLOCK": BLOCK,
+        "PAUSE": PAUSE,
+        "REDACT": REDACT,
+        "ActionType": ActionType,
+        "Decision": Decision,
+        "_BLOCK": ActionType.BLOCK,
+        "_ALLOW": ActionType.ALLOW,
+        "_SKIP": ActionType.SKIP,
+        "_NO_CONFIG": MappingProxyType({}),
+        "_MISSING": object(),
+        "_PII_ROLES": frozenset(("admin", "data_engineer")),
+    }
+    shared = []
+    body = []
+    gates = set()
+    ungated = False
+    for i, info in enumerate(infos):
+        template = _template_for(info.func)
+        gate = _GATES.get(info.func.__name__) if template is not None else None
+        if gate is None:
+            ungated = True
+        else:
+            gates.add(gate)
+        if template is None:
+            namespace[f"_func{i}"] = info.func
+            if info.reads is None:
+                body.append(f"decision = _func{i}(context)")
+            else:
+                entries = ", ".join(f"{k!r}: get({k!r})" for k in info.reads)
+                body.append(f"decision = _func{i}(context, {{{entries}}})")
+            body += _FOLD.strip("\n").splitlines()
+            continue
+
+        needs, source = template
+        shared += [key for key in needs if key not in shared]
+        snippet = source.strip("\n").splitlines()
+        if "decision = " in source:
+            # Only non-BLOCK outcomes are assigned; the first one wins.
+            snippet = [
+                "decision = ALLOW",
+                *snippet,
+                "if decision is not ALLOW and final_decision is ALLOW:",
+                "    final_decision = decision",
+            ]
+        if gate is not None:
+            snippet = [
+                f"if {gate!r} in metadata:",
+                *("    " + line for line in snippet),
+            ]
+        body += snippet
+
+    namespace["_GATE_KEYS"] = frozenset(gates)
+    lines = [
+        "def _fused(context):",
+        "    metadata = context.metadata",
+        *(
+            ()
+            if ungated
+            else ["    if _GATE_KEYS.isdisjoint(metadata):", "        return ALLOW"]
+        ),
+        "    get = metadata.get",
+        *("    " + _SHARED[key] for key in shared),
+        "    final_decision = ALLOW",
+        *_indent("\n".join(body), 4),
+        "    return final_decision",
+    ]
+    exec(compile("\n".join(lines), f"<clearstone.policies:{name}>", "exec"), namespace)
+
+    fused = namespace["_fused"]
+    fused.__name__ = name
+    fused._policy_info = PolicyInfo(name=name, priority=infos[0].priority, func=fused)
+    return fused
@@ -0,0 +1,182 @@
+# clearstone/policies/batch.py
+
+"""
+Evaluates a set of policies over many contexts at once, e.g. to apply new
+policies retroactively to recorded traffic.
+
+The numeric threshold policies of `clearstone.policies.common` are evaluated
+as NumPy comparisons over columns extracted from all contexts, when those hold
+numbers NumPy compares exactly like Python does; a policy function is then only
+called for the rows its comparison flags, so every returned decision is exactly
+what the policy itself returns. Columns holding anything else, and all other
+policies, are called per context. Decisions are combined as PolicyEngine does.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from clearstone.core.actions import ALLOW, ActionType, Decision
+from clearstone.core.context import PolicyContext
+from clearstone.core.policy import PolicyInfo, _failure_decision, _run_policy
+
+_COMMON_MODULE = "clearstone.policies.common"
+
+# Built-in policies that fire exactly when `value > limit`, as
+# (value key, value default, limit key, limit default). A None limit never fires.
+_THRESHOLDS: Dict[str, Tuple[str, Any, str, Any]] = {
+    "token_limit_policy": ("tokens_used", 0, "token_limit", None),
+    "session_cost_limit_policy": ("session_cost", 0.0, "session_cost_limit", None),
+    "daily_cost_limit_policy": ("daily_cost", 0.0, "daily_cost_limit", None),
+    "rate_limit_policy": ("rate_count", 0, "rate_limit", None),
+    "require_approval_for_high_cost_policy": (
+        "operation_cost",
+        0.0,
+        "high_cost_threshold",
+        10.0,
+    ),
+}
+
+
+# Column element types compared as arrays. Ints outside int64 are left to the
+# policy, and ints are only mixed with floats while float64 holds them exactly.
+_INT_TYPES = frozenset((int, bool))
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+_FLOAT_EXACT_INT = 2**53
+
+
+def _import_numpy():
+    """Imports NumPy, explaining how to install it when it is missing."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Batch policy evaluation requires the numpy package. "
+            "Install it with `pip install clearstone-sdk[batch]`."
+        ) from e
+    return numpy
+
+
+def _policy_infos(policies: List[Union[Callable, PolicyInfo]]) -> List[PolicyInfo]:
+    """Resolves policies to PolicyInfo entries, highest priority first."""
+    infos = []
+    for policy in policies:
+        if isinstance(policy, PolicyInfo):
+            infos.append(policy)
+        elif hasattr(policy, "_policy_info"):
+            infos.append(policy._policy_info)
+        else:
+            name = getattr(policy, "__name__", "anonymous_policy")
+            infos.append(PolicyInfo(name=name, priority=0, func=policy))
+    infos.sort(key=attrgetter("priority"), reverse=True)
+    return infos
+
+
+def _threshold_rows(np, metadatas: List[Dict[str, Any]], spec) -> Optional[Any]:
+    """
+    Returns the indices of the rows where `value > limit`, or None when the
+    columns cannot be compared exactly as arrays (the policy is then called
+    for every row).
+
+    Rows whose limit is None never fire and are left out of the comparison.
+    The rest are compared as int64 when every value and limit is an int, and
+    as float64 when they are floats, or ints small enough to convert exactly.
+    Anything else (strings, sequences, huge ints) is left to the policy.
+    """
+    value_key, value_default, limit_key, limit_default = spec
+    rows = []
+    values = []
+    limits = []
+    for i, m in enumerate(metadatas):
+        limit = m.get(limit_key, limit_default)
+        if limit is not None:
+            rows.append(i)
+            values.append(m.get(value_key, value_default))
+            limits.append(limit)
+    if not rows:
+        return np.empty(0, dtype=np.intp)
+
+    column = values + limits
+    types = set(map(type, column))
+    if types <= _INT_TYPES:
+        dtype = np.int64
+        if not all(_INT64_MIN <= x <= _INT64_MAX for x in column):
+            return None
+    elif types <= _INT_TYPES | {float}:
+        dtype = np.float64
+        if not all(
+            type(x) is float or -_FLOAT_EXACT_INT <= x <= _FLOAT_EXACT_INT
+            for x in column
+        ):
+            return None
+    else:
+        return None
+
+    fired = np.array(values, dtype=dtype) > np.array(limits, dtype=dtype)
+    return np.asarray(rows, dtype=np.intp)[fired]
+
+
+def evaluate_batch(
+    contexts: Sequence[PolicyContext], policies: List[Union[Callable, PolicyInfo]]
+) -> List[Decision]:
+    """
+    Evaluates policies against each of a sequence of contexts.
+
+    The result for each context is the decision PolicyEngine would return for
+    it: policies run in priority order, a BLOCK ends the evaluation, otherwise
+    the first decision that is neither ALLOW nor SKIP wins, and a policy that
+    raises yields the fail-safe BLOCK. No audit entries or metrics are
+    recorded.
+
+    Args:
+        contexts: The contexts to evaluate.
+        policies: Policy functions (decorated or not) or PolicyInfo entries.
+
+    Returns:
+        One decision per context, in order.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    np = _import_numpy()
+    count = len(contexts)
+    metadatas = [context.metadata for context in contexts]
+    final: List[Decision] = [ALLOW] * count
+    blocked = [False] * count
+
+    for info in _policy_infos(policies):
+        spec = None
+        if getattr(info.func, "__module__", None) == _COMMON_MODULE:
+            spec = _THRESHOLDS.get(info.func.__name__)
+        rows = _threshold_rows(np, metadatas, spec) if spec else None
+        if rows is None:
+            rows = range(count)
+        else:
+            rows = rows.tolist()
+
+        for i in rows:
+            if blocked[i]:
+                continue
+            context = contexts[i]
+            view = None
+            if info.reads is not None:
+                view = {key: metadatas[i].get(key) for key in info.reads}
+            decision, _, error = _run_policy(info.func, context, view)
+            if error is None:
+                try:
+                    action = decision.action
+                except AttributeError as e:
+                    error = e
+            if error is not None:
+                decision = _failure_decision(info.name, error)
+                action = ActionType.BLOCK
+            if action is ActionType.BLOCK:
+                final[i] = decision
+                blocked[i] = True
+            elif (
+                final[i] is ALLOW
+                and action is not ActionType.ALLOW
+                and action is not ActionType.SKIP
+            ):
+                final[i] = decision
+
+    return final
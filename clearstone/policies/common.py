@@ -11,8 +11,11 @@ This module provides battle-tested policies for:
 - Local System & Performance
 """
 
-from datetime import datetime
-from typing import Callable, List
+import re
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, FrozenSet, List, Mapping, Pattern
 
 import psutil
 import requests
@@ -28,6 +31,13 @@ from clearstone.core.actions import (
 )
 from clearstone.core.context import PolicyContext
 from clearstone.core.policy import Policy
+from clearstone.policies._compile import compile_policies
+
+# Shared defaults for absent config keys, so a policy call does not allocate
+# an empty list or dict just to test membership against it.
+_NO_CONFIG: Mapping[str, Any] = MappingProxyType({})
+_MISSING = object()
+_PII_ROLES = frozenset(("admin", "data_engineer"))
 
 
 @Policy(name="token_limit", priority=100)
@@ -45,8 +55,9 @@ def token_limit_policy(context: PolicyContext) -> Decision:
             "tokens_used": 6000
         }
     """
-    limit = context.metadata.get("token_limit")
-    tokens = context.metadata.get("tokens_used", 0)
+    get = context.metadata.get
+    limit = get("token_limit")
+    tokens = get("tokens_used", 0)
 
     if limit is not None and tokens > limit:
         return BLOCK(f"Token limit exceeded: {tokens} > {limit}")
@@ -68,8 +79,9 @@ def session_cost_limit_policy(context: PolicyContext) -> Decision:
             "session_cost": 55.0
         }
     """
-    limit = context.metadata.get("session_cost_limit")
-    cost = context.metadata.get("session_cost", 0.0)
+    get = context.metadata.get
+    limit = get("session_cost_limit")
+    cost = get("session_cost", 0.0)
 
     if limit is not None and cost > limit:
         return ALERT
@@ -91,8 +103,9 @@ def daily_cost_limit_policy(context: PolicyContext) -> Decision:
             "daily_cost": 1250.0
         }
     """
-    limit = context.metadata.get("daily_cost_limit")
-    cost = context.metadata.get("daily_cost", 0.0)
+    get = context.metadata.get
+    limit = get("daily_cost_limit")
+    cost = get("daily_cost", 0.0)
 
     if limit is not None and cost > limit:
         return BLOCK(f"Daily cost limit exceeded: ${cost:.2f} > ${limit:.2f}")
@@ -119,11 +132,12 @@ def rbac_tool_access_policy(context: PolicyContext) -> Decision:
             }
         }
     """
-    user_role = context.metadata.get("user_role", "guest")
-    tool_name = context.metadata.get("tool_name", "")
-    restricted = context.metadata.get("restricted_tools", {})
+    get = context.metadata.get
+    user_role = get("user_role", "guest")
+    tool_name = get("tool_name", "")
+    restricted = get("restricted_tools", _NO_CONFIG)
 
-    forbidden = restricted.get(user_role, [])
+    forbidden = restricted.get(user_role, ())
 
     if tool_name in forbidden:
         return BLOCK(f"Role '{user_role}' cannot access tool '{tool_name}'")
@@ -147,9 +161,10 @@ def admin_only_action_policy(context: PolicyContext) -> Decision:
             "require_admin_for": ["delete_all_users", "export_database"]
         }
     """
-    user_role = context.metadata.get("user_role", "guest")
-    tool_name = context.metadata.get("tool_name", "")
-    require_admin = context.metadata.get("require_admin_for", [])
+    get = context.metadata.get
+    user_role = get("user_role", "guest")
+    tool_name = get("tool_name", "")
+    require_admin = get("require_admin_for", ())
 
     if tool_name in require_admin and user_role != "admin":
         return BLOCK(
@@ -176,11 +191,12 @@ def redact_pii_policy(context: PolicyContext) -> Decision:
             }
         }
     """
-    tool_name = context.metadata.get("tool_name", "")
-    pii_config = context.metadata.get("pii_fields", {})
+    get = context.metadata.get
+    tool_name = get("tool_name", "")
+    pii_config = get("pii_fields", _NO_CONFIG)
 
-    if tool_name in pii_config:
-        fields = pii_config[tool_name]
+    fields = pii_config.get(tool_name, _MISSING)
+    if fields is not _MISSING:
         return REDACT(reason=f"PII redaction for tool '{tool_name}'", fields=fields)
     return ALLOW
 
@@ -202,15 +218,36 @@ def block_pii_tools_policy(context: PolicyContext) -> Decision:
             "pii_tools": ["fetch_ssn", "get_credit_card", "view_medical_records"]
         }
     """
-    user_role = context.metadata.get("user_role", "guest")
-    tool_name = context.metadata.get("tool_name", "")
-    pii_tools = context.metadata.get("pii_tools", [])
+    get = context.metadata.get
+    user_role = get("user_role", "guest")
+    tool_name = get("tool_name", "")
+    pii_tools = get("pii_tools", ())
 
-    if tool_name in pii_tools and user_role not in ["admin", "data_engineer"]:
+    if tool_name in pii_tools and user_role not in _PII_ROLES:
         return BLOCK(f"PII access denied for role '{user_role}'")
     return ALLOW
 
 
+_DANGEROUS = (
+    "delete_database",
+    "drop_table",
+    "truncate",
+    "format_drive",
+    "shutdown",
+    "restart",
+    "hard_delete",
+    "purge",
+    "destroy",
+)
+_DANGEROUS_RE = re.compile("|".join(map(re.escape, _DANGEROUS)))
+
+
+@lru_cache(maxsize=128)
+def _substring_pattern(needles: FrozenSet[str]) -> Pattern[str]:
+    """Compiles a pattern matching any of the given substrings."""
+    return re.compile("|".join(map(re.escape, needles)))
+
+
 @Policy(name="block_dangerous_tools", priority=100)
 def block_dangerous_tools_policy(context: PolicyContext) -> Decision:
     """
@@ -224,21 +261,9 @@ def block_dangerous_tools_policy(context: PolicyContext) -> Decision:
             "tool_name": "drop_table"
         }
     """
-    dangerous = [
-        "delete_database",
-        "drop_table",
-        "truncate",
-        "format_drive",
-        "shutdown",
-        "restart",
-        "hard_delete",
-        "purge",
-        "destroy",
-    ]
-
     tool_name = context.metadata.get("tool_name", "").lower()
 
-    if any(d in tool_name for d in dangerous):
+    if _DANGEROUS_RE.search(tool_name):
         return BLOCK(f"Dangerous tool blocked: '{tool_name}'")
     return ALLOW
 
@@ -258,10 +283,11 @@ def pause_before_write_policy(context: PolicyContext) -> Decision:
             "require_pause_for": ["create", "update", "delete", "modify"]
         }
     """
-    tool_name = context.metadata.get("tool_name", "").lower()
-    require_pause = context.metadata.get("require_pause_for", [])
+    get = context.metadata.get
+    tool_name = get("tool_name", "").lower()
+    require_pause = get("require_pause_for", ())
 
-    if any(action in tool_name for action in require_pause):
+    if require_pause and _substring_pattern(frozenset(require_pause)).search(tool_name):
         return PAUSE(f"Manual review required for write operation: '{tool_name}'")
 
     return ALLOW
@@ -283,8 +309,9 @@ def alert_on_privileged_access_policy(context: PolicyContext) -> Decision:
             "privileged_tools": ["export_all_data", "admin_console", "grant_permissions"]
         }
     """
-    tool_name = context.metadata.get("tool_name", "")
-    privileged = context.metadata.get("privileged_tools", [])
+    get = context.metadata.get
+    tool_name = get("tool_name", "")
+    privileged = get("privileged_tools", ())
     user_id = context.user_id
 
     if tool_name in privileged:
@@ -311,8 +338,9 @@ def alert_on_failed_auth_policy(context: PolicyContext) -> Decision:
             "attempt_count": 5
         }
     """
-    if context.metadata.get("auth_failed"):
-        attempts = context.metadata.get("attempt_count", 1)
+    get = context.metadata.get
+    if get("auth_failed"):
+        attempts = get("attempt_count", 1)
         user_id = context.user_id
 
         if attempts > 3:
@@ -324,6 +352,25 @@ def alert_on_failed_auth_policy(context: PolicyContext) -> Decision:
     return ALLOW
 
 
+# (hour, epoch second at which the next local hour starts)
+_hour_cache = (-1, 0.0)
+
+
+def _local_hour() -> int:
+    """Returns the current local hour, recomputed once per hour."""
+    global _hour_cache
+    now = time.time()
+    hour, valid_until = _hour_cache
+    if now >= valid_until:
+        local = time.localtime(now)
+        hour = local.tm_hour
+        _hour_cache = (
+            hour,
+            now - (now % 60) - local.tm_min * 60 + 3600,
+        )
+    return hour
+
+
 @Policy(name="business_hours_only", priority=70)
 def business_hours_only_policy(context: PolicyContext) -> Decision:
     """
@@ -339,11 +386,12 @@ def business_hours_only_policy(context: PolicyContext) -> Decision:
             "business_hours": (9, 17)
         }
     """
-    current_hour = context.metadata.get("current_hour")
+    get = context.metadata.get
+    current_hour = get("current_hour")
     if current_hour is None:
-        current_hour = datetime.now().hour
+        current_hour = _local_hour()
 
-    business_hours = context.metadata.get("business_hours", (9, 17))
+    business_hours = get("business_hours", (9, 17))
     start, end = business_hours
 
     if not (start <= current_hour < end):
@@ -369,8 +417,9 @@ def rate_limit_policy(context: PolicyContext) -> Decision:
             "rate_count": 105
         }
     """
-    limit = context.metadata.get("rate_limit")
-    count = context.metadata.get("rate_count", 0)
+    get = context.metadata.get
+    limit = get("rate_limit")
+    count = get("rate_count", 0)
 
     if limit is not None and count > limit:
         return BLOCK(f"Rate limit exceeded: {count} > {limit}")
@@ -394,9 +443,10 @@ def block_external_apis_policy(context: PolicyContext) -> Decision:
             "whitelisted_apis": ["fetch_weather"]
         }
     """
-    tool_name = context.metadata.get("tool_name", "")
-    external_tools = context.metadata.get("external_api_tools", [])
-    whitelist = context.metadata.get("whitelisted_apis", [])
+    get = context.metadata.get
+    tool_name = get("tool_name", "")
+    external_tools = get("external_api_tools", ())
+    whitelist = get("whitelisted_apis", ())
 
     if tool_name in external_tools and tool_name not in whitelist:
         return BLOCK(f"External API call blocked: '{tool_name}' is not whitelisted")
@@ -418,8 +468,9 @@ def require_approval_for_high_cost_policy(context: PolicyContext) -> Decision:
             "high_cost_threshold": 10.0
         }
     """
-    cost = context.metadata.get("operation_cost", 0.0)
-    threshold = context.metadata.get("high_cost_threshold", 10.0)
+    get = context.metadata.get
+    cost = get("operation_cost", 0.0)
+    threshold = get("high_cost_threshold", 10.0)
 
     if cost > threshold:
         return PAUSE(
@@ -429,7 +480,7 @@ def require_approval_for_high_cost_policy(context: PolicyContext) -> Decision:
     return ALLOW
 
 
-def create_safe_mode_policies() -> List[Callable]:
+def create_safe_mode_policies(fused: bool = False) -> List[Callable]:
     """
     Create a set of policies for 'safe mode' (conservative execution).
 
@@ -439,18 +490,23 @@ def create_safe_mode_policies() -> List[Callable]:
     - Token limits
     - Alert on privileged access
 
+    Args:
+        fused: Return the set compiled into a single policy function
+               (see `compile_policies`) instead of the individual policies.
+
     Returns:
         List of policy functions ready to be used
     """
-    return [
+    policies = [
         block_dangerous_tools_policy,
         pause_before_write_policy,
         token_limit_policy,
         alert_on_privileged_access_policy,
     ]
+    return [compile_policies(policies, name="safe_mode")] if fused else policies
 
 
-def create_audit_mode_policies() -> List[Callable]:
+def create_audit_mode_policies(fused: bool = False) -> List[Callable]:
     """
     Create policies for full audit logging.
 
@@ -460,18 +516,23 @@ def create_audit_mode_policies() -> List[Callable]:
     - RBAC enforcement
     - Rate limiting
 
+    Args:
+        fused: Return the set compiled into a single policy function
+               (see `compile_policies`) instead of the individual policies.
+
     Returns:
         List of policy functions
     """
-    return [
+    policies = [
         alert_on_privileged_access_policy,
         alert_on_failed_auth_policy,
         rbac_tool_access_policy,
         rate_limit_policy,
     ]
+    return [compile_policies(policies, name="audit_mode")] if fused else policies
 
 
-def create_cost_control_policies() -> List[Callable]:
+def create_cost_control_policies(fused: bool = False) -> List[Callable]:
     """
     Create policies for strict cost control.
 
@@ -481,18 +542,23 @@ def create_cost_control_policies() -> List[Callable]:
     - Daily cost limits
     - High cost approval
 
+    Args:
+        fused: Return the set compiled into a single policy function
+               (see `compile_policies`) instead of the individual policies.
+
     Returns:
         List of policy functions
     """
-    return [
+    policies = [
         token_limit_policy,
         session_cost_limit_policy,
         daily_cost_limit_policy,
         require_approval_for_high_cost_policy,
     ]
+    return [compile_policies(policies, name="cost_control")] if fused else policies
 
 
-def create_security_policies() -> List[Callable]:
+def create_security_policies(fused: bool = False) -> List[Callable]:
     """
     Create comprehensive security policies.
 
@@ -504,10 +570,14 @@ def create_security_policies() -> List[Callable]:
     - Alert on privileged access
     - Block dangerous tools
 
+    Args:
+        fused: Return the set compiled into a single policy function
+               (see `compile_policies`) instead of the individual policies.
+
     Returns:
         List of policy functions
     """
-    return [
+    policies = [
         rbac_tool_access_policy,
         admin_only_action_policy,
         block_pii_tools_policy,
@@ -515,9 +585,10 @@ def create_security_policies() -> List[Callable]:
         alert_on_privileged_access_policy,
         block_dangerous_tools_policy,
     ]
+    return [compile_policies(policies, name="security")] if fused else policies
 
 
-def create_data_protection_policies() -> List[Callable]:
+def create_data_protection_policies(fused: bool = False) -> List[Callable]:
     """
     Create policies for sensitive data protection.
 
@@ -526,14 +597,19 @@ def create_data_protection_policies() -> List[Callable]:
     - Block PII tools for non-privileged users
     - Admin-only access to sensitive data
 
+    Args:
+        fused: Return the set compiled into a single policy function
+               (see `compile_policies`) instead of the individual policies.
+
     Returns:
         List of policy functions
     """
-    return [
+    policies = [
         redact_pii_policy,
         block_pii_tools_policy,
         admin_only_action_policy,
     ]
+    return [compile_policies(policies, name="data_protection")] if fused else policies
 
 
 # ============================================================================
@@ -551,8 +627,9 @@ def system_load_policy(context: PolicyContext) -> Decision:
         - cpu_threshold_percent (optional, default 90): CPU usage percent to trigger block.
         - memory_threshold_percent (optional, default 95): Memory usage percent to trigger block.
     """
-    cpu_threshold = context.metadata.get("cpu_threshold_percent", 90.0)
-    mem_threshold = context.metadata.get("memory_threshold_percent", 95.0)
+    get = context.metadata.get
+    cpu_threshold = get("cpu_threshold_percent", 90.0)
+    mem_threshold = get("memory_threshold_percent", 95.0)
 
     cpu_percent = psutil.cpu_percent()
     memory_percent = psutil.virtual_memory().percent
@@ -590,10 +667,9 @@ def model_health_check_policy(context: PolicyContext) -> Decision:
             "health_check_timeout": 1.0
         }
     """
-    health_check_url = context.metadata.get(
-        "local_model_health_url", "http://localhost:11434/api/tags"
-    )
-    timeout = context.metadata.get("health_check_timeout", 0.5)
+    get = context.metadata.get
+    health_check_url = get("local_model_health_url", "http://localhost:11434/api/tags")
+    timeout = get("health_check_timeout", 0.5)
 
     try:
         response = requests.head(health_check_url, timeout=timeout)
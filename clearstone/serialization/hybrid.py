@@ -1,11 +1,101 @@
 # clearstone/serialization/hybrid.py
 
-import base64
+import binascii
 import json
 import pickle
 import sys
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from clearstone.utils.serialization import json_dumps_native, json_loads
+
+
+def _b64encode(data: bytes) -> str:
+    """Base64-encodes bytes to ASCII text, without a trailing newline."""
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
+
+
+# Decoders for values stored under their own type tag instead of being pickled.
+_SCALAR_DECODERS = {
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "uuid": UUID,
+    "bytes": binascii.a2b_base64,
+}
+
+
+def _encode_scalar(obj: Any) -> Optional[Tuple[str, str]]:
+    """
+    Returns (type tag, text) for a value with an exact text form, or None.
+
+    Only exact types whose text form decodes back to an equal value of the
+    same type qualify; datetimes must be naive or use a fixed-offset timezone.
+    """
+    cls = type(obj)
+    if cls is datetime:
+        if obj.fold or not (obj.tzinfo is None or type(obj.tzinfo) is timezone):
+            return None
+        return "datetime", obj.isoformat()
+    if cls is date:
+        return "date", obj.isoformat()
+    if cls is UUID:
+        return "uuid", str(obj)
+    if cls is bytes:
+        return "bytes", _b64encode(obj)
+    return None
+
+
+def _buffer_nbytes(item: Any) -> Optional[int]:
+    """Returns the data size of a memoryview or plain numpy array, else None."""
+    if isinstance(item, memoryview):
+        return item.nbytes
+    numpy = sys.modules.get("numpy")
+    if (
+        numpy is not None
+        and isinstance(item, numpy.ndarray)
+        and not item.dtype.hasobject
+    ):
+        return item.nbytes
+    return None
+
+
+def _min_encoded_size(obj: Any, limit: int) -> int:
+    """
+    Returns a lower bound on the size HybridSerializer will encode obj to,
+    without encoding it. Counting stops once the bound exceeds `limit`.
+
+    Strings count their length, memoryviews and numpy arrays (other than
+    object arrays) their `nbytes`, and containers the bounds of their items
+    plus one byte per item. Everything else counts as one byte. Each string
+    and container is counted once, as pickle memoizes them, so shared or
+    cyclic references do not inflate the bound.
+    """
+    total = 0
+    stack = [obj]
+    seen = set()
+    while stack and total <= limit:
+        item = stack.pop()
+        if isinstance(item, (str, bytes, bytearray)):
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            total += len(item)
+        elif isinstance(item, (dict, list, tuple, set, frozenset)):
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            total += len(item) + 1
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            else:
+                stack.extend(item)
+        else:
+            nbytes = _buffer_nbytes(item)
+            total += nbytes if nbytes is not None else 1
+    return total
 
 
 class SerializationStrategy(ABC):
@@ -30,33 +120,43 @@ class HybridSerializer(SerializationStrategy):
 
     def serialize(self, obj: Any) -> str:
         """Serializes an object with type tagging for safe deserialization."""
+        return self._serialize_bytes(obj).decode("utf-8")
+
+    def _serialize_bytes(self, obj: Any) -> bytes:
+        """
+        Serializes an object like `serialize`, returning UTF-8 bytes.
+
+        A JSON-native object is encoded once and the result is wrapped in the
+        tagged envelope as-is. Datetimes, dates, UUIDs and bytes are stored as
+        text under their own tag, and anything else is pickled.
+        """
+        scalar = _encode_scalar(obj)
+        if scalar is not None:
+            container = {"__type__": scalar[0], "value": scalar[1]}
+            return json.dumps(container).encode("utf-8")
         try:
-            json.dumps(obj)
-            return json.dumps({"__type__": "json", "value": obj})
+            value = json_dumps_native(obj)
         except (TypeError, ValueError):
             try:
                 pickled = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
-                encoded = base64.b64encode(pickled).decode("utf-8")
-                return json.dumps(
-                    {
-                        "__type__": "pickle",
-                        "value": encoded,
-                        "python_version": f"{sys.version_info.major}.{sys.version_info.minor}",
-                    }
-                )
+                container = {
+                    "__type__": "pickle",
+                    "value": _b64encode(pickled),
+                    "python_version": f"{sys.version_info.major}.{sys.version_info.minor}",
+                }
             except Exception as e:
-                return json.dumps(
-                    {
-                        "__type__": "error",
-                        "reason": f"Serialization failed: {str(e)}",
-                        "obj_type": type(obj).__name__,
-                    }
-                )
+                container = {
+                    "__type__": "error",
+                    "reason": f"Serialization failed: {str(e)}",
+                    "obj_type": type(obj).__name__,
+                }
+            return json.dumps(container).encode("utf-8")
+        return b'{"__type__": "json", "value": ' + value + b"}"
 
     def deserialize(self, data: str) -> Any:
         """Deserializes data based on the embedded type tag."""
         try:
-            container = json.loads(data)
+            container = json_loads(data)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON format for deserialization: {e}")
 
@@ -65,9 +165,12 @@ class HybridSerializer(SerializationStrategy):
         if type_tag == "json":
             return container.get("value")
 
+        elif type_tag in _SCALAR_DECODERS:
+            return _SCALAR_DECODERS[type_tag](container.get("value"))
+
         elif type_tag == "pickle":
             encoded = container.get("value")
-            pickled = base64.b64decode(encoded.encode("utf-8"))
+            pickled = binascii.a2b_base64(encoded)
             try:
                 return pickle.loads(pickled)
             except Exception as e:
@@ -103,8 +206,18 @@ class SelectiveSnapshotCapture:
         serializer = HybridSerializer()
 
         try:
-            serialized_data = serializer.serialize(obj)
-            size_bytes = len(serialized_data.encode("utf-8"))
+            # Reject objects that are certain to be too large before paying
+            # for their serialization.
+            min_size = _min_encoded_size(obj, max_size)
+            if min_size > max_size:
+                return {
+                    "captured": False,
+                    "reason": f"Snapshot size (at least {min_size} bytes) exceeds limit of {max_size} bytes.",
+                    "type": type(obj).__name__,
+                }
+
+            encoded = serializer._serialize_bytes(obj)
+            size_bytes = len(encoded)
 
             if size_bytes > max_size:
                 return {
@@ -115,7 +228,7 @@ class SelectiveSnapshotCapture:
 
             return {
                 "captured": True,
-                "data": serialized_data,
+                "data": encoded.decode("utf-8"),
                 "size_bytes": size_bytes,
             }
         except Exception as e:
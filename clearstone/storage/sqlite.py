@@ -1,14 +1,16 @@
 # clearstone/storage/sqlite.py
 
-import json
 import queue
 import sqlite3
 import threading
 import time
+import traceback
+import weakref
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from clearstone.observability.models import Span, Trace
+from clearstone.utils.serialization import json_dumps, json_loads
 
 from .types import BaseSpanBuffer, BaseTraceStore
 
@@ -34,63 +36,186 @@ CREATE INDEX IF NOT EXISTS idx_spans_trace_id ON spans(trace_id);
 CREATE INDEX IF NOT EXISTS idx_spans_start_time ON spans(start_time_ns);
 """
 
+# The span columns get_trace reads; "{snapshots}" is the two snapshot columns,
+# or two NULLs when snapshots are not wanted.
+_SELECT_TRACE_SQL = (
+    "SELECT span_id, parent_span_id, name, kind, start_time_ns, end_time_ns, "
+    "status, attributes_json, {snapshots}, error_message, instrumentation_name, "
+    "instrumentation_version FROM spans WHERE trace_id = ?"
+)
+_SELECT_TRACE_WITH_SNAPSHOTS_SQL = _SELECT_TRACE_SQL.format(
+    snapshots="input_snapshot_json, output_snapshot_json"
+)
+_SELECT_TRACE_WITHOUT_SNAPSHOTS_SQL = _SELECT_TRACE_SQL.format(snapshots="NULL, NULL")
+
+INSERT_SPAN_SQL = "INSERT OR REPLACE INTO spans VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)"
+
+# Applied to every connection the TraceStore opens. WAL lets readers run
+# alongside the writer, NORMAL sync skips an fsync per commit (still safe in
+# WAL mode), and the busy timeout makes concurrent writers wait instead of
+# failing. A negative cache_size is in KiB (64 MiB here). Temporary tables and
+# indices built for sorting stay in memory, and reads go through a 256 MiB
+# memory map instead of read() calls.
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -65536,
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,
+}
+
+
+def _load_attributes(raw: Optional[str]) -> Dict[str, Any]:
+    """Decodes an attributes column, skipping the parser for empty ones."""
+    if not raw or raw == "{}":
+        return {}
+    return json_loads(raw)
+
+
+def _load_snapshot(raw: Optional[str]) -> Any:
+    """Decodes a snapshot column, skipping the parser for absent snapshots."""
+    if not raw or raw == "null":
+        return None
+    return json_loads(raw)
+
+
+# Tells the SpanBuffer writer thread to write what it holds and exit.
+_STOP = object()
+
 
 class SpanBuffer(BaseSpanBuffer):
     """
-    An in-memory, thread-safe buffer for spans that flushes them to a writer
-    periodically or when the buffer is full. This decouples span creation
-    from the I/O of writing to disk.
+    An in-memory, thread-safe buffer for spans. A dedicated writer thread
+    drains it and writes spans to the writer in batches, so span creation
+    never waits on the I/O of writing to disk.
+
+    A batch is written once `batch_size` spans are waiting or the oldest of
+    them has waited `flush_interval_s` seconds, whichever comes first.
     """
 
     def __init__(
         self, writer: "TraceStore", batch_size: int = 100, flush_interval_s: int = 5
     ):
-        self._queue = queue.Queue()
+        # SimpleQueue.put never blocks and takes no Python-level lock, so
+        # producers hand spans (or whole lists of spans) to the writer thread
+        # without contending with each other or with the write.
+        self._queue = queue.SimpleQueue()
         self._writer = writer
         self._batch_size = batch_size
         self._flush_interval_s = flush_interval_s
         self._shutdown = threading.Event()
+        # Producers that hold spans back (see Tracer) drain them on flush.
+        self._flush_hooks: List[weakref.WeakMethod] = []
+        self._flush_hooks_lock = threading.Lock()
 
-        self._flusher_thread = threading.Thread(
-            target=self._periodic_flush, daemon=True
-        )
-        self._flusher_thread.start()
+        self._writer_thread = threading.Thread(target=self._run, daemon=True)
+        self._writer_thread.start()
 
     def add_span(self, span: Span):
         """Add a span to the buffer. This is a non-blocking operation."""
         if not self._shutdown.is_set():
             self._queue.put(span)
-            if self._queue.qsize() >= self._batch_size:
-                self._flush_queue()
-
-    def _periodic_flush(self):
-        """The background worker thread that periodically flushes the queue."""
-        while not self._shutdown.is_set():
-            time.sleep(self._flush_interval_s)
-            self._flush_queue()
-
-    def _flush_queue(self):
-        """Drains the queue and writes spans in batches."""
-        spans_to_write = []
-        while len(spans_to_write) < self._batch_size:
+
+    def add_spans(self, spans: List[Span]):
+        """
+        Add several spans to the buffer at once. This is a non-blocking
+        operation; the list is handed over as-is and must not be modified
+        afterwards.
+        """
+        if spans and not self._shutdown.is_set():
+            self._queue.put(spans)
+
+    def add_flush_hook(self, hook: Callable[[], None]):
+        """
+        Registers a bound method that hands held spans to this buffer. It is
+        called at the start of flush() and shutdown(), and held weakly, so
+        registering does not keep its object alive.
+        """
+        with self._flush_hooks_lock:
+            self._flush_hooks = [ref for ref in self._flush_hooks if ref() is not None]
+            self._flush_hooks.append(weakref.WeakMethod(hook))
+
+    def _run_flush_hooks(self):
+        """Lets registered producers hand over the spans they still hold."""
+        with self._flush_hooks_lock:
+            hooks = [ref() for ref in self._flush_hooks]
+        for hook in hooks:
+            if hook is not None:
+                hook()
+
+    def _run(self):
+        """The writer thread: collects queued spans and writes them in batches."""
+        get = self._queue.get
+        pending: List[Span] = []
+        deadline = None
+        while True:
             try:
-                span = self._queue.get_nowait()
-                spans_to_write.append(span)
+                if deadline is None:
+                    item = get()
+                else:
+                    item = get(timeout=max(deadline - time.monotonic(), 0))
             except queue.Empty:
-                break
+                item = None
+
+            if item is _STOP or isinstance(item, threading.Event):
+                # Shutdown or a flush request: write everything held now.
+                self._write(pending)
+                pending = []
+                deadline = None
+                if item is _STOP:
+                    return
+                item.set()
+                continue
+            if isinstance(item, list):
+                pending.extend(item)
+            elif item is not None:
+                pending.append(item)
 
-        if spans_to_write:
-            self._writer.write_spans(spans_to_write)
+            if len(pending) >= self._batch_size or item is None:
+                self._write(pending)
+                pending = []
+                deadline = None
+            elif deadline is None:
+                deadline = time.monotonic() + self._flush_interval_s
+
+    def _write(self, spans: List[Span]):
+        """Writes spans in one transaction, keeping the writer thread alive on errors."""
+        if not spans:
+            return
+        try:
+            self._writer.write_spans(spans)
+        except Exception:
+            traceback.print_exc()
 
     def flush(self):
-        """Manually trigger a flush of all buffered spans."""
-        self._flush_queue()
+        """Write all buffered spans now, returning once they are written."""
+        if self._writer_thread.is_alive():
+            self._run_flush_hooks()
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
 
     def shutdown(self):
-        """Flush any remaining spans and stop the background thread."""
+        """Flush any remaining spans and stop the writer thread."""
+        self._run_flush_hooks()
         self._shutdown.set()
-        self.flush()
-        self._flusher_thread.join()
+        self._queue.put(_STOP)
+        self._writer_thread.join()
+
+
+class _ConnectionHolder:
+    """
+    Holds one thread's connection in the thread-local storage of a
+    TraceStore. The connection is closed when the holder is garbage
+    collected, i.e. when its thread ends, unless close() came first.
+    """
+
+    __slots__ = ("conn", "close", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.close = weakref.finalize(self, conn.close)
 
 
 class TraceStore(BaseTraceStore):
@@ -99,103 +224,161 @@ class TraceStore(BaseTraceStore):
     This class handles database connections, schema creation, and writing data.
     """
 
-    def __init__(self, db_path: str = "clearstone_traces.db"):
+    def __init__(
+        self,
+        db_path: str = "clearstone_traces.db",
+        pragmas: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            db_path: Path of the SQLite database file.
+            pragmas: PRAGMA settings applied to every connection, merged over
+                     DEFAULT_PRAGMAS.
+        """
         self.db_path = Path(db_path)
-        self._conn = None
+        # One connection per thread, opened on first use and reused, so a
+        # write or read does not pay for connecting and applying pragmas. It
+        # is closed when its thread ends (the thread-local holder is dropped),
+        # or by close().
+        self._local = threading.local()
+        self._holders: "weakref.WeakSet[_ConnectionHolder]" = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        # SQLite allows one writer at a time. Writers of this store queue on
+        # this lock instead of in SQLite's busy handler, which polls with
+        # sleeps; readers never take it (WAL lets them run alongside).
+        self._write_lock = threading.Lock()
+        self._pragma_sql = [
+            f"PRAGMA {name}={value};"
+            for name, value in {**DEFAULT_PRAGMAS, **(pragmas or {})}.items()
+        ]
         self._init_db()
 
     def _get_connection(self):
-        """Establishes a thread-safe database connection."""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        """Opens a new database connection with the configured pragmas."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for statement in self._pragma_sql:
+            conn.execute(statement)
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the calling thread's connection, opening it on first use."""
+        try:
+            return self._local.holder.conn
+        except AttributeError:
+            holder = self._local.holder = _ConnectionHolder(self._get_connection())
+            with self._connections_lock:
+                self._holders.add(holder)
+            return holder.conn
 
     def _init_db(self):
         """Initializes the database and creates the necessary tables."""
-        conn = self._get_connection()
-        try:
-            conn.executescript(SCHEMA_SQL)
-            conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA synchronous=NORMAL;")
-            conn.commit()
-        finally:
-            conn.close()
+        conn = self._connection()
+        conn.executescript(SCHEMA_SQL)
+        conn.commit()
+
+    def close(self):
+        """
+        Closes the connections of all threads. The store stays usable; a
+        thread that uses it again opens a new connection.
+        """
+        with self._connections_lock:
+            holders = list(self._holders)
+            self._holders = weakref.WeakSet()
+            self._local = threading.local()
+        for holder in holders:
+            holder.close()
 
     def write_spans(self, spans: List[Span]):
         """
         Writes a batch of spans to the database in a single transaction.
         This is designed to be called by the SpanBuffer.
         """
-        conn = self._get_connection()
-        try:
-            with conn:
-                cursor = conn.cursor()
-                values = []
-                for span in spans:
-                    values.append(
-                        (
-                            span.span_id,
-                            span.trace_id,
-                            span.parent_span_id,
-                            span.name,
-                            span.kind.value,
-                            span.start_time_ns,
-                            span.end_time_ns,
-                            span.status.value,
-                            json.dumps(span.attributes),
-                            json.dumps(span.input_snapshot),
-                            json.dumps(span.output_snapshot),
-                            span.error_message,
-                            span.instrumentation_name,
-                            span.instrumentation_version,
-                        )
-                    )
-
-                cursor.executemany(
-                    "INSERT OR REPLACE INTO spans VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
-                    values,
-                )
-        finally:
-            conn.close()
+        rows = (
+            (
+                span.span_id,
+                span.trace_id,
+                span.parent_span_id,
+                span.name,
+                span.kind.value,
+                span.start_time_ns,
+                span.end_time_ns,
+                span.status.value,
+                json_dumps(span.attributes).decode("utf-8"),
+                json_dumps(span.input_snapshot).decode("utf-8"),
+                json_dumps(span.output_snapshot).decode("utf-8"),
+                span.error_message,
+                span.instrumentation_name,
+                span.instrumentation_version,
+            )
+            for span in spans
+        )
 
-    def get_trace(self, trace_id: str) -> Optional[Trace]:
-        """Retrieves all spans for a given trace_id and reconstructs the Trace."""
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM spans WHERE trace_id = ?", (trace_id,))
-            rows = cursor.fetchall()
-
-            if not rows:
-                return None
-
-            spans = []
-            for row in rows:
-                spans.append(
-                    Span(
-                        span_id=row[0],
-                        trace_id=row[1],
-                        parent_span_id=row[2],
-                        name=row[3],
-                        kind=row[4],
-                        start_time_ns=row[5],
-                        end_time_ns=row[6],
-                        status=row[7],
-                        attributes=json.loads(row[8] or "{}"),
-                        input_snapshot=json.loads(row[9] or "null"),
-                        output_snapshot=json.loads(row[10] or "null"),
-                        error_message=row[11],
-                        instrumentation_name=row[12],
-                        instrumentation_version=row[13],
-                    )
-                )
+        conn = self._connection()
+        with self._write_lock, conn:
+            conn.executemany(INSERT_SPAN_SQL, rows)
 
-            return Trace(
-                trace_id=trace_id,
-                spans=spans,
-                root_span_id="",
-                agent_id="",
-                agent_version="",
-                environment="",
-                start_time_ns=0,
+    def get_trace(
+        self, trace_id: str, include_snapshots: bool = True
+    ) -> Optional[Trace]:
+        """
+        Retrieves all spans for a given trace_id and reconstructs the Trace.
+
+        Args:
+            trace_id: The ID of the trace to load.
+            include_snapshots: Whether to load the input and output snapshots
+                               of the spans. Snapshots can be large; without
+                               them the spans' snapshots are None.
+        """
+        sql = (
+            _SELECT_TRACE_WITH_SNAPSHOTS_SQL
+            if include_snapshots
+            else _SELECT_TRACE_WITHOUT_SNAPSHOTS_SQL
+        )
+
+        spans = []
+        for (
+            span_id,
+            parent_span_id,
+            name,
+            kind,
+            start_time_ns,
+            end_time_ns,
+            status,
+            attributes_json,
+            input_snapshot_json,
+            output_snapshot_json,
+            error_message,
+            instrumentation_name,
+            instrumentation_version,
+        ) in self._connection().execute(sql, (trace_id,)):
+            spans.append(
+                Span(
+                    span_id=span_id,
+                    trace_id=trace_id,
+                    parent_span_id=parent_span_id,
+                    name=name,
+                    kind=kind,
+                    start_time_ns=start_time_ns,
+                    end_time_ns=end_time_ns,
+                    status=status,
+                    attributes=_load_attributes(attributes_json),
+                    input_snapshot=_load_snapshot(input_snapshot_json),
+                    output_snapshot=_load_snapshot(output_snapshot_json),
+                    error_message=error_message,
+                    instrumentation_name=instrumentation_name,
+                    instrumentation_version=instrumentation_version,
+                )
             )
-        finally:
-            conn.close()
+
+        if not spans:
+            return None
+
+        return Trace(
+            trace_id=trace_id,
+            spans=spans,
+            root_span_id="",
+            agent_id="",
+            agent_version="",
+            environment="",
+            start_time_ns=0,
+        )
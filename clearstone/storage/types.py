@@ -1,7 +1,7 @@
 # clearstone/storage/types.py
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Callable, List
 
 if TYPE_CHECKING:
     from clearstone.observability.models import Span, Trace
@@ -16,8 +16,12 @@ class BaseTraceStore(ABC):
         pass
 
     @abstractmethod
-    def get_trace(self, trace_id: str) -> "Trace":
-        """Retrieve a complete trace by its ID."""
+    def get_trace(self, trace_id: str, include_snapshots: bool = True) -> "Trace":
+        """Retrieve a complete trace by its ID, optionally without span snapshots."""
+        pass
+
+    def close(self):
+        """Release any open connections. Stores without any need not override this."""
         pass
 
 
@@ -29,6 +33,19 @@ class BaseSpanBuffer(ABC):
         """Add a span to the buffer."""
         pass
 
+    def add_spans(self, spans: List["Span"]):
+        """Add several spans to the buffer. Buffers may override this to batch."""
+        for span in spans:
+            self.add_span(span)
+
+    def add_flush_hook(self, hook: Callable[[], None]):
+        """
+        Registers a bound method that hands held spans to this buffer, called
+        before the buffer flushes or shuts down. Buffers that do not flush
+        need not override this.
+        """
+        pass
+
     @abstractmethod
     def shutdown(self):
         """Shutdown the buffer and flush remaining spans."""
@@ -1,7 +1,7 @@
 from typing import Callable, List
 
 from clearstone.core.actions import ALLOW, BLOCK, Decision
-from clearstone.observability.models import SpanStatus, Trace
+from clearstone.observability.models import Trace
 
 PolicyFunc = Callable[[Trace], Decision]
 
@@ -19,21 +19,17 @@ def assert_tool_was_called(
     """
 
     def policy(trace: Trace) -> Decision:
-        tool_spans = [
-            span
-            for span in trace.spans
-            if span.attributes.get("tool.name") == tool_name
-        ]
+        calls = trace.tool_call_counts()[tool_name]
 
         if times is not None:
-            if len(tool_spans) != times:
+            if calls != times:
                 failure_reason = (
                     reason
-                    or f"Expected tool '{tool_name}' to be called {times} time(s), but it was called {len(tool_spans)} time(s)."
+                    or f"Expected tool '{tool_name}' to be called {times} time(s), but it was called {calls} time(s)."
                 )
                 return BLOCK(failure_reason)
         else:
-            if not tool_spans:
+            if not calls:
                 failure_reason = (
                     reason
                     or f"Expected tool '{tool_name}' to be called at least once, but it was not."
@@ -51,11 +47,11 @@ def assert_llm_cost_is_less_than(max_cost: float, reason: str = None) -> PolicyF
     """
 
     def policy(trace: Trace) -> Decision:
-        total_cost = sum(
-            span.attributes.get("llm.cost", 0)
-            for span in trace.spans
-            if "llm.cost" in span.attributes
-        )
+        total_cost = 0
+        for span in trace.spans:
+            cost = span.attributes.get("llm.cost")
+            if cost is not None:
+                total_cost += cost
 
         if total_cost >= max_cost:
             failure_reason = (
@@ -75,7 +71,7 @@ def assert_no_errors_in_trace(reason: str = None) -> PolicyFunc:
     """
 
     def policy(trace: Trace) -> Decision:
-        error_spans = [span for span in trace.spans if span.status == SpanStatus.ERROR]
+        error_spans = trace.error_spans()
 
         if error_spans:
             first_error = error_spans[0]
@@ -97,9 +93,7 @@ def assert_span_order(span_names: List[str], reason: str = None) -> PolicyFunc:
     """
 
     def policy(trace: Trace) -> Decision:
-        span_name_sequence = [span.name for span in trace.spans]
-
-        it = iter(span_name_sequence)
+        it = iter(trace.span_names())
         if all(name in it for name in span_names):
             return ALLOW
         else:
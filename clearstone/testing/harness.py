@@ -1,12 +1,25 @@
-import json
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from clearstone.core.actions import ActionType, Decision
 from clearstone.observability.models import Span, Trace
+from clearstone.storage.sqlite import _load_attributes, _load_snapshot
 from clearstone.utils.telemetry import get_telemetry_manager
 
+# Trace IDs bound per span query; SQLite builds before 3.32 allow at most 999
+# parameters per statement.
+_TRACE_IDS_PER_QUERY = 500
+
+# Columns read for each span, in the order `_row_to_span` unpacks them. Rows
+# are plain tuples: sqlite3.Row would cost a name lookup per column.
+_SPAN_COLUMNS = (
+    "span_id, trace_id, parent_span_id, name, kind, start_time_ns, end_time_ns, "
+    "status, attributes_json, input_snapshot_json, output_snapshot_json, "
+    "error_message, instrumentation_name, instrumentation_version"
+)
+
 
 @dataclass
 class PolicyTestResult:
@@ -38,38 +51,75 @@ class PolicyTestResult:
         }
 
 
+def _map_traces(
+    func: Callable[[Trace], Any], traces: List[Trace], max_workers: Optional[int]
+) -> Iterable[Any]:
+    """Applies func to each trace, on a thread pool if max_workers is given."""
+    if not max_workers or len(traces) < 2:
+        return map(func, traces)
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="clearstone-harness"
+    ) as executor:
+        return list(executor.map(func, traces))
+
+
 class PolicyTestHarness:
     """
     A tool for backtesting new governance policies against a database of
     historical execution traces.
+
+    The harness holds a database connection until `close()` is called; use it
+    as a context manager to close it promptly:
+
+        with PolicyTestHarness("agent_traces.db") as harness:
+            traces = harness.load_traces()
     """
 
     def __init__(self, trace_db_path: str):
         """Initializes the harness with a path to a Clearstone trace database."""
         self.db_path = trace_db_path
-        self._conn = sqlite3.connect(self.db_path)
+        # Only reads through this connection; the busy timeout makes it wait
+        # out a TraceStore write instead of failing.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA busy_timeout=5000;")
 
         get_telemetry_manager().record_event(
             "component_initialized", {"name": "PolicyTestHarness"}
         )
 
-    def _row_to_span(self, row: sqlite3.Row) -> Span:
-        """Converts a database row into a Span object."""
+    def _row_to_span(self, row: tuple) -> Span:
+        """Converts a row of `_SPAN_COLUMNS` into a Span object."""
+        (
+            span_id,
+            trace_id,
+            parent_span_id,
+            name,
+            kind,
+            start_time_ns,
+            end_time_ns,
+            status,
+            attributes_json,
+            input_snapshot_json,
+            output_snapshot_json,
+            error_message,
+            instrumentation_name,
+            instrumentation_version,
+        ) = row
         return Span(
-            span_id=row["span_id"],
-            trace_id=row["trace_id"],
-            parent_span_id=row["parent_span_id"],
-            name=row["name"],
-            kind=row["kind"],
-            start_time_ns=row["start_time_ns"],
-            end_time_ns=row["end_time_ns"],
-            status=row["status"],
-            attributes=json.loads(row["attributes_json"] or "{}"),
-            input_snapshot=json.loads(row["input_snapshot_json"] or "null"),
-            output_snapshot=json.loads(row["output_snapshot_json"] or "null"),
-            error_message=row["error_message"],
-            instrumentation_name=row["instrumentation_name"],
-            instrumentation_version=row["instrumentation_version"],
+            span_id=span_id,
+            trace_id=trace_id,
+            parent_span_id=parent_span_id,
+            name=name,
+            kind=kind,
+            start_time_ns=start_time_ns,
+            end_time_ns=end_time_ns,
+            status=status,
+            attributes=_load_attributes(attributes_json),
+            input_snapshot=_load_snapshot(input_snapshot_json),
+            output_snapshot=_load_snapshot(output_snapshot_json),
+            error_message=error_message,
+            instrumentation_name=instrumentation_name,
+            instrumentation_version=instrumentation_version,
         )
 
     def load_traces(self, limit: int = 100) -> List[Trace]:
@@ -79,22 +129,30 @@ class PolicyTestHarness:
         Args:
             limit: The maximum number of recent traces to load.
         """
-        self._conn.row_factory = sqlite3.Row
         cursor = self._conn.cursor()
 
         cursor.execute(
             "SELECT DISTINCT trace_id FROM spans ORDER BY start_time_ns DESC LIMIT ?",
             (limit,),
         )
-        trace_ids = [row["trace_id"] for row in cursor.fetchall()]
-
-        traces = []
-        for trace_id in trace_ids:
+        trace_ids = [row[0] for row in cursor.fetchall()]
+
+        # One query per chunk of trace IDs, kept below SQLite's limit on
+        # bound parameters, instead of one query per trace.
+        spans_by_trace: Dict[str, List[Span]] = {trace_id: [] for trace_id in trace_ids}
+        for start in range(0, len(trace_ids), _TRACE_IDS_PER_QUERY):
+            chunk = trace_ids[start : start + _TRACE_IDS_PER_QUERY]
+            placeholders = ",".join("?" * len(chunk))
             cursor.execute(
-                "SELECT * FROM spans WHERE trace_id = ? ORDER BY start_time_ns ASC",
-                (trace_id,),
+                f"SELECT {_SPAN_COLUMNS} FROM spans WHERE trace_id IN ({placeholders}) "
+                "ORDER BY start_time_ns ASC",
+                chunk,
             )
-            spans = [self._row_to_span(row) for row in cursor.fetchall()]
+            for row in cursor:
+                spans_by_trace[row[1]].append(self._row_to_span(row))
+
+        traces = []
+        for trace_id, spans in spans_by_trace.items():
             if spans:
                 traces.append(
                     Trace(
@@ -110,7 +168,10 @@ class PolicyTestHarness:
         return traces
 
     def simulate_policy(
-        self, policy: Callable[[Trace], Decision], traces: List[Trace]
+        self,
+        policy: Callable[[Trace], Decision],
+        traces: List[Trace],
+        max_workers: Optional[int] = None,
     ) -> PolicyTestResult:
         """
         Simulates the impact of a trace-level policy against a set of historical traces.
@@ -118,6 +179,10 @@ class PolicyTestHarness:
         Args:
             policy: A policy function that takes a Trace and returns a Decision.
             traces: A list of Trace objects to test against.
+            max_workers: If given, traces are evaluated concurrently on a pool
+                         of this many threads. This speeds up policies that
+                         wait on I/O; pure-Python policies gain nothing, since
+                         they hold the GIL. The policy must be thread-safe.
 
         Returns:
             A PolicyTestResult object with a full report of the simulation.
@@ -129,8 +194,7 @@ class PolicyTestHarness:
             spans_analyzed=sum(len(t.spans) for t in traces),
         )
 
-        for trace in traces:
-            decision = policy(trace)
+        for trace, decision in zip(traces, _map_traces(policy, traces, max_workers)):
             result.decisions[decision.action] += 1
 
             if decision.is_block():
@@ -139,7 +203,10 @@ class PolicyTestHarness:
         return result
 
     def simulate_span_policy(
-        self, policy: Callable[[Span], Decision], traces: List[Trace]
+        self,
+        policy: Callable[[Span], Decision],
+        traces: List[Trace],
+        max_workers: Optional[int] = None,
     ) -> PolicyTestResult:
         """
         Simulates the impact of a span-level policy against a set of historical traces.
@@ -147,6 +214,9 @@ class PolicyTestHarness:
         Args:
             policy: A policy function that takes a Span and returns a Decision.
             traces: A list of Trace objects to test against.
+            max_workers: If given, the spans of different traces are evaluated
+                         concurrently on a pool of this many threads, as in
+                         `simulate_policy`.
 
         Returns:
             A PolicyTestResult object with a full report of the simulation.
@@ -158,11 +228,14 @@ class PolicyTestHarness:
             spans_analyzed=sum(len(t.spans) for t in traces),
         )
 
-        for trace in traces:
-            trace_was_blocked = False
-            for span in trace.spans:
-                decision = policy(span)
+        def evaluate_spans(trace: Trace) -> List[Decision]:
+            return [policy(span) for span in trace.spans]
 
+        for trace, decisions in zip(
+            traces, _map_traces(evaluate_spans, traces, max_workers)
+        ):
+            trace_was_blocked = False
+            for decision in decisions:
                 result.decisions[decision.action] += 1
 
                 if decision.is_block() and not trace_was_blocked:
@@ -171,7 +244,12 @@ class PolicyTestHarness:
 
         return result
 
-    def __del__(self):
-        """Ensure the database connection is closed when the object is destroyed."""
-        if self._conn:
-            self._conn.close()
+    def close(self):
+        """Closes the database connection. The harness cannot load traces afterwards."""
+        self._conn.close()
+
+    def __enter__(self) -> "PolicyTestHarness":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -4,11 +4,16 @@ Audit trail utilities for capturing and analyzing policy decisions.
 
 import csv
 import json
+from collections import Counter
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from clearstone.core.actions import ActionType, Decision
 from clearstone.core.context import PolicyContext
+from clearstone.utils.serialization import json_dumps
+
+_DECISION_KEY = itemgetter("decision")
 
 
 class AuditTrail:
@@ -54,6 +59,39 @@ class AuditTrail:
         }
         self._entries.append(entry)
 
+    def record_decisions(
+        self,
+        context: PolicyContext,
+        records: Iterable[Tuple[str, Decision, float, Optional[str]]],
+    ):
+        """
+        Records a batch of policy evaluation events for a single context.
+
+        All entries share one timestamp, taken when the batch is recorded.
+
+        Args:
+            context: The PolicyContext for this evaluation.
+            records: (policy_name, decision, latency_ms, error) tuples, as
+                     collected by the PolicyEngine during one evaluation.
+        """
+        timestamp = datetime.now(timezone.utc).isoformat()
+        user_id = context.user_id
+        agent_id = context.agent_id
+        request_id = context.request_id
+        self._entries.extend(
+            {
+                "timestamp": timestamp,
+                "policy_name": policy_name,
+                "decision": decision.action.value,
+                "reason": decision.reason,
+                "user_id": user_id,
+                "agent_id": agent_id,
+                "request_id": request_id,
+                "error": error,
+            }
+            for policy_name, decision, _, error in records
+        )
+
     def get_entries(self, limit: int = 0) -> List[Dict[str, Any]]:
         """
         Returns the recorded audit entries.
@@ -83,12 +121,10 @@ class AuditTrail:
         if total == 0:
             return {"total_decisions": 0, "blocks": 0, "alerts": 0, "block_rate": 0.0}
 
-        blocks = sum(
-            1 for e in self._entries if e["decision"] == ActionType.BLOCK.value
-        )
-        alerts = sum(
-            1 for e in self._entries if e["decision"] == ActionType.ALERT.value
-        )
+        # One pass over the entries, counted in C.
+        counts = Counter(map(_DECISION_KEY, self._entries))
+        blocks = counts[ActionType.BLOCK.value]
+        alerts = counts[ActionType.ALERT.value]
 
         return {
             "total_decisions": total,
@@ -99,17 +135,39 @@ class AuditTrail:
 
     def to_json(self, filepath: str, **kwargs):
         """
-        Exports the audit trail to a JSON file.
+        Exports the audit trail to a JSON file, as an array indented by two
+        spaces.
+
+        Without extra arguments the file is encoded in one call (with orjson
+        when it is installed); extra arguments select stdlib json.
 
         Args:
             filepath: Path to the output JSON file.
             **kwargs: Additional arguments passed to json.dump().
 
         Example:
-            audit.to_json("audit_log.json", indent=2)
+            audit.to_json("audit_log.json", sort_keys=True)
         """
+        if not kwargs:
+            with open(filepath, "wb") as f:
+                f.write(json_dumps(self._entries, indent=True))
+            return
+        kwargs.setdefault("indent", 2)
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(self._entries, f, indent=2, **kwargs)
+            json.dump(self._entries, f, **kwargs)
+
+    def to_jsonl(self, filepath: str):
+        """
+        Exports the audit trail to a JSON Lines file: one entry per line,
+        encoded and written one at a time.
+
+        Args:
+            filepath: Path to the output file.
+        """
+        with open(filepath, "wb") as f:
+            for entry in self._entries:
+                f.write(json_dumps(entry))
+                f.write(b"\n")
 
     def to_csv(self, filepath: str, **kwargs):
         """
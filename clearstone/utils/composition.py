@@ -6,6 +6,7 @@ from typing import Callable
 
 from clearstone.core.actions import ALLOW, BLOCK, ActionType, Decision
 from clearstone.core.context import PolicyContext
+from clearstone.core.policy import _policy_args
 
 
 def compose_and(
@@ -34,8 +35,8 @@ def compose_and(
 
     def composed_and_policy(context: PolicyContext) -> Decision:
         for policy in policies:
-            decision = policy(context)
-            if decision.action == ActionType.BLOCK:
+            decision = policy(*_policy_args(policy, context))
+            if decision.action is ActionType.BLOCK:
                 return decision
         return ALLOW
 
@@ -73,8 +74,8 @@ def compose_or(
 
         block_decisions = []
         for policy in policies:
-            decision = policy(context)
-            if decision.action != ActionType.BLOCK:
+            decision = policy(*_policy_args(policy, context))
+            if decision.action is not ActionType.BLOCK:
                 return decision
             block_decisions.append(decision)
 
@@ -3,13 +3,32 @@ Policy debugging tools for tracing execution and understanding policy decisions.
 """
 
 import inspect
+import linecache
 import sys
-from typing import Any, Callable, Dict, List, Tuple
+from functools import lru_cache
+from types import CodeType
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
 
 from clearstone.core.actions import Decision
 from clearstone.core.context import PolicyContext
+from clearstone.core.policy import _policy_args
 from clearstone.utils.telemetry import get_telemetry_manager
 
+_IMMUTABLE_TYPES = frozenset((str, int, float, bool, type(None), bytes, complex))
+
+
+@lru_cache(maxsize=256)
+def _code_objects(code: CodeType) -> FrozenSet[CodeType]:
+    """Returns a code object with all code objects nested in it."""
+    found = {code}
+    stack = [code]
+    while stack:
+        for const in stack.pop().co_consts:
+            if isinstance(const, CodeType) and const not in found:
+                found.add(const)
+                stack.append(const)
+    return frozenset(found)
+
 
 class PolicyDebugger:
     """
@@ -36,6 +55,8 @@ class PolicyDebugger:
         the state of local variables at that line.
 
         This uses Python's `sys.settrace` for a robust, line-by-line trace.
+        Only the policy's own code is traced; functions it calls run without
+        line tracing.
 
         Args:
             policy: The policy function to debug.
@@ -52,32 +73,62 @@ class PolicyDebugger:
                 print(f"Line {event['line_no']}: {event['line_text']}")
         """
         trace_events = []
-
-        try:
-            lines, start_line = inspect.getsourcelines(policy)
-            end_line = start_line + len(lines)
-        except (TypeError, OSError):
-            lines, start_line, end_line = [], -1, -1
-
-        def tracer(frame, event, arg):
-            if event == "line" and start_line <= frame.f_lineno < end_line:
+        args = _policy_args(policy, context)
+
+        code = getattr(inspect.unwrap(policy), "__code__", None)
+        if code is None:
+            return policy(*args), trace_events
+        # linecache keeps each file's lines in memory, so looking up the text
+        # of a traced line is a list index.
+        lines = linecache.getlines(code.co_filename)
+        if not lines:
+            return policy(*args), trace_events
+        codes = _code_objects(code)
+
+        # repr() of immutable locals that are still the same object as on the
+        # previous line is reused; anything mutable is rendered again.
+        reprs: Dict[str, Tuple[Any, str]] = {}
+
+        def render_locals(frame) -> Dict[str, str]:
+            rendered = {}
+            for k, v in frame.f_locals.items():
+                if k.startswith("__"):
+                    continue
+                cached = reprs.get(k)
+                if cached is not None and cached[0] is v:
+                    rendered[k] = cached[1]
+                    continue
+                text = rendered[k] = repr(v)
+                if type(v) in _IMMUTABLE_TYPES:
+                    reprs[k] = (v, text)
+                else:
+                    reprs.pop(k, None)
+            return rendered
+
+        def trace_lines(frame, event, arg):
+            if event == "line":
+                line_no = frame.f_lineno
                 trace_events.append(
                     {
-                        "line_no": frame.f_lineno,
-                        "line_text": lines[frame.f_lineno - start_line].strip(),
-                        "locals": {
-                            k: repr(v)
-                            for k, v in frame.f_locals.items()
-                            if not k.startswith("__")
-                        },
+                        "line_no": line_no,
+                        "line_text": (
+                            lines[line_no - 1].strip() if line_no <= len(lines) else ""
+                        ),
+                        "locals": render_locals(frame),
                     }
                 )
-            return tracer
+            return trace_lines
+
+        def tracer(frame, event, arg):
+            # Only the policy's own frames (and functions defined inside it)
+            # get a local tracer; returning None for every other frame keeps
+            # CPython from reporting their line events at all.
+            return trace_lines if frame.f_code in codes else None
 
         original_trace = sys.gettrace()
         sys.settrace(tracer)
         try:
-            final_decision = policy(context)
+            final_decision = policy(*args)
         finally:
             sys.settrace(original_trace)
 
@@ -101,12 +152,18 @@ class PolicyDebugger:
             formatted = debugger.format_trace(my_policy, decision, trace)
             print(formatted)
         """
-        output = f"--- Policy Debug Trace for '{policy.__name__}' ---\n"
-        output += f"Final Decision: {decision.action.value.upper()}\n"
-        output += f"Final Reason: {decision.reason or 'N/A'}\n\n"
-        output += "Execution Path:\n"
+        parts = [
+            f"--- Policy Debug Trace for '{policy.__name__}' ---\n",
+            f"Final Decision: {decision.action.value.upper()}\n",
+            f"Final Reason: {decision.reason or 'N/A'}\n\n",
+            "Execution Path:\n",
+        ]
         if not trace:
-            output += "  (No trace available for this function, it might be a built-in or C-extension).\n"
+            parts.append(
+                "  (No trace available for this function, it might be a built-in or C-extension).\n"
+            )
         for event in trace:
-            output += f"  L{event['line_no']:<3} | {event['line_text']:<60} | Locals: {event['locals']}\n"
-        return output
+            parts.append(
+                f"  L{event['line_no']:<3} | {event['line_text']:<60} | Locals: {event['locals']}\n"
+            )
+        return "".join(parts)
@@ -47,12 +47,12 @@ class InterventionClient:
         """
         with _lock:
             intervention = _pending_interventions.get(intervention_id)
-            if not intervention:
-                print(
-                    f"Warning: Intervention ID '{intervention_id}' not found.",
-                    file=sys.stderr,
-                )
-                return False
+        if not intervention:
+            print(
+                f"Warning: Intervention ID '{intervention_id}' not found.",
+                file=sys.stderr,
+            )
+            return False
 
         prompt = (
             prompt or f"Approve action for intervention '{intervention_id}'? (yes/no): "
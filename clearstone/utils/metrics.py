@@ -2,69 +2,126 @@
 Policy performance and decision metrics collector.
 """
 
+import heapq
 from collections import defaultdict
-from typing import Any, Dict, List
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from clearstone.core.actions import ActionType, Decision
 
 
+class _Stats:
+    """
+    Running counters of one policy. Fields can also be read by subscript
+    (`stats["eval_count"]`), as when they were stored in plain dicts.
+    """
+
+    __slots__ = (
+        "eval_count",
+        "block_count",
+        "alert_count",
+        "total_latency_ms",
+        "avg_latency_ms",
+    )
+
+    def __init__(self):
+        self.eval_count = 0
+        self.block_count = 0
+        self.alert_count = 0
+        self.total_latency_ms = 0.0
+        self.avg_latency_ms = 0.0
+
+    def __getitem__(self, field: str) -> Any:
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+
 class PolicyMetrics:
     """
     A simple, in-memory collector for policy performance and decision metrics.
     This class is zero-dependency and designed for local-first analysis.
+
+    Args:
+        enabled: If False, recording is a no-op and a PolicyEngine using this
+                 instance skips timing its policies entirely.
     """
 
-    def __init__(self):
-        self.stats: Dict[str, Dict[str, Any]] = defaultdict(
-            lambda: {
-                "eval_count": 0,
-                "block_count": 0,
-                "alert_count": 0,
-                "total_latency_ms": 0.0,
-            }
-        )
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stats: Dict[str, _Stats] = defaultdict(_Stats)
 
     def record(self, policy_name: str, decision: Decision, latency_ms: float):
         """Records a single policy evaluation event."""
+        if not self.enabled:
+            return
         s = self.stats[policy_name]
-        s["eval_count"] += 1
-        s["total_latency_ms"] += latency_ms
+        s.eval_count += 1
+        s.total_latency_ms += latency_ms
+        s.avg_latency_ms += (latency_ms - s.avg_latency_ms) / s.eval_count
 
-        if decision.action == ActionType.BLOCK:
-            s["block_count"] += 1
-        elif decision.action == ActionType.ALERT:
-            s["alert_count"] += 1
+        if decision.action is ActionType.BLOCK:
+            s.block_count += 1
+        elif decision.action is ActionType.ALERT:
+            s.alert_count += 1
+
+    def record_bulk(
+        self, records: Iterable[Tuple[str, Decision, float, Optional[str]]]
+    ):
+        """
+        Records a batch of policy evaluation events.
+
+        Args:
+            records: (policy_name, decision, latency_ms, error) tuples, as
+                     collected by the PolicyEngine during one evaluation.
+        """
+        if not self.enabled:
+            return
+
+        stats = self.stats
+        block, alert = ActionType.BLOCK, ActionType.ALERT
+        for policy_name, decision, latency_ms, _ in records:
+            s = stats[policy_name]
+            s.eval_count += 1
+            s.total_latency_ms += latency_ms
+            s.avg_latency_ms += (latency_ms - s.avg_latency_ms) / s.eval_count
+
+            action = decision.action
+            if action is block:
+                s.block_count += 1
+            elif action is alert:
+                s.alert_count += 1
+
+    @staticmethod
+    def _summarize(data: _Stats) -> Dict[str, Any]:
+        """Builds the summary entry of one policy from its running stats."""
+        return {
+            "eval_count": data.eval_count,
+            "block_count": data.block_count,
+            "alert_count": data.alert_count,
+            "avg_latency_ms": round(data.avg_latency_ms, 4),
+        }
 
     def summary(self) -> Dict[str, Dict[str, Any]]:
         """
-        Returns a summary of all collected metrics, calculating averages.
+        Returns a summary of all collected metrics, including average latencies.
         """
-        summary_data = {}
-        for name, data in self.stats.items():
-            eval_count = data["eval_count"]
-            avg_latency = (
-                (data["total_latency_ms"] / eval_count) if eval_count > 0 else 0
-            )
-            summary_data[name] = {
-                "eval_count": eval_count,
-                "block_count": data["block_count"],
-                "alert_count": data["alert_count"],
-                "avg_latency_ms": round(avg_latency, 4),
-            }
-        return summary_data
+        summarize = self._summarize
+        return {name: summarize(data) for name, data in self.stats.items()}
+
+    def _top(self, top_n: int, field: str) -> List[tuple]:
+        """Returns the summaries of the top N policies by a stats field."""
+        get_field = attrgetter(field)
+        top = heapq.nlargest(
+            top_n, self.stats.items(), key=lambda item: get_field(item[1])
+        )
+        return [(name, self._summarize(data)) for name, data in top]
 
     def get_slowest_policies(self, top_n: int = 5) -> List[tuple]:
         """Returns the top N policies sorted by average latency."""
-        summary = self.summary()
-        sorted_policies = sorted(
-            summary.items(), key=lambda item: item[1]["avg_latency_ms"], reverse=True
-        )
-        return sorted_policies[:top_n]
+        return self._top(top_n, "avg_latency_ms")
 
     def get_top_blocking_policies(self, top_n: int = 5) -> List[tuple]:
         """Returns the top N policies that blocked most often."""
-        summary = self.summary()
-        sorted_policies = sorted(
-            summary.items(), key=lambda item: item[1]["block_count"], reverse=True
-        )
-        return sorted_policies[:top_n]
+        return self._top(top_n, "block_count")
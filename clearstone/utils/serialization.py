@@ -1 +1,205 @@
 # clearstone/utils/serialization.py
+
+"""
+Fast JSON encoding helpers shared by the persistence code.
+
+orjson is used when it is installed and stdlib json otherwise. Both paths
+produce equivalent JSON, and pydantic models are encoded straight from their
+field values instead of going through `model_dump(mode="json")` first. Values
+orjson cannot represent (integers beyond 64 bits, NaN and infinities) are
+encoded by stdlib json instead, as they always were.
+"""
+
+import json
+import math
+import re
+from datetime import date, datetime
+from typing import Any, Union
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+    if orjson is not None
+    else 0
+)
+
+# orjson parses integers outside [-2**63, 2**64 - 1] as floats. Documents with
+# a number that may be one (20+ digits, or a 19-digit negative; possibly inside
+# a string) are parsed by stdlib json. 19-digit ns timestamps stay on orjson.
+_find_long_digits = re.compile(rb"-[0-9]{19}|[0-9]{20}").search
+_find_long_digits_str = re.compile(r"-[0-9]{19}|[0-9]{20}").search
+
+# json_dumps_native encodes exactly the values that decode back unchanged (up
+# to tuples becoming lists), with the same limits under either backend: ints
+# must fit orjson's 64-bit range, and nesting is capped at orjson's depth.
+_NATIVE_INT_MIN, _NATIVE_INT_MAX = -(2**63), 2**64 - 1
+_NATIVE_MAX_DEPTH = 254
+_NATIVE_LEAF_TYPES = frozenset((str, bool, type(None)))
+
+
+def _check_native(obj: Any) -> None:
+    """
+    Raises TypeError unless obj consists only of dicts with str keys, lists,
+    tuples, strs, in-range ints, finite floats, bools and None, all of exactly
+    those types. Enum members, UUIDs and other subclasses or look-alikes that
+    a backend would silently convert are rejected.
+    """
+    leaf_types = _NATIVE_LEAF_TYPES
+    isfinite = math.isfinite
+    # Leaves are checked in place; only containers go on the stack.
+    stack = [(obj, 0)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        container, depth = pop()
+        cls = type(container)
+        if cls is dict:
+            for key in container:
+                if type(key) is not str:
+                    raise TypeError("Dict key must be str")
+            items = container.values()
+        elif cls is list or cls is tuple:
+            items = container
+        else:
+            items = (container,)
+            depth -= 1
+        depth += 1
+        for item in items:
+            cls = type(item)
+            if cls in leaf_types:
+                continue
+            if cls is float:
+                if not isfinite(item):
+                    raise TypeError(f"Non-finite float {item!r} is not JSON native")
+            elif cls is int:
+                if not _NATIVE_INT_MIN <= item <= _NATIVE_INT_MAX:
+                    raise TypeError("Integer exceeds 64-bit range")
+            elif cls is dict or cls is list or cls is tuple:
+                if depth >= _NATIVE_MAX_DEPTH:
+                    raise TypeError("Recursion limit reached")
+                push((item, depth))
+            else:
+                raise TypeError(f"Type is not JSON native: {cls.__name__}")
+
+
+def _json_default(obj: Any) -> Any:
+    """Encodes the objects the JSON backends do not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return to_jsonable_python(obj)
+
+
+def _contains_non_finite(obj: Any) -> bool:
+    """
+    Returns True if a NaN or infinite float occurs in obj, looking through
+    dicts, lists, tuples and pydantic models.
+    """
+    isfinite = math.isfinite
+    stack = [obj]
+    seen = set()
+    while stack:
+        item = stack.pop()
+        cls = type(item)
+        if cls is float:
+            if not isfinite(item):
+                return True
+            continue
+        if isinstance(item, BaseModel):
+            item = item.__dict__
+        elif not isinstance(item, (dict, list, tuple)):
+            continue
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        stack.extend(item.values() if isinstance(item, dict) else item)
+    return False
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serializes an object to UTF-8 encoded JSON bytes.
+
+    Args:
+        obj: The object to encode. May contain pydantic models, datetimes,
+             enums and anything else pydantic can render as JSON.
+        indent: If True, the document is pretty-printed with two-space
+                indentation.
+
+    Returns:
+        The encoded JSON document.
+    """
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        try:
+            data = orjson.dumps(obj, default=_json_default, option=option)
+        except TypeError:
+            # E.g. an integer beyond 64 bits; stdlib json encodes it exactly.
+            pass
+        else:
+            # orjson writes NaN and infinities as null; only documents with a
+            # null can hold one, and those are re-encoded to keep the value.
+            if b"null" not in data or not _contains_non_finite(obj):
+                return data
+    return json.dumps(obj, default=_json_default, indent=2 if indent else None).encode(
+        "utf-8"
+    )
+
+
+def json_dumps_native(obj: Any) -> bytes:
+    """
+    Serializes an object made only of JSON-native values to JSON bytes.
+
+    Unlike `json_dumps`, nothing is converted: dicts with str keys, lists,
+    tuples, strings, integers within 64 bits, finite floats, booleans and
+    None are encoded, and anything else raises. Values are checked by exact
+    type, so the result decodes back to an equal object (with tuples as
+    lists), and both backends accept and reject exactly the same objects.
+
+    Args:
+        obj: The object to encode.
+
+    Returns:
+        The encoded JSON document.
+
+    Raises:
+        TypeError: If the object contains a value JSON cannot represent
+                   exactly, or is nested more than 254 levels deep.
+    """
+    _check_native(obj)
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def json_loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Parses a JSON document.
+
+    Args:
+        data: The encoded document. Buffers such as memoryview slices are
+              accepted without an intermediate copy when orjson is available.
+              NaN and Infinity tokens, as written by `json_dumps`, are read
+              back as floats, and integers beyond 64 bits exactly.
+
+    Returns:
+        The decoded Python object.
+    """
+    long_digits = _find_long_digits_str if isinstance(data, str) else _find_long_digits
+    if orjson is not None and long_digits(data) is None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity; stdlib json accepts them (and
+            # raises the same exception type for truly invalid documents).
+            pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
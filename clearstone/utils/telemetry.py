@@ -2,16 +2,23 @@
 
 import json
 import os
-import platform
+import queue
 import sys
 import threading
 import uuid
 from pathlib import Path
 from threading import Lock
-from typing import Any, Dict, Optional
-from urllib import request
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+# http.client (which loads ssl and the email package) and platform are only
+# imported once an event is actually recorded, so importing the SDK with
+# telemetry disabled does not pay for them.
+if TYPE_CHECKING:
+    import http.client
 
 TELEMETRY_ENDPOINT = "https://muddy-bread-02e3.telemetry-clearstone.workers.dev/event"
+# Events waiting to be sent; further events are dropped while it is full.
+_MAX_PENDING_EVENTS = 1024
 CONFIG_DIR = Path.home() / ".clearstone"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 SESSION_ID = f"sess_{uuid.uuid4().hex}"
@@ -28,8 +35,12 @@ class TelemetryManager:
     def __init__(self):
         self.is_enabled = self._check_if_enabled()
         self.anonymous_id = self._get_or_create_anonymous_id()
-        self._queue = []
+        # Events are handed to a single sender thread, started on the first
+        # event, which keeps its HTTPS connection open between events.
+        self._queue = queue.Queue(maxsize=_MAX_PENDING_EVENTS)
         self._lock = threading.Lock()
+        self._sender: Optional[threading.Thread] = None
+        self._connection: Optional["http.client.HTTPSConnection"] = None
 
         if self.is_enabled:
             self._show_consent_message()
@@ -100,6 +111,8 @@ class TelemetryManager:
         if not self.is_enabled:
             return
 
+        import platform
+
         sdk_version = "1.0.0"
 
         full_payload = {
@@ -112,23 +125,51 @@ class TelemetryManager:
             "payload": payload,
         }
 
-        thread = threading.Thread(
-            target=self._send_event, args=(full_payload,), daemon=True
-        )
-        thread.start()
+        if self._sender is None:
+            self._start_sender()
+        try:
+            self._queue.put_nowait(full_payload)
+        except queue.Full:
+            pass
+
+    def _start_sender(self):
+        """Starts the sender thread unless another caller already has."""
+        with self._lock:
+            if self._sender is None:
+                self._sender = threading.Thread(
+                    target=self._run_sender, name="clearstone-telemetry", daemon=True
+                )
+                self._sender.start()
+
+    def _run_sender(self):
+        """The sender thread: sends queued events one at a time, forever."""
+        while True:
+            self._send_event(self._queue.get())
 
     def _send_event(self, data: Dict[str, Any]):
         """The actual network call. Must never crash the user's application."""
         try:
+            import http.client
+            from urllib.parse import urlsplit
+
             json_data = json.dumps(data).encode("utf-8")
-            req = request.Request(
-                TELEMETRY_ENDPOINT,
-                data=json_data,
+            endpoint = urlsplit(TELEMETRY_ENDPOINT)
+            if self._connection is None:
+                self._connection = http.client.HTTPSConnection(
+                    endpoint.netloc, timeout=2
+                )
+            self._connection.request(
+                "POST",
+                endpoint.path,
+                body=json_data,
                 headers={"Content-Type": "application/json"},
             )
-            request.urlopen(req, timeout=2)
+            self._connection.getresponse().read()
         except Exception:
-            pass
+            # Reconnect on the next event.
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
 
 
 _telemetry_manager: Optional[TelemetryManager] = None
@@ -138,7 +179,8 @@ _manager_lock = Lock()
 def get_telemetry_manager() -> TelemetryManager:
     """Gets the global singleton TelemetryManager instance."""
     global _telemetry_manager
-    with _manager_lock:
-        if _telemetry_manager is None:
-            _telemetry_manager = TelemetryManager()
-        return _telemetry_manager
+    if _telemetry_manager is None:
+        with _manager_lock:
+            if _telemetry_manager is None:
+                _telemetry_manager = TelemetryManager()
+    return _telemetry_manager
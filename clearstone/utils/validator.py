@@ -5,14 +5,39 @@ This module provides utilities to validate that policies are safe, performant,
 and deterministic before deploying them to production.
 """
 
-import timeit
+import gc
+import time
 from typing import Callable, List
 
 from clearstone.core.actions import Decision
 from clearstone.core.context import PolicyContext, create_context
+from clearstone.core.policy import _policy_args
 from clearstone.utils.telemetry import get_telemetry_manager
 
 
+def _time_calls(policy: Callable, context: PolicyContext, num_runs: int) -> int:
+    """
+    Returns the nanoseconds `num_runs` calls of `policy(context)` take.
+
+    The policy is called directly from the loop, with no wrapper function,
+    so nothing but the policy is measured. The `view` of a policy declaring
+    `reads` is built once up front, as PolicyEngine builds it outside the
+    policy call. As with timeit, garbage
+    collection is paused while timing.
+    """
+    args = _policy_args(policy, context)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter_ns()
+        for _ in range(num_runs):
+            policy(*args)
+        return time.perf_counter_ns() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
 class PolicyValidationError(AssertionError):
     """Custom exception for policy validation failures."""
 
@@ -66,9 +91,10 @@ class PolicyValidator:
             PolicyValidationError: If the policy produces different decisions for the same context.
         """
         try:
-            first_decision = policy(self._default_context)
+            args = _policy_args(policy, self._default_context)
+            first_decision = policy(*args)
             for i in range(num_runs - 1):
-                next_decision = policy(self._default_context)
+                next_decision = policy(*args)
                 if first_decision != next_decision:
                     raise PolicyValidationError(
                         f"Policy '{policy.__name__}' is non-deterministic. "
@@ -101,9 +127,9 @@ class PolicyValidator:
             PolicyValidationError: If the policy's average execution time exceeds the threshold.
         """
         try:
-            timer = timeit.Timer(lambda: policy(self._default_context))
-            total_time_s = timer.timeit(number=num_runs)
-            avg_latency_ms = (total_time_s / num_runs) * 1000
+            avg_latency_ms = _time_calls(policy, self._default_context, num_runs) / (
+                num_runs * 1_000_000
+            )
 
             if avg_latency_ms > max_latency_ms:
                 raise PolicyValidationError(
@@ -133,7 +159,7 @@ class PolicyValidator:
         """
         empty_meta_context = create_context("user", "agent")
         try:
-            result = policy(empty_meta_context)
+            result = policy(*_policy_args(policy, empty_meta_context))
             if not isinstance(result, Decision):
                 raise TypeError(
                     f"Policy '{policy.__name__}' did not return a Decision object."
@@ -1,10 +1,18 @@
+import base64
+import json
+import math
+import os
+import pickle
+import threading
 from typing import List
 
 import pytest
 
 from clearstone.debugging.checkpoint import (
     Checkpoint,
+    CheckpointHeader,
     CheckpointManager,
+    CheckpointSchema,
     CheckpointSerializer,
 )
 from clearstone.observability.models import Span, Trace
@@ -128,6 +136,30 @@ def test_checkpoint_manager_load(checkpoint_manager, mock_trace):
     assert loaded_checkpoint.current_span.name == "child"
 
 
+def test_checkpoint_manager_keeps_values_orjson_cannot_encode(
+    checkpoint_manager, mock_trace
+):
+    """Test that big-int and NaN span attributes survive a checkpoint."""
+    parent, child = mock_trace.spans
+    parent.end_time_ns = 10
+    parent.attributes = {"big": 2**70, "ratio": float("nan")}
+    child.attributes = {"big": -(2**65)}
+
+    created = checkpoint_manager.create_checkpoint(
+        MockAgent(memory=[]), mock_trace, span_id="s2"
+    )
+    loaded = checkpoint_manager.load_checkpoint(
+        str(
+            checkpoint_manager.checkpoint_dir
+            / f"{created.trace_id}_{created.checkpoint_id}.ckpt"
+        )
+    )
+
+    assert loaded.upstream_spans[0].attributes["big"] == 2**70
+    assert math.isnan(loaded.upstream_spans[0].attributes["ratio"])
+    assert loaded.current_span.attributes["big"] == -(2**65)
+
+
 def test_checkpoint_manager_finds_upstream_spans(checkpoint_manager, mock_trace):
     """Test that the manager correctly identifies and includes parent spans."""
     agent = MockAgent(memory=[])
@@ -137,3 +169,411 @@ def test_checkpoint_manager_finds_upstream_spans(checkpoint_manager, mock_trace)
     assert len(checkpoint.upstream_spans) == 1
     assert checkpoint.upstream_spans[0].span_id == "s1"
     assert checkpoint.current_span.span_id == "s2"
+
+
+def _make_checkpoint(agent_state):
+    span = Span(
+        trace_id="t1",
+        span_id="s1",
+        name="test",
+        start_time_ns=1,
+        instrumentation_name="t",
+        instrumentation_version="1",
+    )
+    return Checkpoint(
+        trace_id="t1",
+        span_id="s1",
+        agent_class_path="tests.unit.debugging.test_checkpoint.MockAgent",
+        clearstone_version="0.1.0",
+        agent_state=agent_state,
+        current_span=span,
+    )
+
+
+def test_checkpoint_serializer_stores_agent_state_without_base64():
+    """Test that the framed format embeds the pickled agent state as raw bytes."""
+    state = {"blob": b"\x00\xff" * 1024}
+    checkpoint = _make_checkpoint(state)
+
+    data = CheckpointSerializer.serialize(checkpoint)
+
+    assert data.startswith(b"CSCK")
+    assert pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL) in data
+    assert CheckpointSerializer.deserialize(data).agent_state == state
+
+
+def test_checkpoint_serializer_reads_legacy_json_format():
+    """Test that checkpoints written as a single JSON document still load."""
+    checkpoint = _make_checkpoint({"memory": ["old"]})
+    legacy = json.dumps(
+        {
+            "metadata": {
+                "checkpoint_id": checkpoint.checkpoint_id,
+                "trace_id": checkpoint.trace_id,
+                "span_id": checkpoint.span_id,
+                "timestamp_ns": checkpoint.timestamp_ns,
+                "agent_class_path": checkpoint.agent_class_path,
+                "python_version": checkpoint.python_version,
+                "clearstone_version": checkpoint.clearstone_version,
+            },
+            "current_span": checkpoint.current_span.model_dump(mode="json"),
+            "upstream_spans": [],
+            "agent_state_pickle_b64": base64.b64encode(
+                pickle.dumps(checkpoint.agent_state)
+            ).decode("utf-8"),
+        }
+    ).encode("utf-8")
+
+    loaded = CheckpointSerializer.deserialize(legacy)
+
+    assert loaded.checkpoint_id == checkpoint.checkpoint_id
+    assert loaded.agent_state == {"memory": ["old"]}
+
+
+def test_checkpoint_serializer_writes_large_buffers_out_of_band():
+    """Test that numpy arrays in the agent state round-trip as separate sections."""
+    np = pytest.importorskip("numpy")
+    weights = np.arange(4096, dtype=np.float64)
+    checkpoint = _make_checkpoint({"weights": weights})
+
+    data = CheckpointSerializer.serialize(checkpoint)
+
+    assert weights.tobytes() in data
+    for source in (data, bytearray(data)):
+        restored = CheckpointSerializer.deserialize(source).agent_state["weights"]
+        assert np.array_equal(restored, weights)
+        assert restored.flags.writeable
+
+
+def test_checkpoint_manager_load_maps_out_of_band_buffers(checkpoint_manager, tmp_path):
+    """Test that buffers loaded from a mapped checkpoint file are usable and writable."""
+    np = pytest.importorskip("numpy")
+    checkpoint = _make_checkpoint({"weights": np.ones(1024)})
+    filepath = tmp_path / "weights.ckpt"
+    filepath.write_bytes(CheckpointSerializer.serialize(checkpoint))
+
+    weights = checkpoint_manager.load_checkpoint(str(filepath)).agent_state["weights"]
+    weights[0] = 5.0
+
+    assert weights.sum() == 1028.0
+    assert (
+        CheckpointSerializer.deserialize(filepath.read_bytes()).agent_state["weights"][
+            0
+        ]
+        == 1.0
+    )
+
+
+def test_checkpoint_manager_load_rejects_empty_file(checkpoint_manager, tmp_path):
+    """Test that an empty checkpoint file raises a clear error."""
+    filepath = tmp_path / "empty.ckpt"
+    filepath.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="empty"):
+        checkpoint_manager.load_checkpoint(str(filepath))
+
+
+def test_checkpoint_manager_batch_appends_to_one_log(checkpoint_manager, mock_trace):
+    """Test that batched checkpoints share one log file and load via its index."""
+    checkpoint_manager.begin_batch()
+    first = checkpoint_manager.create_checkpoint(
+        MockAgent(memory=["one"]), mock_trace, span_id="s1"
+    )
+    second = checkpoint_manager.create_checkpoint(
+        MockAgent(memory=["two"]), mock_trace, span_id="s2"
+    )
+    checkpoint_manager.commit_batch()
+
+    log_path = checkpoint_manager.checkpoint_dir / "t1.ckptlog"
+    assert sorted(p.name for p in checkpoint_manager.checkpoint_dir.iterdir()) == [
+        "t1.ckptlog",
+        "t1.idx",
+    ]
+
+    loaded = checkpoint_manager.load_checkpoint(str(log_path), second.checkpoint_id)
+    assert loaded.agent_state["memory"] == ["two"]
+    loaded = checkpoint_manager.load_checkpoint(str(log_path), first.checkpoint_id)
+    assert loaded.span_id == "s1"
+
+
+def test_checkpoint_manager_batch_writes_queued_records_together(
+    checkpoint_manager, mock_trace, monkeypatch
+):
+    """Test that a batch's records are written in one writev at commit time."""
+    if not hasattr(os, "writev"):
+        pytest.skip("os.writev is not available on this platform")
+    real_writev = os.writev
+    calls = []
+
+    def counting_writev(fd, buffers):
+        calls.append(len(buffers))
+        return real_writev(fd, buffers)
+
+    monkeypatch.setattr(os, "writev", counting_writev)
+    agent = MockAgent(memory=["one"])
+    checkpoint_manager.begin_batch()
+    first = checkpoint_manager.create_checkpoint(agent, mock_trace, span_id="s1")
+    agent.memory.append("two")
+    second = checkpoint_manager.create_checkpoint(agent, mock_trace, span_id="s2")
+    assert calls == []
+    checkpoint_manager.commit_batch()
+
+    assert len(calls) == 1
+    log_path = str(checkpoint_manager.checkpoint_dir / "t1.ckptlog")
+    loaded = checkpoint_manager.load_checkpoint(log_path, first.checkpoint_id)
+    assert loaded.agent_state["memory"] == ["one"]
+    loaded = checkpoint_manager.load_checkpoint(log_path, second.checkpoint_id)
+    assert loaded.agent_state["memory"] == ["one", "two"]
+
+
+def test_checkpoint_manager_batch_flush_every_indexes_early(
+    checkpoint_manager, mock_trace
+):
+    """Test that flush_every syncs and indexes before the batch is committed."""
+    checkpoint_manager.begin_batch(flush_every=1)
+    checkpoint = checkpoint_manager.create_checkpoint(
+        MockAgent(memory=["early"]), mock_trace, span_id="s2"
+    )
+
+    log_path = checkpoint_manager.checkpoint_dir / "t1.ckptlog"
+    loaded = checkpoint_manager.load_checkpoint(str(log_path), checkpoint.checkpoint_id)
+    assert loaded.agent_state["memory"] == ["early"]
+
+    checkpoint_manager.commit_batch()
+    with pytest.raises(RuntimeError):
+        checkpoint_manager.commit_batch()
+    with pytest.raises(ValueError, match="not committed"):
+        checkpoint_manager.load_checkpoint(str(log_path), "ckpt_missing")
+
+
+def test_checkpoint_manager_releases_written_pages(
+    checkpoint_manager, mock_trace, monkeypatch
+):
+    """Test that saved checkpoints are hinted out of the page cache."""
+    calls = []
+    monkeypatch.setattr(
+        os, "posix_fadvise", lambda *args: calls.append(args), raising=False
+    )
+    monkeypatch.setattr(os, "POSIX_FADV_DONTNEED", 4, raising=False)
+
+    checkpoint_manager.create_checkpoint(MockAgent(memory=[]), mock_trace, "s2")
+
+    assert len(calls) == 1
+    assert calls[0][1:] == (0, 0, 4)
+
+
+def test_checkpoint_manager_saves_with_one_writev_retrying_short_writes(
+    checkpoint_manager, mock_trace, monkeypatch
+):
+    """Test that sections are written with writev and short writes are resumed."""
+    if not hasattr(os, "writev"):
+        pytest.skip("os.writev is not available on this platform")
+    real_writev = os.writev
+    calls = []
+
+    def short_writev(fd, buffers):
+        calls.append(len(buffers))
+        # Write at most 10 bytes per call to force resuming mid-buffer.
+        return real_writev(fd, [bytes(memoryview(b"".join(buffers))[:10])])
+
+    monkeypatch.setattr(os, "writev", short_writev)
+    checkpoint = checkpoint_manager.create_checkpoint(
+        MockAgent(memory=["a", "b"]), mock_trace, "s2"
+    )
+
+    assert calls[0] > 1
+    filepath = checkpoint_manager.checkpoint_dir / (
+        f"{checkpoint.trace_id}_{checkpoint.checkpoint_id}.ckpt"
+    )
+    loaded = checkpoint_manager.load_checkpoint(str(filepath))
+    assert loaded.agent_state == {"memory": ["a", "b"]}
+
+
+def _unsupported_sysconf(name):
+    raise ValueError(f"unrecognized configuration name: {name}")
+
+
+@pytest.mark.parametrize("sysconf", [lambda name: -1, _unsupported_sysconf, None])
+def test_iov_max_falls_back_when_sysconf_is_unusable(monkeypatch, sysconf):
+    """Test that an unknown or unsupported SC_IOV_MAX falls back to 1024."""
+    from clearstone.debugging import checkpoint as checkpoint_module
+
+    if sysconf is None:
+        monkeypatch.delattr(os, "sysconf", raising=False)
+    else:
+        monkeypatch.setattr(os, "sysconf", sysconf)
+
+    assert checkpoint_module._iov_max() == 1024
+
+
+def test_checkpoint_serializer_serialize_buffers_matches_serialize():
+    """Test that the unjoined buffers concatenate to the serialized checkpoint."""
+    checkpoint = _make_checkpoint({"memory": ["x"]})
+    buffers = CheckpointSerializer.serialize_buffers(checkpoint)
+    assert b"".join(buffers) == CheckpointSerializer.serialize(checkpoint)
+
+
+@pytest.mark.parametrize("compression", ["zlib", "blosc2"])
+def test_checkpoint_serializer_compresses_agent_state(compression):
+    """Test that compressed checkpoints are smaller and round-trip."""
+    np = pytest.importorskip("numpy")
+    if compression == "blosc2":
+        pytest.importorskip("blosc2")
+    state = {"weights": np.zeros(8192), "memory": ["a"] * 1000}
+    checkpoint = _make_checkpoint(state)
+
+    data = CheckpointSerializer.serialize(checkpoint, compression=compression)
+    restored = CheckpointSerializer.deserialize(data).agent_state
+
+    assert len(data) < len(CheckpointSerializer.serialize(checkpoint)) // 4
+    assert np.array_equal(restored["weights"], state["weights"])
+    assert restored["weights"].flags.writeable
+    assert restored["memory"] == state["memory"]
+
+
+def test_checkpoint_serializer_rejects_unknown_compression():
+    """Test that an unknown codec name raises a ValueError."""
+    with pytest.raises(ValueError, match="compression"):
+        CheckpointSerializer.serialize(_make_checkpoint({}), compression="lzma")
+
+
+def test_checkpoint_serializer_reuses_ended_span_encodings(mock_trace):
+    """Test that ended spans are encoded once and reused across checkpoints."""
+    from clearstone.debugging import checkpoint as checkpoint_module
+
+    CheckpointSerializer.clear_span_cache()
+    parent, child = mock_trace.spans
+    parent.end_time_ns = 10
+    checkpoint = _make_checkpoint({})
+    checkpoint.current_span = child
+    checkpoint.upstream_spans = [parent]
+
+    first = CheckpointSerializer.serialize(checkpoint)
+    assert list(checkpoint_module._span_json_cache) == [("t1", "s1", 10)]
+    second = CheckpointSerializer.serialize(checkpoint)
+
+    assert first == second
+    restored = CheckpointSerializer.deserialize(second)
+    assert restored.upstream_spans[0] == parent
+    assert restored.current_span == child
+
+    CheckpointSerializer.clear_span_cache("other-trace")
+    assert len(checkpoint_module._span_json_cache) == 1
+    CheckpointSerializer.clear_span_cache("t1")
+    assert not checkpoint_module._span_json_cache
+
+
+def test_checkpoint_span_cache_is_thread_safe(monkeypatch):
+    """Test that concurrent encoders keep the span cache bounded and intact."""
+    from clearstone.debugging import checkpoint as checkpoint_module
+
+    CheckpointSerializer.clear_span_cache()
+    monkeypatch.setattr(checkpoint_module, "_SPAN_JSON_CACHE_SIZE", 8)
+    errors = []
+
+    def encode(worker):
+        try:
+            for i in range(500):
+                span = Span(
+                    trace_id=f"t{worker}",
+                    span_id=f"s{i % 50}",
+                    name="n",
+                    start_time_ns=1,
+                    end_time_ns=2,
+                    instrumentation_name="t",
+                    instrumentation_version="1",
+                )
+                assert json.loads(checkpoint_module._encode_span(span))["span_id"] == (
+                    span.span_id
+                )
+                if i % 97 == 0:
+                    CheckpointSerializer.clear_span_cache(f"t{worker}")
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=encode, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(checkpoint_module._span_json_cache) <= 8
+    CheckpointSerializer.clear_span_cache()
+
+
+def test_checkpoint_manager_orders_deep_ancestors_root_first(checkpoint_manager):
+    """Test that upstream spans run from the root down to the direct parent."""
+    spans = [
+        Span(
+            trace_id="t1",
+            span_id=f"s{i}",
+            name=f"level{i}",
+            parent_span_id=f"s{i - 1}" if i else None,
+            start_time_ns=i + 1,
+            instrumentation_name="t",
+            instrumentation_version="1",
+        )
+        for i in range(5)
+    ]
+    trace = Trace(
+        trace_id="t1",
+        spans=spans,
+        root_span_id="s0",
+        agent_id="a1",
+        agent_version="v1",
+        environment="test",
+        start_time_ns=1,
+    )
+
+    checkpoint = checkpoint_manager.create_checkpoint(MockAgent([]), trace, "s4")
+
+    assert [s.span_id for s in checkpoint.upstream_spans] == ["s0", "s1", "s2", "s3"]
+
+
+def test_checkpoint_manager_load_header_skips_agent_state(
+    checkpoint_manager, mock_trace, monkeypatch
+):
+    """Test that full=False reads metadata and spans without unpickling."""
+    checkpoint = checkpoint_manager.create_checkpoint(
+        MockAgent(memory=["secret"]), mock_trace, "s2"
+    )
+    filepath = checkpoint_manager.checkpoint_dir / (
+        f"{checkpoint.trace_id}_{checkpoint.checkpoint_id}.ckpt"
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("agent state must not be unpickled")
+
+    monkeypatch.setattr(pickle, "loads", fail)
+    header = checkpoint_manager.load_checkpoint(str(filepath), full=False)
+
+    assert isinstance(header, CheckpointHeader)
+    assert header.checkpoint_id == checkpoint.checkpoint_id
+    assert header.agent_class_path == checkpoint.agent_class_path
+    assert header.current_span.span_id == "s2"
+    assert [s.span_id for s in header.upstream_spans] == ["s1"]
+
+
+def test_checkpoint_is_slotted_dataclass_with_defaults():
+    """Test that checkpoints fill in defaults without a per-instance dict."""
+    checkpoint = _make_checkpoint({"memory": []})
+
+    assert not hasattr(checkpoint, "__dict__")
+    assert checkpoint.checkpoint_id.startswith("ckpt_")
+    assert checkpoint.timestamp_ns > 0
+    assert checkpoint.python_version.count(".") == 1
+
+
+def test_checkpoint_serializer_strict_validates_against_schema():
+    """Test that strict deserialization validates against CheckpointSchema."""
+    checkpoint = _make_checkpoint({"memory": []})
+    data = CheckpointSerializer.serialize(checkpoint)
+    assert CheckpointSerializer.deserialize(data, strict=True) == checkpoint
+
+    checkpoint.agent_class_path = None
+    bad = CheckpointSerializer.serialize(checkpoint)
+    assert CheckpointSerializer.deserialize(bad).agent_class_path is None
+    with pytest.raises(ValueError):
+        CheckpointSerializer.deserialize(bad, strict=True)
+    assert "agent_class_path" in CheckpointSchema.model_fields
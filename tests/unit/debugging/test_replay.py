@@ -2,9 +2,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from clearstone.debugging.checkpoint import Checkpoint
-from clearstone.debugging.replay import ReplayEngine
-from clearstone.observability.models import Span
+from clearstone.debugging.checkpoint import Checkpoint, CheckpointManager
+from clearstone.debugging.replay import DeterministicExecutionContext, ReplayEngine
+from clearstone.observability.models import Span, Trace
 
 
 class ReplayableAgent:
@@ -75,14 +75,70 @@ def test_replay_engine_rehydrates_agent_state(mock_checkpoint):
     assert engine.agent.history == []
 
 
+def test_list_checkpoints_reads_files_and_batch_logs(tmp_path):
+    """Test that checkpoints in files and batch logs are listed oldest first."""
+    manager = CheckpointManager(checkpoint_dir=str(tmp_path))
+    trace = Trace(
+        trace_id="t1",
+        spans=[
+            Span(
+                trace_id="t1",
+                span_id="s1",
+                name="step",
+                start_time_ns=1,
+                instrumentation_name="test",
+                instrumentation_version="1",
+            )
+        ],
+        root_span_id="s1",
+        agent_id="a1",
+        agent_version="v1",
+        environment="test",
+        start_time_ns=1,
+    )
+    agent = ReplayableAgent()
+    first = manager.create_checkpoint(agent, trace, "s1")
+    manager.begin_batch()
+    second = manager.create_checkpoint(agent, trace, "s1")
+    manager.commit_batch()
+
+    headers = ReplayEngine.list_checkpoints(str(tmp_path))
+
+    assert [h.checkpoint_id for h in headers] == [
+        first.checkpoint_id,
+        second.checkpoint_id,
+    ]
+    assert all(h.current_span.span_id == "s1" for h in headers)
+
+
+def test_deterministic_context_patches_only_configured_targets(mock_checkpoint):
+    """Test that only the given mock targets are patched, with recorded values."""
+    import os
+
+    real_getcwd = os.getcwd
+    with DeterministicExecutionContext(
+        mock_checkpoint, {"os.getcwd": ["recorded_one", "recorded_two"]}
+    ):
+        assert os.getcwd() == "recorded_one"
+        assert os.getcwd() == "recorded_two"
+
+    assert os.getcwd is real_getcwd
+
+
 @patch("pdb.set_trace")
 def test_start_debugging_session_with_mock_config(mock_pdb, mock_checkpoint):
     """Test that the engine correctly configures mocks and runs."""
     # Create a mock trace store with the full trace
     mock_trace_store = MagicMock()
-    mock_trace = MagicMock()
-    mock_trace.spans = mock_checkpoint.upstream_spans + [mock_checkpoint.current_span]
-    mock_trace_store.get_trace.return_value = mock_trace
+    mock_trace_store.get_trace.return_value = Trace(
+        trace_id="t1",
+        root_span_id="s_tool",
+        spans=mock_checkpoint.upstream_spans + [mock_checkpoint.current_span],
+        agent_id="a1",
+        agent_version="v1",
+        environment="test",
+        start_time_ns=1,
+    )
 
     engine = ReplayEngine(mock_checkpoint, trace_store=mock_trace_store)
 
@@ -127,3 +183,28 @@ def test_start_debugging_session_with_mock_config(mock_pdb, mock_checkpoint):
 
         # Verify trace store was used
         mock_trace_store.get_trace.assert_called_once_with(mock_checkpoint.trace_id)
+
+
+@patch("pdb.set_trace")
+def test_start_debugging_session_decodes_each_output_once(mock_pdb, mock_checkpoint):
+    """Test that outputs are decoded lazily, once per span across span types."""
+    engine = ReplayEngine(mock_checkpoint)
+    mock_config = {"tool": "pkg.tool.invoke", "internal": "pkg.internal.invoke"}
+
+    with (
+        patch(
+            "clearstone.debugging.replay.DeterministicExecutionContext"
+        ) as mock_exec_context,
+        patch(
+            "clearstone.serialization.hybrid.HybridSerializer.deserialize",
+            return_value="decoded",
+        ) as mock_deserialize,
+    ):
+        engine.start_debugging_session("run_step", mock_config=mock_config, increment=1)
+
+        mock_targets = mock_exec_context.call_args[0][1]
+        mock_deserialize.assert_not_called()
+        assert list(mock_targets["pkg.tool.invoke"]) == ["decoded"]
+        assert list(mock_targets["pkg.internal.invoke"]) == ["decoded"]
+
+    mock_deserialize.assert_called_once()
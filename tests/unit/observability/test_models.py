@@ -1,8 +1,12 @@
 # tests/unit/observability/test_models.py
 
+import copy
+import pickle
 import time
 from datetime import datetime, timezone
 
+import pytest
+
 from clearstone.observability.models import (
     Span,
     SpanEvent,
@@ -10,6 +14,7 @@ from clearstone.observability.models import (
     SpanLink,
     SpanStatus,
     Trace,
+    new_id,
 )
 
 
@@ -106,3 +111,117 @@ def test_trace_model_holds_spans():
     assert trace.trace_id == "t1"
     assert len(trace.spans) == 2
     assert trace.agent_id == "test_agent"
+
+
+def test_span_event_timestamp_from_datetime_and_ns():
+    """Test that SpanEvent keeps nanoseconds and accepts legacy datetimes."""
+    when = datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc)
+    event = SpanEvent(name="legacy", timestamp=when)
+    assert event.timestamp == when
+    assert event.timestamp_ns == 1735734600 * 10**9
+
+    restored = SpanEvent.model_validate({"name": "old", "timestamp": when.isoformat()})
+    assert restored.timestamp_ns == event.timestamp_ns
+
+    dumped = event.model_dump(mode="json")
+    assert dumped["timestamp_ns"] == event.timestamp_ns
+    assert SpanEvent.model_validate(dumped) == event
+
+
+def test_trace_caches_span_lookups():
+    """Test the cached id map and per-type span lists of a Trace."""
+
+    def make_span(span_id, name, start, **kwargs):
+        return Span(
+            trace_id="t1",
+            span_id=span_id,
+            name=name,
+            start_time_ns=start,
+            instrumentation_name="t",
+            instrumentation_version="1",
+            **kwargs,
+        )
+
+    trace = Trace(
+        trace_id="t1",
+        root_span_id="a",
+        spans=[
+            make_span("a", "tool.search", 3),
+            make_span("b", "think", 2, attributes={"span_type": "tool"}),
+            make_span("c", "api", 1, kind=SpanKind.CLIENT),
+        ],
+        agent_id="test_agent",
+        agent_version="v2",
+        environment="testing",
+        start_time_ns=1,
+    )
+
+    assert trace.spans_by_id()["b"].name == "think"
+    with pytest.raises(TypeError):
+        trace.spans_by_id()["x"] = trace.spans[0]
+    assert [s.span_id for s in trace.spans_by_type("tool")] == ["b", "a"]
+    assert [s.span_id for s in trace.spans_by_type("client")] == ["c"]
+    assert trace.spans_by_type("tool") is trace.spans_by_type("tool")
+
+    trace.spans.append(make_span("d", "tool.fetch", 4))
+    assert [s.span_id for s in trace.spans_by_type("tool")] == ["b", "a", "d"]
+    assert "d" in trace.spans_by_id()
+
+    trace.spans[0].attributes["tool.name"] = "search"
+    trace.spans[1].status = SpanStatus.ERROR
+    trace.spans.append(make_span("e", "tool.search", 5))
+    trace.spans[-1].attributes["tool.name"] = "search"
+    assert trace.tool_call_counts() == {"search": 2}
+    trace.tool_call_counts()["search"] += 1
+    assert trace.tool_call_counts() == {"search": 2}
+    assert [s.span_id for s in trace.error_spans()] == ["b"]
+    assert trace.span_names() == (
+        "tool.search",
+        "think",
+        "api",
+        "tool.fetch",
+        "tool.search",
+    )
+    assert trace.span_names() is trace.span_names()
+
+    # Replacing spans in place keeps the length; assigning the list again
+    # rebuilds the caches.
+    trace.spans[1] = make_span("b", "think", 2, attributes={"span_type": "tool"})
+    trace.spans = trace.spans
+    assert trace.error_spans() == ()
+    trace.spans = [make_span("f", "tool.other", 6)]
+    assert [s.span_id for s in trace.spans_by_type("tool")] == ["f"]
+    assert list(trace.spans_by_id()) == ["f"]
+
+
+def test_span_record_exception_keeps_plain_data():
+    """Test that a recorded exception leaves a formatted, copyable span."""
+    span = Span(
+        trace_id="t1",
+        name="failing",
+        start_time_ns=1,
+        instrumentation_name="test",
+        instrumentation_version="1.0",
+    )
+    try:
+        raise ValueError("bad input")
+    except ValueError as exc:
+        span.record_exception(type(exc), exc, exc.__traceback__)
+
+    assert span.status == SpanStatus.ERROR
+    assert span.error_message == "bad input"
+    assert span.error_stacktrace.startswith("Traceback")
+    assert "ValueError: bad input" in span.error_stacktrace
+
+    copied = copy.deepcopy(span)
+    assert copied == span
+    assert pickle.loads(pickle.dumps(span)) == span
+    assert Span.model_validate_json(span.model_dump_json()) == span
+
+
+def test_new_id_is_random_hex():
+    """Test that generated trace and span IDs are 32 distinct hex characters."""
+    ids = {new_id() for _ in range(100)}
+
+    assert len(ids) == 100
+    assert all(len(i) == 32 and int(i, 16) >= 0 for i in ids)
@@ -4,6 +4,7 @@ import pytest
 
 from clearstone.observability.provider import (
     TracerProvider,
+    get_tracer_fast,
     get_tracer_provider,
     reset_tracer_provider,
 )
@@ -51,3 +52,59 @@ def test_global_get_tracer_provider_is_singleton():
     provider1 = get_tracer_provider()
     provider2 = get_tracer_provider()
     assert provider1 is provider2
+
+
+def test_get_tracer_reads_existing_tracers_without_locking(provider):
+    """Test that an existing tracer is returned even while the lock is held."""
+    tracer = provider.get_tracer("agent_A")
+    with provider._lock:
+        assert provider.get_tracer("agent_A") is tracer
+
+
+def test_get_tracer_fast_memoizes_until_provider_reset(tmp_path):
+    """Test that get_tracer_fast caches tracers and is cleared on reset."""
+    provider = get_tracer_provider(db_path=str(tmp_path / "fast.db"))
+    tracer = get_tracer_fast("agent_A")
+    assert tracer is provider.get_tracer("agent_A")
+    assert get_tracer_fast("agent_A") is tracer
+
+    reset_tracer_provider()
+    get_tracer_provider(db_path=str(tmp_path / "fast2.db"))
+    assert get_tracer_fast("agent_A") is not tracer
+
+
+def test_spans_of_threads_inheriting_a_span_are_persisted(tmp_path):
+    """Test that spans ended in a worker thread under an open span are written."""
+    import asyncio
+
+    from clearstone.storage.sqlite import TraceStore
+
+    db_path = str(tmp_path / "threads.db")
+    provider = TracerProvider(db_path=db_path)
+    tracer = provider.get_tracer("agent_A")
+
+    def work():
+        with tracer.span("worker"):
+            pass
+
+    async def main():
+        with tracer.span("root"):
+            await asyncio.to_thread(work)
+
+    asyncio.run(main())
+    provider.shutdown()
+
+    trace = TraceStore(db_path=db_path).get_trace(tracer.trace_id)
+    assert sorted(span.name for span in trace.spans) == ["root", "worker"]
+
+
+def test_flush_drains_spans_held_under_an_open_root_span(provider):
+    """Test that flushing the buffer writes spans whose root span is still open."""
+    tracer = provider.get_tracer("agent_A")
+
+    with tracer.span("root"):
+        with tracer.span("child"):
+            pass
+        provider.span_buffer.flush()
+        trace = provider.trace_store.get_trace(tracer.trace_id)
+        assert [span.name for span in trace.spans] == ["child"]
@@ -106,3 +106,132 @@ def test_tracer_is_thread_safe():
     assert len(thread_root_spans) == num_threads
     for root_span in thread_root_spans:
         assert root_span.parent_span_id is None
+
+
+def test_legacy_buffer_merges_thread_shards_in_end_order():
+    """Test that spans buffered by several threads come back in end order and clear."""
+    tracer = get_tracer("sharded_agent")
+
+    def worker(name):
+        with tracer.span(name):
+            pass
+
+    with tracer.span("main_first"):
+        pass
+    thread = threading.Thread(target=worker, args=("thread_span",))
+    thread.start()
+    thread.join()
+    with tracer.span("main_last"):
+        pass
+
+    spans = tracer.get_buffered_spans()
+    assert [s.name for s in spans] == ["main_first", "thread_span", "main_last"]
+
+    tracer.clear_buffer()
+    assert tracer.get_buffered_spans() == []
+    with tracer.span("after_clear"):
+        pass
+    assert [s.name for s in tracer.get_buffered_spans()] == ["after_clear"]
+
+
+def test_concurrent_asyncio_tasks_keep_separate_span_stacks():
+    """Test that spans opened in concurrent tasks are parented per task."""
+    import asyncio
+
+    tracer = get_tracer("async_agent")
+
+    async def worker(name):
+        with tracer.span(name) as outer:
+            await asyncio.sleep(0)
+            with tracer.span(f"{name}.child") as inner:
+                await asyncio.sleep(0)
+                return outer, inner
+
+    async def main():
+        with tracer.span("root") as root:
+            results = await asyncio.gather(worker("a"), worker("b"))
+        return root, results
+
+    root, results = asyncio.run(main())
+    for outer, inner in results:
+        assert outer.parent_span_id == root.span_id
+        assert inner.parent_span_id == outer.span_id
+
+
+def test_span_attributes_are_copied_at_enter():
+    """Test that initial attributes are applied to the span without aliasing."""
+    tracer = get_tracer("test_agent")
+    attributes = {"model": "gpt"}
+
+    with tracer.span("op", attributes=attributes) as span:
+        span.attributes["tokens"] = 3
+
+    assert span.attributes == {"model": "gpt", "tokens": 3}
+    assert attributes == {"model": "gpt"}
+
+
+def test_span_context_managers_are_recycled():
+    """Test that a finished context manager shell is reused for the next span."""
+    from clearstone.observability import tracer as tracer_module
+
+    tracer = get_tracer("test_agent")
+
+    with tracer.span("first") as first_span:
+        pass
+    free = len(tracer_module._free_managers)
+    assert free > 0
+    with tracer.span("second") as second_span:
+        assert second_span.parent_span_id is None
+        assert len(tracer_module._free_managers) == free - 1
+
+    assert first_span.name == "first"
+    assert second_span.name == "second"
+    assert tracer.get_buffered_spans() == [first_span, second_span]
+
+
+def test_released_span_context_manager_is_not_aliased():
+    """Test that a kept manager is cleared, not reused, and cannot be re-entered."""
+    tracer = get_tracer("test_agent")
+
+    first = tracer.span("first")
+    assert first.span is None
+    with first as first_span:
+        assert first.span is first_span
+        with pytest.raises(RuntimeError):
+            first.__enter__()
+    assert first.span is None and first.name is None and first.tracer is None
+
+    second = tracer.span("second")
+    with second as second_span:
+        pass
+
+    assert second is not first
+    assert first.span is None
+    assert first_span.name == "first" and second_span.name == "second"
+    with pytest.raises(RuntimeError):
+        with first:
+            pass
+
+
+def test_integrated_tracer_hands_over_spans_when_root_span_exits():
+    """Test that nested spans reach the shared buffer in one batch."""
+    from unittest.mock import MagicMock
+
+    from clearstone.observability.tracer import Tracer
+
+    buffer = MagicMock()
+    tracer = Tracer("batched_agent", buffer=buffer)
+
+    with tracer.span("root"):
+        with tracer.span("child"):
+            pass
+        with tracer.span("sibling"):
+            pass
+        buffer.add_spans.assert_not_called()
+
+    buffer.add_spans.assert_called_once()
+    assert [s.name for s in buffer.add_spans.call_args[0][0]] == [
+        "child",
+        "sibling",
+        "root",
+    ]
@@ -1,11 +1,22 @@
 # tests/unit/serialization/test_hybrid.py
 
 import threading
+import uuid
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
 
 import numpy as np
 import pytest
 
-from clearstone.serialization.hybrid import HybridSerializer, SelectiveSnapshotCapture
+from clearstone.core.actions import ActionType
+from clearstone.serialization.hybrid import (
+    HybridSerializer,
+    SelectiveSnapshotCapture,
+    SerializationStrategy,
+    _min_encoded_size,
+)
+from clearstone.utils import serialization
 
 
 class CustomTestClass:
@@ -21,6 +32,16 @@ def serializer():
     return HybridSerializer()
 
 
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Runs a test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
 def test_json_primitives_roundtrip(serializer):
     """Test that basic JSON-compatible types serialize and deserialize correctly."""
     primitives = [1, "hello", 3.14, True, None, [1, "a"], {"key": "value"}]
@@ -102,3 +123,125 @@ def test_serialization_of_unserializable_object_returns_error(serializer):
     assert '"__type__": "error"' in serialized
     with pytest.raises(ValueError, match="Original object could not be serialized"):
         serializer.deserialize(serialized)
+
+
+def test_pickle_fallback_for_non_string_keys(serializer, backend):
+    """Test that dicts JSON would change on the way back use pickle."""
+    obj = {1: "a", "nested": {None: [1]}}
+    serialized = serializer.serialize(obj)
+
+    assert '"__type__": "pickle"' in serialized
+    assert serializer.deserialize(serialized) == obj
+
+
+def test_common_scalars_roundtrip_without_pickle(serializer):
+    """Test that datetimes, dates, UUIDs and bytes are tagged, not pickled."""
+    values = [
+        datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc),
+        datetime(2025, 1, 1, 12, 30, 0, 5),
+        date(2025, 1, 1),
+        uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        b"\x00raw",
+    ]
+    for obj in values:
+        serialized = serializer.serialize(obj)
+        deserialized = serializer.deserialize(serialized)
+
+        assert '"__type__": "pickle"' not in serialized
+        assert type(deserialized) is type(obj)
+        assert deserialized == obj
+
+
+def test_zoned_datetime_still_uses_pickle(serializer):
+    """Test that a datetime whose zone has no fixed offset keeps its tzinfo."""
+    obj = datetime(2025, 1, 1, tzinfo=ZoneInfo("Europe/Paris"))
+    serialized = serializer.serialize(obj)
+
+    assert '"__type__": "pickle"' in serialized
+    assert serializer.deserialize(serialized).tzinfo == obj.tzinfo
+
+
+def test_selective_snapshot_capture_reports_utf8_size():
+    """Test that the reported size is the UTF-8 size of the captured data."""
+    snapshot = SelectiveSnapshotCapture.capture({"text": "héllo ✓"})
+
+    assert snapshot["captured"] is True
+    assert snapshot["size_bytes"] == len(snapshot["data"].encode("utf-8"))
+
+
+def test_serialization_strategy_stays_abstract():
+    """Test that the strategy interface cannot be used without an implementation."""
+    with pytest.raises(TypeError):
+        SerializationStrategy()
+
+
+def test_selective_snapshot_capture_rejects_large_object_without_serializing():
+    """Test that an object certain to exceed the limit is never serialized."""
+    obj = {"chunks": ["a" * 600, "b" * 600], "array": np.zeros(10)}
+
+    with patch.object(HybridSerializer, "_serialize_bytes") as serialize:
+        snapshot = SelectiveSnapshotCapture.capture(obj, max_size_bytes=1000)
+
+    serialize.assert_not_called()
+    assert snapshot["captured"] is False
+    assert "at least" in snapshot["reason"]
+
+
+def test_min_encoded_size_is_a_lower_bound(serializer):
+    """Test that the size estimate never exceeds the actual encoded size."""
+    shared = ["x" * 50]
+    cyclic = [1, 2]
+    cyclic.append(cyclic)
+    values = [
+        None,
+        "héllo",
+        b"\x00" * 40,
+        {"a": [1, 2, 3], "b": {"c": None}},
+        [shared, shared, ()],
+        {1, 2, 3},
+        cyclic,
+        np.arange(20),
+        CustomTestClass(value="x" * 100),
+    ]
+    for obj in values:
+        encoded = serializer._serialize_bytes(obj)
+        assert _min_encoded_size(obj, 10**9) <= len(encoded)
+
+
+def test_min_encoded_size_counts_shared_strings_once():
+    """Test that a string referenced several times counts toward the bound once."""
+    shared = "x" * 400_000
+    obj = {1: shared, 2: shared, 3: shared}
+
+    assert _min_encoded_size(obj, 10**9) < 1_000_000
+    assert SelectiveSnapshotCapture.capture(obj, 1_000_000)["captured"] is True
+
+
+def test_min_encoded_size_ignores_foreign_nbytes():
+    """Test that only real buffers are trusted for their `nbytes`."""
+
+    class Claims:
+        nbytes = 10**9
+
+    assert _min_encoded_size(Claims(), 10**10) == 1
+    assert _min_encoded_size(np.empty(1000, dtype=object), 10**10) == 1
+    assert _min_encoded_size(np.zeros(10), 10**10) == 80
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {"x": float("nan")},
+        [float("inf"), -float("inf")],
+        {"a": ActionType.BLOCK},
+        {"ids": [uuid.UUID(int=7)]},
+    ],
+    ids=["nan", "inf", "enum", "nested-uuid"],
+)
+def test_values_json_would_change_use_pickle(serializer, backend, obj):
+    """Test that values a JSON backend would convert are pickled under both."""
+    serialized = serializer.serialize(obj)
+    restored = serializer.deserialize(serialized)
+
+    assert '"__type__": "pickle"' in serialized
+    assert repr(restored) == repr(obj)
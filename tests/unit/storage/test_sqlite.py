@@ -1,5 +1,7 @@
 # tests/unit/storage/test_sqlite.py
 
+import gc
+import math
 import sqlite3
 import threading
 import time
@@ -57,6 +59,22 @@ def test_write_and_read_spans(trace_store):
     assert trace.spans[0].name == "op1"
 
 
+def test_write_spans_keeps_values_orjson_cannot_encode(trace_store):
+    """Test that huge ints and NaN survive storage without failing the batch."""
+    odd = create_mock_span("t7", "odd")
+    odd.attributes.update({"big": 2**70, "ratio": float("nan")})
+    odd.output_snapshot = {"big": -(2**65)}
+    plain = create_mock_span("t7", "plain")
+
+    trace_store.write_spans([odd, plain])
+
+    spans = {span.name: span for span in trace_store.get_trace("t7").spans}
+    assert set(spans) == {"odd", "plain"}
+    assert spans["odd"].attributes["big"] == 2**70
+    assert math.isnan(spans["odd"].attributes["ratio"])
+    assert spans["odd"].output_snapshot == {"big": -(2**65)}
+
+
 def test_span_buffer_flushes_on_batch_size(trace_store):
     """Test that the buffer flushes automatically when the batch size is reached."""
     with patch.object(trace_store, "write_spans") as mock_write:
@@ -73,6 +91,22 @@ def test_span_buffer_flushes_on_batch_size(trace_store):
         buffer.shutdown()
 
 
+def test_span_buffer_add_spans_flushes_on_batch_size(trace_store):
+    """Test that a bulk add is queued together and respects the batch size."""
+    with patch.object(trace_store, "write_spans") as mock_write:
+        buffer = SpanBuffer(writer=trace_store, batch_size=3, flush_interval_s=10)
+
+        buffer.add_spans([create_mock_span("t1", "s1"), create_mock_span("t1", "s2")])
+        assert mock_write.call_count == 0
+
+        buffer.add_spans([create_mock_span("t1", "s3")])
+        time.sleep(0.1)
+
+        assert mock_write.call_count == 1
+        assert [s.name for s in mock_write.call_args[0][0]] == ["s1", "s2", "s3"]
+        buffer.shutdown()
+
+
 def test_span_buffer_flushes_on_interval(trace_store):
     """Test that the buffer flushes automatically based on the time interval."""
     with patch.object(trace_store, "write_spans") as mock_write:
@@ -115,3 +149,111 @@ def test_span_buffer_is_thread_safe(trace_store):
         count = conn.execute("SELECT COUNT(*) FROM spans").fetchone()[0]
         conn.close()
         assert count == total_spans
+
+
+def test_trace_store_applies_pragmas(db_path):
+    """Test that default and custom pragmas are applied to each connection."""
+    store = TraceStore(db_path=str(db_path), pragmas={"busy_timeout": 1234})
+
+    conn = store._get_connection()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    finally:
+        conn.close()
+
+
+def test_span_buffer_shutdown_writes_all_remaining_spans_at_once(trace_store):
+    """Test that shutdown writes every queued span with a single write."""
+    with patch.object(trace_store, "write_spans") as mock_write:
+        buffer = SpanBuffer(writer=trace_store, batch_size=1000, flush_interval_s=10)
+        buffer.add_spans([create_mock_span("t1", f"s{i}") for i in range(250)])
+
+        buffer.shutdown()
+
+        assert mock_write.call_count == 1
+        assert len(mock_write.call_args[0][0]) == 250
+
+
+def test_span_buffer_flush_waits_for_the_write(trace_store):
+    """Test that flush() returns only after the buffered spans are written."""
+    buffer = SpanBuffer(writer=trace_store, batch_size=1000, flush_interval_s=10)
+    buffer.add_span(create_mock_span("t3", "s1"))
+    buffer.add_spans([create_mock_span("t3", "s2")])
+
+    buffer.flush()
+
+    assert len(trace_store.get_trace("t3").spans) == 2
+    buffer.shutdown()
+
+
+def test_span_buffer_survives_a_failed_write(trace_store, capsys):
+    """Test that a failing write is reported and later spans are still written."""
+    buffer = SpanBuffer(writer=trace_store, batch_size=1000, flush_interval_s=10)
+    with patch.object(trace_store, "write_spans", side_effect=sqlite3.OperationalError):
+        buffer.add_span(create_mock_span("t4", "lost"))
+        buffer.flush()
+    assert "OperationalError" in capsys.readouterr().err
+
+    buffer.add_span(create_mock_span("t4", "kept"))
+    buffer.shutdown()
+
+    assert [s.name for s in trace_store.get_trace("t4").spans] == ["kept"]
+
+
+def test_trace_store_reuses_one_connection_per_thread(trace_store):
+    """Test that each thread keeps its own connection and close() resets them."""
+    main_conn = trace_store._connection()
+    assert trace_store._connection() is main_conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(trace_store._connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_conn
+
+    trace_store.close()
+    trace_store.write_spans([create_mock_span("t5", "after_close")])
+    assert trace_store._connection() is not main_conn
+    assert trace_store.get_trace("t5").spans[0].name == "after_close"
+
+
+def test_trace_store_closes_connection_when_its_thread_ends(trace_store):
+    """Test that a reader thread's connection does not outlive the thread."""
+    trace_store.write_spans([create_mock_span("t6", "span")])
+    opened = []
+
+    def read():
+        trace_store.get_trace("t6")
+        opened.append(trace_store._connection())
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    thread.join()
+    gc.collect()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+    assert len(trace_store._holders) == 1
+
+
+def test_get_trace_without_snapshots(trace_store):
+    """Test that snapshots are left out only when asked to."""
+    span = create_mock_span("t6", "op")
+    span.input_snapshot = {"prompt": "hi"}
+    span.output_snapshot = {"text": "hello"}
+    trace_store.write_spans([span])
+
+    full = trace_store.get_trace("t6").spans[0]
+    light = trace_store.get_trace("t6", include_snapshots=False).spans[0]
+
+    assert full.input_snapshot == {"prompt": "hi"}
+    assert full.output_snapshot == {"text": "hello"}
+    assert light.input_snapshot is None and light.output_snapshot is None
+    assert light.model_dump(exclude={"input_snapshot", "output_snapshot"}) == (
+        full.model_dump(exclude={"input_snapshot", "output_snapshot"})
+    )
+    assert trace_store.get_trace("missing") is None
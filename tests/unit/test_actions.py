@@ -86,6 +86,12 @@ def test_pause_factory_accepts_custom_intervention_id():
     assert decision.metadata["intervention_id"] == "custom-123"
 
 
+def test_pause_factory_generates_unique_intervention_ids():
+    """Test that generated intervention IDs never repeat within a process."""
+    ids = {PAUSE("approval").metadata["intervention_id"] for _ in range(100)}
+    assert len(ids) == 100
+
+
 def test_decision_is_frozen_and_immutable():
     """Test that Decision objects are immutable."""
     assert is_dataclass(ALLOW)
@@ -95,3 +101,18 @@ def test_decision_is_frozen_and_immutable():
     block_decision = BLOCK("test")
     with pytest.raises(FrozenInstanceError):
         block_decision.action = ActionType.ALLOW
+
+
+def test_decision_is_slotted():
+    """Test that Decision instances carry no per-instance __dict__."""
+    decision = BLOCK("reason")
+    assert not hasattr(decision, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        decision.reason = "changed"
+
+
+def test_block_without_metadata_is_interned():
+    """Test that metadata-free BLOCK decisions are shared per reason."""
+    assert BLOCK("Rate limited") is BLOCK("Rate limited")
+    assert BLOCK("Rate limited") is not BLOCK("Other reason")
+    assert BLOCK("Rate limited", code=429) is not BLOCK("Rate limited", code=429)
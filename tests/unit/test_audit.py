@@ -40,6 +40,25 @@ class TestAuditTrail:
         assert len(entries) == 1
         assert entries[0]["error"] == "Exception occurred"
 
+    def test_audit_trail_record_decisions_batch(self):
+        """Test that a batch of records is appended in order with errors kept."""
+        audit = AuditTrail()
+        ctx = create_context("user1", "agent1")
+        audit.record_decisions(
+            ctx,
+            [
+                ("policy1", ALLOW, 0.1, None),
+                ("policy2", BLOCK("failed"), 0.2, "boom"),
+            ],
+        )
+
+        entries = audit.get_entries()
+        assert [e["policy_name"] for e in entries] == ["policy1", "policy2"]
+        assert entries[1]["decision"] == "block"
+        assert entries[1]["error"] == "boom"
+        assert entries[0]["request_id"] == ctx.request_id
+        assert entries[0]["timestamp"] == entries[1]["timestamp"]
+
     def test_audit_trail_get_entries_with_limit(self):
         """Test that get_entries respects the limit parameter."""
         audit = AuditTrail()
@@ -132,6 +151,31 @@ class TestAuditTrail:
         assert data[1]["decision"] == "block"
         assert data[1]["reason"] == "test"
 
+    def test_audit_trail_to_json_with_json_dump_arguments(self, tmp_path):
+        """Test that extra arguments still reach json.dump."""
+        audit = AuditTrail()
+        audit.record_decision("p1", create_context("user1", "agent1"), ALLOW)
+
+        json_file = tmp_path / "audit.json"
+        audit.to_json(str(json_file), indent=4, sort_keys=True)
+
+        text = json_file.read_text()
+        assert text.startswith('[\n    {\n        "agent_id"')
+        assert json.loads(text)[0]["policy_name"] == "p1"
+
+    def test_audit_trail_to_jsonl(self, tmp_path):
+        """Test exporting the audit trail with one JSON entry per line."""
+        audit = AuditTrail()
+        ctx = create_context("user1", "agent1")
+        audit.record_decision("p1", ctx, ALLOW)
+        audit.record_decision("p2", ctx, BLOCK("test"))
+
+        jsonl_file = tmp_path / "audit.jsonl"
+        audit.to_jsonl(str(jsonl_file))
+
+        lines = jsonl_file.read_text().splitlines()
+        assert [json.loads(line)["policy_name"] for line in lines] == ["p1", "p2"]
+
     def test_audit_trail_to_csv(self, tmp_path):
         """Test exporting the audit trail to a CSV file."""
         audit = AuditTrail()
@@ -0,0 +1,127 @@
+"""
+Tests for batch policy evaluation.
+"""
+
+import random
+
+import pytest
+
+from clearstone.core.actions import ALERT, ALLOW, ActionType
+from clearstone.core.context import create_context, set_current_context
+from clearstone.core.policy import PolicyEngine, reset_policies
+from clearstone.policies import (
+    create_cost_control_policies,
+    create_security_policies,
+    evaluate_batch,
+    token_limit_policy,
+)
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture(autouse=True)
+def reset_policy_registry():
+    reset_policies()
+    set_current_context(None)
+
+
+def random_contexts(count, seed=7):
+    rng = random.Random(seed)
+    contexts = []
+    for _ in range(count):
+        metadata = {"tool_name": rng.choice(["read", "charge", "drop_table"])}
+        if rng.random() < 0.5:
+            metadata["token_limit"] = rng.randint(50, 150)
+        metadata["tokens_used"] = rng.randint(0, 200)
+        if rng.random() < 0.3:
+            metadata["session_cost_limit"] = 5.0
+            metadata["session_cost"] = rng.uniform(0, 10)
+        if rng.random() < 0.3:
+            metadata["operation_cost"] = rng.uniform(0, 20)
+        if rng.random() < 0.3:
+            metadata["external_api_tools"] = ["charge"]
+        contexts.append(create_context("user1", "agent1", **metadata))
+    return contexts
+
+
+@pytest.mark.parametrize(
+    "policies", [create_cost_control_policies(), create_security_policies()]
+)
+def test_batch_matches_policy_engine(policies):
+    contexts = random_contexts(200)
+    engine = PolicyEngine(policies=policies)
+
+    decisions = evaluate_batch(contexts, policies)
+
+    assert len(decisions) == len(contexts)
+    for context, decision in zip(contexts, decisions):
+        expected = engine.evaluate(context)
+        assert decision.action == expected.action
+        assert decision.reason == expected.reason
+
+
+def test_batch_falls_back_for_non_numeric_columns():
+    contexts = [
+        create_context("user1", "agent1", token_limit="100", tokens_used=5),
+        create_context("user1", "agent1", token_limit=1, tokens_used=5),
+    ]
+
+    decisions = evaluate_batch(contexts, [token_limit_policy])
+
+    assert decisions[0].action == ActionType.BLOCK
+    assert "raised an exception" in decisions[0].reason
+    assert decisions[1].reason == "Token limit exceeded: 5 > 1"
+
+
+def test_batch_calls_other_policies_per_context():
+    seen = []
+
+    def custom_policy(context):
+        seen.append(context.user_id)
+        return ALERT if context.user_id == "alerted" else ALLOW
+
+    contexts = [create_context(user, "agent1") for user in ["a", "alerted", "b"]]
+
+    decisions = evaluate_batch(contexts, [custom_policy])
+
+    assert seen == ["a", "alerted", "b"]
+    assert [d.action for d in decisions] == [
+        ActionType.ALLOW,
+        ActionType.ALERT,
+        ActionType.ALLOW,
+    ]
+
+
+def test_batch_falls_back_for_sequence_values():
+    contexts = [
+        create_context("user1", "agent1", token_limit=1, tokens_used=[1, 2]),
+        create_context("user1", "agent1", token_limit=1, tokens_used=5),
+    ]
+
+    decisions = evaluate_batch(contexts, [token_limit_policy])
+
+    assert decisions[0].action == ActionType.BLOCK
+    assert "raised an exception" in decisions[0].reason
+    assert decisions[1].reason == "Token limit exceeded: 5 > 1"
+
+
+@pytest.mark.parametrize(
+    "tokens_used, token_limit",
+    [
+        (2**53 + 1, float(2**53)),
+        (2**64, 2**64 - 1),
+        (5, 4.5),
+        (True, 0),
+    ],
+)
+def test_batch_compares_numbers_like_the_policy(tokens_used, token_limit):
+    context = create_context(
+        "user1", "agent1", token_limit=token_limit, tokens_used=tokens_used
+    )
+    engine = PolicyEngine(policies=[token_limit_policy])
+
+    decisions = evaluate_batch([context, context], [token_limit_policy])
+
+    expected = engine.evaluate(context)
+    assert expected.action == ActionType.BLOCK
+    assert [d.reason for d in decisions] == [expected.reason] * 2
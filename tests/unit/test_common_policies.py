@@ -2,13 +2,15 @@
 Tests for the pre-built common policies library.
 """
 
+import time
 from unittest.mock import patch
 
 import pytest
 
-from clearstone.core.actions import ActionType
+from clearstone.core.actions import ALERT, ALLOW, ActionType
 from clearstone.core.context import create_context, set_current_context
-from clearstone.core.policy import reset_policies
+from clearstone.core.policy import PolicyEngine, reset_policies
+from clearstone.policies import compile_policies
 from clearstone.policies.common import (
     admin_only_action_policy,
     alert_on_failed_auth_policy,
@@ -278,6 +280,23 @@ class TestDangerousOperationPolicies:
         decision = pause_before_write_policy(ctx)
         assert decision.action == ActionType.ALLOW
 
+    def test_pause_before_write_matches_operations_literally(self):
+        ctx = create_context(
+            "user1", "agent1", tool_name="update_record", require_pause_for=["up.*"]
+        )
+        assert pause_before_write_policy(ctx).action == ActionType.ALLOW
+
+        ctx = create_context(
+            "user1", "agent1", tool_name="run_sql(*)", require_pause_for=["(*)"]
+        )
+        assert pause_before_write_policy(ctx).action == ActionType.PAUSE
+
+    def test_pause_before_write_allows_without_operations(self):
+        ctx = create_context(
+            "user1", "agent1", tool_name="delete_user", require_pause_for=[]
+        )
+        assert pause_before_write_policy(ctx).action == ActionType.ALLOW
+
 
 class TestSecurityAlertPolicies:
     """Test suite for security alert policies."""
@@ -342,6 +361,23 @@ class TestTimeBasedPolicies:
         decision = business_hours_only_policy(ctx)
         assert decision.action == ActionType.ALLOW
 
+    @patch("clearstone.policies.common._hour_cache", (-1, 0.0))
+    @patch("clearstone.policies.common.time")
+    def test_business_hours_only_caches_local_hour_until_next_hour(self, mock_time):
+        mock_time.localtime.side_effect = lambda t: time.localtime(t)
+        start = time.mktime((2024, 1, 15, 16, 59, 30, 0, 0, -1))
+        ctx = create_context("user1", "agent1")
+
+        mock_time.time.return_value = start
+        assert business_hours_only_policy(ctx).action == ActionType.ALLOW
+        mock_time.time.return_value = start + 29
+        assert business_hours_only_policy(ctx).action == ActionType.ALLOW
+        assert mock_time.localtime.call_count == 1
+
+        mock_time.time.return_value = start + 30
+        assert business_hours_only_policy(ctx).action == ActionType.BLOCK
+        assert mock_time.localtime.call_count == 2
+
 
 class TestAdditionalPolicies:
     """Test suite for additional common policies."""
@@ -475,6 +511,91 @@ class TestIntegratedPolicyScenarios:
         assert daily_cost_limit_policy(ctx_over_limit).action == ActionType.BLOCK
 
 
+class TestCompiledPolicies:
+    """Tests for policy sets fused by compile_policies."""
+
+    CONTEXTS = [
+        {},
+        {"tool_name": "delete_file"},
+        {"tool_name": "write_file", "user_role": "guest"},
+        {"tool_name": "fetch_ssn", "pii_tools": ["fetch_ssn"]},
+        {"tool_name": "fetch_ssn", "pii_tools": ["fetch_ssn"], "user_role": "admin"},
+        {"tool_name": "sudo", "privileged_tools": ["sudo"]},
+        {"token_limit": 100, "tokens_used": 150},
+        {"session_cost_limit": 5.0, "session_cost": 6.0},
+        {"daily_cost_limit": 5.0, "daily_cost": 6.0},
+        {"auth_failed": True, "attempt_count": 5},
+        {"rate_limit": 10, "rate_count": 11},
+        {"operation_cost": 50.0},
+        {"tool_name": "charge", "external_api_tools": ["charge"]},
+        {
+            "tool_name": "get_user",
+            "pii_fields": {"get_user": ["ssn"]},
+            "session_cost_limit": 5.0,
+            "session_cost": 6.0,
+        },
+    ]
+
+    @pytest.mark.parametrize(
+        "factory",
+        [
+            create_safe_mode_policies,
+            create_audit_mode_policies,
+            create_cost_control_policies,
+            create_security_policies,
+            create_data_protection_policies,
+        ],
+    )
+    def test_fused_set_matches_individual_policies(self, factory):
+        engine = PolicyEngine(policies=factory())
+        fused_engine = PolicyEngine(policies=factory(fused=True))
+
+        for metadata in self.CONTEXTS:
+            ctx = create_context("user1", "agent1", **metadata)
+            expected = engine.evaluate(ctx)
+            actual = fused_engine.evaluate(ctx)
+            assert actual.action == expected.action, metadata
+            assert actual.reason == expected.reason, metadata
+            assert actual.metadata.keys() == expected.metadata.keys(), metadata
+            assert actual.metadata.get("fields_to_redact") == expected.metadata.get(
+                "fields_to_redact"
+            )
+
+    def test_fused_factory_returns_single_named_policy(self):
+        policies = create_security_policies(fused=True)
+
+        assert len(policies) == 1
+        assert policies[0].__name__ == "security"
+        assert policies[0]._policy_info.name == "security"
+
+    def test_non_builtin_policies_are_called(self):
+        calls = []
+
+        def custom_policy(context):
+            calls.append(context.user_id)
+            return ALERT
+
+        fused = compile_policies([token_limit_policy, custom_policy])
+
+        assert fused(create_context("user1", "agent1")) is ALERT
+        assert calls == ["user1"]
+        blocked = fused(create_context("user2", "agent1", token_limit=1, tokens_used=2))
+        assert blocked.action == ActionType.BLOCK
+
+    def test_gated_policies_skip_when_their_keys_are_absent(self):
+        fused = compile_policies([token_limit_policy, rate_limit_policy])
+
+        unrelated = create_context("user1", "agent1", tokens_used=10**9, rate_count=99)
+        assert fused(unrelated) is ALLOW
+
+        limited = create_context("user1", "agent1", rate_limit=1, rate_count=99)
+        assert fused(limited).reason == "Rate limit exceeded: 99 > 1"
+
+    def test_empty_policy_list_is_rejected(self):
+        with pytest.raises(ValueError):
+            compile_policies([])
+
+
 class TestSystemLoadPolicy:
     @patch("psutil.cpu_percent", return_value=50.0)
     @patch(
@@ -4,6 +4,7 @@ Tests for policy composition utilities.
 
 from clearstone.core.actions import ALERT, ALLOW, BLOCK, PAUSE, ActionType
 from clearstone.core.context import create_context
+from clearstone.core.policy import PolicyInfo
 from clearstone.utils.composition import compose_and, compose_or
 
 
@@ -197,3 +198,18 @@ class TestCompositionIntegration:
 
         ctx_no_access = create_context("user", "agent", role="guest", hour=22)
         assert flexible_access(ctx_no_access).action == ActionType.BLOCK
+
+
+def test_compose_passes_view_to_reads_policies():
+    """Policies declaring `reads` are called with their metadata view."""
+
+    def role_policy(context, view):
+        return BLOCK("guest") if view["role"] == "guest" else ALLOW
+
+    role_policy._policy_info = PolicyInfo(
+        name="role_policy", priority=0, func=role_policy, reads=("role",)
+    )
+    guest = create_context("user", "agent", role="guest")
+
+    assert compose_and(policy_allow, role_policy)(guest).action == ActionType.BLOCK
+    assert compose_or(role_policy, policy_alert)(guest).action == ActionType.ALERT
@@ -1,10 +1,14 @@
 # tests/unit/test_context.py
 
 import asyncio
-from dataclasses import FrozenInstanceError
+import json
+import os
+from dataclasses import FrozenInstanceError, replace
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from clearstone.core.actions import PAUSE
 from clearstone.core.context import (
     PolicyContext,
     context_scope,
@@ -26,6 +30,13 @@ def test_context_creation_and_defaults():
     assert isinstance(ctx.session_id, str) and len(ctx.session_id) > 0
 
 
+def test_context_generates_unique_ids():
+    """Test that default request and session IDs never repeat."""
+    contexts = [create_context("user1", "agent1") for _ in range(50)]
+    ids = {ctx.request_id for ctx in contexts} | {ctx.session_id for ctx in contexts}
+    assert len(ids) == 100
+
+
 def test_context_is_immutable():
     """Test that PolicyContext is a frozen dataclass."""
     ctx = create_context("user1", "agent1")
@@ -33,6 +44,12 @@ def test_context_is_immutable():
         ctx.user_id = "modified-user"
 
 
+def test_context_is_slotted():
+    """Test that PolicyContext instances carry no per-instance __dict__."""
+    ctx = create_context("user1", "agent1")
+    assert not hasattr(ctx, "__dict__")
+
+
 def test_manual_context_management_set_get():
     """Test the manual set_current_context and get_current_context functions."""
     ctx = create_context("user1", "agent1")
@@ -58,6 +75,19 @@ def test_context_scope_manager_restores_context():
     assert get_current_context() == ctx1, "Context was not restored after scope exit."
 
 
+def test_context_scope_yields_context_and_restores_on_error():
+    """Test that context_scope returns its context and resets it on exceptions."""
+    previous = get_current_context()
+    ctx = create_context("user1", "agent1")
+
+    with pytest.raises(RuntimeError):
+        with context_scope(ctx) as scoped:
+            assert scoped is ctx
+            raise RuntimeError("boom")
+
+    assert get_current_context() is previous
+
+
 @pytest.mark.asyncio
 async def test_context_is_async_safe():
     """Test that context is properly isolated across concurrent async tasks."""
@@ -74,3 +104,75 @@ async def test_context_is_async_safe():
 
     assert results["user1"] == "user1"
     assert results["user2"] == "user2"
+
+
+def test_context_timestamp_is_utc_creation_time():
+    """Test that the lazily built timestamp reflects the creation time in UTC."""
+    before = datetime.now(timezone.utc)
+    ctx = create_context("user1", "agent1")
+    after = datetime.now(timezone.utc)
+
+    assert ctx.timestamp.tzinfo is timezone.utc
+    assert before - timedelta(microseconds=1) <= ctx.timestamp <= after
+    assert replace(ctx, metadata={"k": "v"}).timestamp == ctx.timestamp
+
+
+def test_set_current_context_returns_reset_token():
+    """Test that set_current_context exposes the ContextVar token for resetting."""
+    previous = get_current_context()
+    ctx = create_context("user1", "agent1")
+    token = set_current_context(ctx)
+    assert get_current_context() is ctx
+    token.var.reset(token)
+    assert get_current_context() is previous
+
+
+def test_context_accepts_explicit_timestamp():
+    """Test that a timestamp passed to the constructor is kept and compared out."""
+    when = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    ctx = PolicyContext("user1", "agent1", "session1", "req1", when, {"k": "v"})
+    naive = PolicyContext(
+        user_id="user1",
+        agent_id="agent1",
+        session_id="session1",
+        request_id="req1",
+        timestamp=when.replace(tzinfo=None),
+        metadata={"k": "v"},
+    )
+
+    assert ctx.timestamp == when
+    assert naive.timestamp == when
+    assert replace(ctx, metadata={}).timestamp == when
+    assert ctx == PolicyContext("user1", "agent1", "session1", "req1", None, {"k": "v"})
+    assert "_timestamp_ns" not in repr(ctx)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_generates_its_own_ids():
+    """Test that a forked child does not repeat its parent's IDs."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            ctx = create_context("user1", "agent1")
+            ids = [
+                ctx.request_id,
+                ctx.session_id,
+                PAUSE("r").metadata["intervention_id"],
+            ]
+            os.write(write_fd, json.dumps(ids).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        child_ids = json.loads(pipe.read())
+    os.waitpid(pid, 0)
+
+    ctx = create_context("user1", "agent1")
+    parent_ids = [
+        ctx.request_id,
+        ctx.session_id,
+        PAUSE("r").metadata["intervention_id"],
+    ]
+    assert not set(child_ids) & set(parent_ids)
+    assert all(len(i) >= 32 for i in parent_ids)
@@ -2,8 +2,11 @@
 Tests for policy debugger.
 """
 
+from unittest.mock import patch
+
 from clearstone.core.actions import ALLOW, BLOCK
 from clearstone.core.context import create_context
+from clearstone.core.policy import PolicyInfo
 from clearstone.utils.debugging import PolicyDebugger
 
 
@@ -21,6 +24,21 @@ def branching_policy(context):
     return ALLOW
 
 
+def count_tools(tools):
+    """A helper called by a policy; its lines must not appear in the trace."""
+    total = 0
+    for _ in tools:
+        total += 1
+    return total
+
+
+def helper_calling_policy(context):
+    """A policy that calls a helper and mutates a local list."""
+    seen = []
+    seen.append(count_tools(context.metadata.get("tools", [])))
+    return ALLOW
+
+
 class TestPolicyDebugger:
     """Test suite for PolicyDebugger."""
 
@@ -125,3 +143,52 @@ class TestPolicyDebugger:
 
         assert "Amount exceeds 1000 for non-admins." in formatted
         assert "Final Decision: BLOCK" in formatted
+
+    def test_debugger_traces_only_the_policy_frame(self):
+        """Test that callee lines are skipped and mutated locals are re-rendered."""
+        debugger = PolicyDebugger()
+        ctx = create_context("user", "agent", tools=["a", "b"])
+
+        decision, trace = debugger.trace_evaluation(helper_calling_policy, ctx)
+
+        assert decision.action == ALLOW.action
+        assert [event["line_text"] for event in trace] == [
+            "seen = []",
+            'seen.append(count_tools(context.metadata.get("tools", [])))',
+            "return ALLOW",
+        ]
+        assert trace[1]["locals"]["seen"] == "[]"
+        assert trace[2]["locals"]["seen"] == "[2]"
+
+    def test_debugger_reads_lines_from_linecache(self):
+        """Test that line texts come from linecache, without parsing the source."""
+        debugger = PolicyDebugger()
+        ctx = create_context("user", "agent", role="user", amount=5)
+
+        with patch(
+            "clearstone.utils.debugging.inspect.getsourcelines",
+            side_effect=AssertionError("source should not be parsed"),
+        ):
+            first = debugger.trace_evaluation(branching_policy, ctx)[1]
+            second = debugger.trace_evaluation(branching_policy, ctx)[1]
+
+        assert first == second
+        assert first[0]["line_text"] == 'role = context.metadata.get("role", "guest")'
+
+
+def test_debugger_passes_view_to_reads_policies():
+    """Test that a policy declaring `reads` is traced with its metadata view."""
+
+    def role_policy(context, view):
+        role = view["role"]
+        return BLOCK("guest") if role == "guest" else ALLOW
+
+    role_policy._policy_info = PolicyInfo(
+        name="role_policy", priority=0, func=role_policy, reads=("role",)
+    )
+    ctx = create_context("user", "agent", role="guest")
+
+    decision, trace = PolicyDebugger().trace_evaluation(role_policy, ctx)
+
+    assert decision.action == BLOCK("guest").action
+    assert trace[0]["locals"]["view"] == "{'role': 'guest'}"
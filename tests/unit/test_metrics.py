@@ -26,6 +26,24 @@ class TestPolicyMetrics:
         assert stats["policy_alert"]["alert_count"] == 1
         assert stats["policy_block"]["total_latency_ms"] == pytest.approx(0.5)
 
+    def test_metrics_record_bulk(self):
+        """Test that a batch of records updates the same counters as record()."""
+        metrics = PolicyMetrics()
+        metrics.record_bulk(
+            [
+                ("policy_allow", ALLOW, 0.1, None),
+                ("policy_block", BLOCK("reason"), 0.2, None),
+                ("policy_block", BLOCK("boom"), 0.3, "boom"),
+                ("policy_alert", ALERT, 0.4, None),
+            ]
+        )
+
+        stats = metrics.stats
+        assert stats["policy_allow"]["eval_count"] == 1
+        assert stats["policy_block"]["block_count"] == 2
+        assert stats["policy_alert"]["alert_count"] == 1
+        assert stats["policy_block"]["total_latency_ms"] == pytest.approx(0.5)
+
     def test_metrics_summary_calculates_averages(self):
         """Test that the summary calculates average latency correctly."""
         metrics = PolicyMetrics()
@@ -112,3 +130,32 @@ class TestPolicyMetrics:
 
         summary = metrics.summary()
         assert summary["instant_policy"]["avg_latency_ms"] == 0.0
+
+    def test_metrics_running_average_matches_total(self):
+        """Test that the running average agrees with total latency / count."""
+        metrics = PolicyMetrics()
+        latencies = [0.3, 1.7, 0.05, 2.2, 0.9]
+        for latency in latencies[:2]:
+            metrics.record("policy", ALLOW, latency)
+        metrics.record_bulk(
+            [("policy", ALLOW, latency, None) for latency in latencies[2:]]
+        )
+
+        stats = metrics.stats["policy"]
+        assert stats["avg_latency_ms"] == pytest.approx(
+            stats["total_latency_ms"] / stats["eval_count"]
+        )
+        assert metrics.get_slowest_policies(top_n=1) == [
+            ("policy", metrics.summary()["policy"])
+        ]
+
+    def test_metrics_stats_fields_by_attribute_and_key(self):
+        """Test that per-policy stats expose fields as attributes and keys."""
+        metrics = PolicyMetrics()
+        metrics.record("policy", BLOCK("reason"), 0.5)
+
+        stats = metrics.stats["policy"]
+        assert stats.block_count == stats["block_count"] == 1
+        assert not hasattr(stats, "__dict__")
+        with pytest.raises(KeyError):
+            stats["missing"]
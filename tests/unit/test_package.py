@@ -0,0 +1,62 @@
+# tests/unit/test_package.py
+
+import subprocess
+import sys
+
+import clearstone
+
+
+def test_tooling_is_imported_lazily():
+    """Test that `import clearstone` does not load debugging or validation tooling."""
+    code = (
+        "import sys, clearstone; "
+        "print(any(m in sys.modules for m in ("
+        "'clearstone.utils.debugging', 'clearstone.utils.validator', "
+        "'clearstone.utils.intervention')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_import_registers_builtin_policies():
+    """Test that `import clearstone` registers the built-in policy library."""
+    code = (
+        "import clearstone; "
+        "from clearstone.core.policy import get_policies; "
+        "print(len(get_policies()))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert int(result.stdout) > 0
+
+
+def test_lazy_attributes_resolve():
+    """Test that lazily imported names resolve to the real objects."""
+    from clearstone.utils.debugging import PolicyDebugger
+    from clearstone.utils.validator import PolicyValidationError
+
+    assert clearstone.PolicyDebugger is PolicyDebugger
+    assert clearstone.PolicyValidationError is PolicyValidationError
+    assert clearstone.policies.__name__ == "clearstone.policies"
+    assert set(clearstone.__all__) <= set(dir(clearstone)) | set(clearstone._LAZY)
+
+
+def test_debugging_package_is_imported_lazily():
+    """Test that `import clearstone.debugging` defers checkpoint and replay code."""
+    code = (
+        "import sys, clearstone.debugging; "
+        "print(any(m in sys.modules for m in ("
+        "'clearstone.debugging.checkpoint', 'clearstone.debugging.replay', 'pdb')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+    import clearstone.debugging
+    from clearstone.debugging.replay import ReplayEngine
+
+    assert clearstone.debugging.ReplayEngine is ReplayEngine
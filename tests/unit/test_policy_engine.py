@@ -2,7 +2,7 @@
 
 import pytest
 
-from clearstone.core.actions import ALERT, ALLOW, BLOCK, PAUSE, ActionType
+from clearstone.core.actions import ALERT, ALLOW, BLOCK, PAUSE, SKIP, ActionType
 from clearstone.core.context import context_scope, create_context, set_current_context
 from clearstone.core.policy import Policy, PolicyEngine, get_policies, reset_policies
 
@@ -188,6 +188,34 @@ def test_engine_with_explicit_policies_list():
     assert engine._policies[1].name == "explicit_policy_1"
 
 
+def test_engine_accepts_policy_info_entries():
+    """Test that PolicyInfo entries, e.g. from get_policies(), are used as-is."""
+
+    @Policy(name="info_low", priority=1)
+    def low(context):
+        return ALLOW
+
+    @Policy(name="info_high", priority=5)
+    def high(context):
+        return BLOCK("high wins")
+
+    engine = PolicyEngine(policies=list(reversed(get_policies())))
+
+    assert [p.name for p in engine._policies] == ["info_high", "info_low"]
+    with context_scope(create_context("user", "agent")):
+        assert engine.evaluate().reason == "high wins"
+
+
+def test_policy_info_is_slotted():
+    """Test that PolicyInfo entries carry no per-instance __dict__."""
+
+    @Policy(name="slotted_policy")
+    def slotted(context):
+        return ALLOW
+
+    assert not hasattr(slotted._policy_info, "__dict__")
+
+
 def test_engine_with_explicit_empty_list_raises_error():
     """Test that initializing with an empty list of policies raises a ValueError."""
     with pytest.raises(ValueError, match="initialized with no valid policies"):
@@ -212,3 +240,392 @@ def test_engine_auto_discovery_still_works_by_default():
     policy_names = {p.name for p in engine._policies}
     assert "auto_discovered_1" in policy_names
     assert "auto_discovered_2" in policy_names
+
+
+def test_engine_skip_does_not_override_later_decisions():
+    """Ensure SKIP decisions are ignored when picking the final decision."""
+
+    @Policy(name="skipper", priority=100)
+    def skipper(context):
+        return SKIP
+
+    @Policy(name="alerter", priority=50)
+    def alerter(context):
+        return ALERT
+
+    engine = PolicyEngine()
+    ctx = create_context("user1", "agent1")
+
+    assert engine.evaluate(ctx) is ALERT
+
+
+def test_engine_non_decision_return_causes_fail_safe_block():
+    """Ensure a policy returning something other than a Decision is blocked."""
+
+    @Policy(name="returns_none", priority=100)
+    def returns_none(context):
+        return None
+
+    engine = PolicyEngine()
+    ctx = create_context("user1", "agent1")
+    decision = engine.evaluate(ctx)
+
+    assert decision.action == ActionType.BLOCK
+    assert "Policy 'returns_none' raised an exception" in decision.reason
+
+
+def test_engine_records_metrics_for_every_policy():
+    """Ensure the compiled evaluator records metrics for each evaluated policy."""
+
+    @Policy(name="first", priority=10)
+    def first(context):
+        return ALLOW
+
+    @Policy(name="second", priority=0)
+    def second(context):
+        return BLOCK("stop")
+
+    engine = PolicyEngine()
+    ctx = create_context("user1", "agent1")
+    engine.evaluate(ctx)
+    engine.evaluate(ctx)
+
+    summary = engine.metrics.summary()
+    assert summary["first"]["eval_count"] == 2
+    assert summary["second"]["block_count"] == 2
+
+
+def test_policy_decorator_rejects_extra_parameters():
+    """Ensure extra, keyword-only and variadic parameters are rejected."""
+    with pytest.raises(TypeError, match="must have the signature"):
+
+        @Policy(name="two_args")
+        def two_args(context, extra):
+            return ALLOW
+
+    with pytest.raises(TypeError, match="must have the signature"):
+
+        @Policy(name="kw_only")
+        def kw_only(context, *, extra=None):
+            return ALLOW
+
+    with pytest.raises(TypeError, match="must have the signature"):
+
+        @Policy(name="var_kwargs")
+        def var_kwargs(context, **kwargs):
+            return ALLOW
+
+
+def test_policy_decorator_accepts_wrapped_functions():
+    """Ensure functools.wraps-decorated policies are validated against the original."""
+    import functools
+
+    def passthrough(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    @Policy(name="wrapped")
+    @passthrough
+    def wrapped(context):
+        return ALLOW
+
+    assert get_policies()[0].name == "wrapped"
+
+
+def test_get_policies_is_cached_until_registry_changes():
+    """Ensure the sorted registry is reused and invalidated on registration."""
+
+    @Policy(name="low", priority=0)
+    def low(context):
+        return ALLOW
+
+    first = get_policies()
+    assert get_policies() is first
+
+    @Policy(name="high", priority=10)
+    def high(context):
+        return ALLOW
+
+    refreshed = get_policies()
+    assert refreshed is not first
+    assert [p.name for p in refreshed] == ["high", "low"]
+
+    reset_policies()
+    assert get_policies() == ()
+
+
+def test_engine_fast_path_skips_recording_for_steady_allow():
+    """Ensure always-ALLOW policies stop being recorded once on the fast path."""
+
+    @Policy(name="steady")
+    def steady(context):
+        return ALLOW
+
+    engine = PolicyEngine(fast_path_after=2)
+    ctx = create_context("user1", "agent1")
+    for _ in range(5):
+        assert engine.evaluate(ctx) is ALLOW
+
+    assert engine.metrics.summary()["steady"]["eval_count"] == 2
+    assert len(engine.get_audit_trail()) == 2
+
+
+def test_engine_fast_path_demotes_on_non_allow():
+    """Ensure a fast-path policy is recorded again after it stops allowing."""
+    outcomes = iter([ALLOW, ALLOW, ALLOW, BLOCK("changed"), ALLOW])
+
+    @Policy(name="flaky")
+    def flaky(context):
+        return next(outcomes)
+
+    engine = PolicyEngine(fast_path_after=2)
+    ctx = create_context("user1", "agent1")
+    decisions = [engine.evaluate(ctx) for _ in range(5)]
+
+    assert decisions[3].reason == "changed"
+    assert [e["decision"] for e in engine.get_audit_trail()] == [
+        "allow",
+        "allow",
+        "block",
+        "allow",
+    ]
+
+
+def test_engine_rejects_invalid_fast_path_threshold():
+    """Ensure fast_path_after must be positive."""
+
+    @Policy(name="p")
+    def p(context):
+        return ALLOW
+
+    with pytest.raises(ValueError, match="fast_path_after"):
+        PolicyEngine(fast_path_after=0)
+
+
+def test_engine_with_disabled_metrics_skips_recording():
+    """Ensure a disabled metrics sink records nothing while auditing continues."""
+    from clearstone.utils.metrics import PolicyMetrics
+
+    @Policy(name="p")
+    def p(context):
+        return ALLOW
+
+    engine = PolicyEngine(metrics=PolicyMetrics(enabled=False))
+    ctx = create_context("user1", "agent1")
+    engine.evaluate(ctx)
+
+    assert engine.metrics.summary() == {}
+    assert len(engine.get_audit_trail()) == 1
+
+    engine.metrics = PolicyMetrics()
+    engine.evaluate(ctx)
+
+    assert engine.metrics.summary()["p"]["eval_count"] == 1
+
+
+def test_policy_registry_keeps_registration_order_for_equal_priorities():
+    """Ensure ties in priority keep the order in which policies were registered."""
+
+    @Policy(name="first", priority=5)
+    def first(context):
+        return ALLOW
+
+    @Policy(name="top", priority=50)
+    def top(context):
+        return ALLOW
+
+    @Policy(name="second", priority=5)
+    def second(context):
+        return ALLOW
+
+    assert [p.name for p in get_policies()] == ["top", "first", "second"]
+
+
+def test_engine_with_allow_block_only_policies_stops_at_first_block():
+    """Test the specialized evaluator used when policies declare ALLOW/BLOCK only."""
+    binary = {ActionType.ALLOW, ActionType.BLOCK}
+
+    @Policy(name="binary_allow", priority=10, actions=binary)
+    def allow_policy(context):
+        return ALLOW
+
+    @Policy(name="binary_block", priority=5, actions=binary)
+    def block_policy(context):
+        return BLOCK("denied")
+
+    @Policy(name="binary_never_runs", priority=1, actions=binary)
+    def never_runs(context):
+        raise AssertionError("evaluation should stop at the first BLOCK")
+
+    engine = PolicyEngine()
+    assert engine._policies[0].actions == frozenset(binary)
+
+    with context_scope(create_context("user", "agent")):
+        decision = engine.evaluate()
+
+    assert decision.reason == "denied"
+    assert [e["policy_name"] for e in engine.get_audit_trail()] == [
+        "binary_allow",
+        "binary_block",
+    ]
+
+
+def test_engine_keeps_general_evaluator_when_actions_are_undeclared():
+    """Test that one policy without an ALLOW/BLOCK declaration keeps escalation."""
+
+    @Policy(name="declared", priority=10, actions={ActionType.ALLOW, ActionType.BLOCK})
+    def declared(context):
+        return ALLOW
+
+    @Policy(name="undeclared", priority=5)
+    def undeclared(context):
+        return ALERT
+
+    @Policy(name="later_allow", priority=1)
+    def later_allow(context):
+        return ALLOW
+
+    engine = PolicyEngine()
+    with context_scope(create_context("user", "agent")):
+        assert engine.evaluate() is ALERT
+    assert len(engine.get_audit_trail()) == 3
+
+
+def test_policy_decorator_rejects_invalid_actions():
+    """Test that `actions` must contain ActionType members."""
+    with pytest.raises(ValueError, match="actions"):
+        Policy(name="bad_actions", actions={"allow"})
+
+
+def test_engine_parallel_matches_serial_priority_order():
+    """Test that parallel evaluation returns the highest-priority BLOCK."""
+    import time
+
+    from clearstone.core.context import get_current_context
+
+    seen_contexts = []
+
+    def make_policy(i):
+        @Policy(name=f"parallel_{i}", priority=100 - i)
+        def policy(context):
+            seen_contexts.append(get_current_context())
+            if i == 3:
+                time.sleep(0.05)
+                return BLOCK("slow high-priority block")
+            if i == 10:
+                return BLOCK("fast low-priority block")
+            return ALLOW
+
+        return policy
+
+    for i in range(20):
+        make_policy(i)
+
+    engine = PolicyEngine(parallel=True)
+    ctx = create_context("user", "agent")
+    decision = engine.evaluate(ctx)
+
+    assert decision.reason == "slow high-priority block"
+    assert all(seen is ctx for seen in seen_contexts)
+    assert [e["policy_name"] for e in engine.get_audit_trail()] == [
+        f"parallel_{i}" for i in range(4)
+    ]
+
+
+def test_engine_parallel_escalation_and_failures():
+    """Test that parallel evaluation keeps escalation and fail-safe semantics."""
+
+    def make_policy(i, result):
+        @Policy(name=f"parallel_mix_{i}", priority=100 - i)
+        def policy(context):
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return policy
+
+    for i in range(16):
+        make_policy(i, ALERT if i == 2 else ALLOW)
+
+    engine = PolicyEngine(parallel=True)
+    assert engine._parallel
+    assert engine.evaluate(create_context("user", "agent")) is ALERT
+
+    make_policy(16, ValueError("boom"))
+    failing = PolicyEngine(parallel=True)
+    decision = failing.evaluate(create_context("user", "agent"))
+    assert decision.is_block()
+    assert "boom" in decision.reason
+    assert failing.metrics.stats["parallel_mix_16"]["block_count"] == 1
+
+
+def test_engine_parallel_needs_enough_policies():
+    """Test that small engines stay serial even with parallel=True."""
+
+    @Policy(name="lonely_policy")
+    def lonely(context):
+        return ALLOW
+
+    assert PolicyEngine(parallel=True)._parallel is False
+
+
+def test_engine_passes_declared_metadata_reads_as_view():
+    """Test that policies declaring `reads` receive a shared metadata view."""
+    views = []
+
+    @Policy(name="reads_role", priority=10, reads=("role",))
+    def reads_role(context, view):
+        views.append(view)
+        return ALLOW
+
+    @Policy(name="reads_role_and_tenant", priority=5, reads=["role", "tenant"])
+    def reads_both(context, view):
+        views.append(view)
+        if view["role"] == "guest":
+            return BLOCK("guests denied")
+        return ALLOW
+
+    @Policy(name="plain_policy", priority=1)
+    def plain(context):
+        return ALLOW
+
+    engine = PolicyEngine()
+    assert engine._read_keys == ("role", "tenant")
+
+    decision = engine.evaluate(create_context("user", "agent", role="guest"))
+
+    assert decision.reason == "guests denied"
+    assert views[0] is views[1]
+    assert views[0] == {"role": "guest", "tenant": None}
+
+
+def test_policy_decorator_with_reads_requires_view_parameter():
+    """Test that `reads` policies must accept (context, view)."""
+    with pytest.raises(TypeError, match="view"):
+
+        @Policy(name="reads_without_view", reads=("role",))
+        def missing_view(context):
+            return ALLOW
+
+    with pytest.raises(ValueError, match="reads"):
+        Policy(name="empty_reads", reads=())
+
+
+def test_engine_repeated_policy_failures_share_block_decision():
+    """Test that identical policy exceptions reuse one interned BLOCK decision."""
+
+    @Policy(name="always_broken")
+    def broken(context):
+        raise RuntimeError("backend unavailable")
+
+    engine = PolicyEngine()
+    ctx = create_context("user", "agent")
+
+    first = engine.evaluate(ctx)
+    second = engine.evaluate(ctx)
+
+    assert first.is_block()
+    assert first is second
@@ -9,6 +9,7 @@ import pytest
 
 from clearstone.core.actions import ALLOW, BLOCK
 from clearstone.core.context import create_context
+from clearstone.core.policy import PolicyInfo
 from clearstone.utils.validator import PolicyValidationError, PolicyValidator
 
 
@@ -144,3 +145,16 @@ class TestPolicyValidationError:
         message = "Custom validation error message"
         error = PolicyValidationError(message)
         assert str(error) == message
+
+
+def test_validator_passes_view_to_reads_policies():
+    """All checks call a policy declaring `reads` with its metadata view."""
+
+    def role_policy(context, view):
+        return BLOCK("Admin blocked") if view["role"] == "admin" else ALLOW
+
+    role_policy._policy_info = PolicyInfo(
+        name="role_policy", priority=0, func=role_policy, reads=("role",)
+    )
+
+    assert PolicyValidator().run_all_checks(role_policy) == []
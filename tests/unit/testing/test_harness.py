@@ -151,3 +151,46 @@ def test_policy_test_result_summary(mock_trace_db):
     assert summary["traces_analyzed"] == 2
     assert summary["runs_blocked"] == 1
     assert summary["block_rate_percent"] == "25.00%"
+
+
+def test_harness_load_traces_in_chunks(mock_trace_db, monkeypatch):
+    """Test that traces load the same when their spans take several queries."""
+    harness = PolicyTestHarness(mock_trace_db)
+    expected = harness.load_traces()
+
+    monkeypatch.setattr("clearstone.testing.harness._TRACE_IDS_PER_QUERY", 1)
+    traces = harness.load_traces()
+
+    assert [t.trace_id for t in traces] == [t.trace_id for t in expected]
+    assert [[s.span_id for s in t.spans] for t in traces] == [
+        ["s2a", "s2b"],
+        ["s1a", "s1b"],
+    ]
+
+
+def test_harness_simulations_on_threads_match_sequential(mock_trace_db):
+    """Test that max_workers evaluates concurrently with the same results."""
+    harness = PolicyTestHarness(mock_trace_db)
+    traces = harness.load_traces()
+
+    def has_error(trace):
+        return BLOCK("error") if trace.error_spans() else ALLOW
+
+    for simulate, policy in [
+        (harness.simulate_policy, has_error),
+        (harness.simulate_span_policy, high_cost_span_policy),
+    ]:
+        sequential = simulate(policy, traces)
+        threaded = simulate(policy, traces, max_workers=4)
+
+        assert threaded.decisions == sequential.decisions
+        assert threaded.blocked_trace_ids == sequential.blocked_trace_ids == ["trace_2"]
+
+
+def test_harness_context_manager_closes_connection(mock_trace_db):
+    """Test that leaving the with block closes the database connection."""
+    with PolicyTestHarness(mock_trace_db) as harness:
+        assert len(harness.load_traces()) == 2
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        harness.load_traces()
@@ -0,0 +1,113 @@
+# tests/unit/utils/test_serialization.py
+
+import enum
+import json
+import math
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from clearstone.observability.models import Span, SpanEvent, SpanKind
+from clearstone.utils import serialization
+from clearstone.utils.serialization import json_dumps, json_dumps_native, json_loads
+
+
+class Flag(enum.IntEnum):
+    ON = 1
+
+
+class _Text(str):
+    pass
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Runs a test against orjson (when installed) and the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_json_dumps_encodes_pydantic_models_like_model_dump(backend):
+    """Test that models encode to the same data as model_dump(mode='json')."""
+    span = Span(
+        trace_id="t1",
+        span_id="s1",
+        name="llm.call",
+        kind=SpanKind.CLIENT,
+        start_time_ns=1,
+        attributes={"model": "gpt", "tokens": 12},
+        events=[
+            SpanEvent(name="retry", timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc))
+        ],
+        instrumentation_name="t",
+        instrumentation_version="1",
+    )
+
+    data = json_dumps({"span": span})
+
+    assert isinstance(data, bytes)
+    decoded = json.loads(data)["span"]
+    assert decoded["kind"] == "CLIENT"
+    assert Span.model_validate(decoded) == Span.model_validate(
+        span.model_dump(mode="json")
+    )
+
+
+def test_json_loads_accepts_memoryview(backend):
+    """Test that memoryview slices can be decoded directly."""
+    view = memoryview(b'xx{"a": [1, 2]}')[2:]
+    assert json_loads(view) == {"a": [1, 2]}
+
+
+def test_json_dumps_roundtrips_values_beyond_orjson(backend):
+    """Test that huge ints and non-finite floats are encoded and read back."""
+    obj = {"big": 2**70, "neg": -(2**64), "nan": float("nan"), "inf": [float("inf")]}
+
+    decoded = json_loads(json_dumps(obj))
+
+    assert decoded["big"] == 2**70 and type(decoded["big"]) is int
+    assert decoded["neg"] == -(2**64)
+    assert math.isnan(decoded["nan"])
+    assert decoded["inf"] == [float("inf")]
+    assert json_loads(json_dumps({"a": None, "b": 1.5})) == {"a": None, "b": 1.5}
+
+
+def test_json_dumps_native_rejects_non_json_values(backend):
+    """Test that only JSON-native values are encoded."""
+    assert json.loads(json_dumps_native({"a": [1, 2.5, None, True]})) == {
+        "a": [1, 2.5, None, True]
+    }
+    with pytest.raises(TypeError):
+        json_dumps_native({"when": datetime(2025, 1, 1)})
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        float("nan"),
+        {"a": [float("inf")]},
+        {"a": SpanKind.CLIENT},
+        [uuid.UUID(int=1)],
+        {"a": Flag.ON},
+        {"n": 2**64},
+        {1: "a"},
+        {"a": _Text("x")},
+    ],
+    ids=["nan", "inf", "enum", "uuid", "int-enum", "big-int", "int-key", "str-sub"],
+)
+def test_json_dumps_native_rejects_values_that_do_not_roundtrip(backend, obj):
+    """Test that both backends reject values JSON would silently convert."""
+    with pytest.raises(TypeError):
+        json_dumps_native(obj)
+
+
+def test_json_dumps_native_rejects_cycles(backend):
+    """Test that reference cycles raise TypeError instead of recursing."""
+    cycle = []
+    cycle.append(cycle)
+    with pytest.raises(TypeError):
+        json_dumps_native(cycle)
@@ -109,3 +109,35 @@ def test_integration_with_policy_engine(mock_send, clean_env):
     assert call_args["payload"] == {"name": "PolicyEngine"}
 
     reset_policies()
+
+
+@patch("clearstone.utils.telemetry.TelemetryManager._send_event")
+def test_record_event_uses_one_sender_thread(mock_send, clean_env):
+    """Test that events are sent in order by a single background thread."""
+    import threading
+    import time
+
+    manager = TelemetryManager()
+    manager.is_enabled = True
+
+    for i in range(20):
+        manager.record_event("burst", {"i": i})
+    time.sleep(0.1)
+
+    assert [c.args[0]["payload"]["i"] for c in mock_send.call_args_list] == list(
+        range(20)
+    )
+    senders = [t for t in threading.enumerate() if t is manager._sender]
+    assert len(senders) == 1
+
+
+def test_record_event_drops_events_when_queue_is_full(clean_env, monkeypatch):
+    """Test that a full queue drops events instead of blocking the caller."""
+    monkeypatch.setattr(TelemetryManager, "_start_sender", lambda self: None)
+    manager = TelemetryManager()
+    manager.is_enabled = True
+
+    for i in range(manager._queue.maxsize + 5):
+        manager.record_event("burst", {"i": i})
+
+    assert manager._queue.qsize() == manager._queue.maxsize